@@ -0,0 +1,17 @@
+import pytest
+from django.core.cache import cache
+
+from task_manager import reference_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Очистка кешей перед каждым тестом.
+
+    Данные в базе откатываются после каждого теста, а кеши живут в памяти
+    процесса - без очистки тест мог бы увидеть объекты предыдущего теста.
+    """
+    cache.clear()
+    reference_cache.clear_all()
+    yield
@@ -0,0 +1,154 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.pagination import encode_cursor
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+
+class ApiTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='author', first_name='Test',
+                                             last_name='User', password='123')
+        self.client.force_login(self.user)
+        self.status = Status.objects.create(name='New')
+        self.other_status = Status.objects.create(name='Done')
+        self.label = Label.objects.create(name='Bug')
+        self.tasks = []
+        for i in range(5):
+            task = Task.objects.create(
+                name=f'Task {i}', description=f'Description {i}',
+                status=self.status if i % 2 else self.other_status,
+                author=self.user, executor=self.user if i == 0 else None)
+            self.tasks.append(task)
+        self.tasks[0].labels.add(self.label)
+
+    def get(self, url_name, status_code=200, **params):
+        response = self.client.get(reverse(url_name), params)
+        self.assertEqual(response.status_code, status_code, response.content)
+        return response.json()
+
+
+class TaskListApiTest(ApiTestCase):
+    def test_default_fields(self):
+        """
+        Проверка списка задач с полями по умолчанию и метками одним запросом.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get('api_tasks')
+        self.assertEqual(len(queries), 5)
+        self.assertEqual([task['id'] for task in data['results']],
+                         [task.pk for task in self.tasks])
+        first = data['results'][0]
+        self.assertNotIn('description', first)
+        self.assertEqual(first['status_name'], 'Done')
+        self.assertEqual(first['executor_name'], 'Test User')
+        self.assertEqual(first['labels'], [self.label.pk])
+        self.assertEqual(first['label_names'], 'Bug')
+        self.assertIsNone(data['next'])
+        self.assertIsNone(data['previous'])
+
+    def test_sparse_fields(self):
+        """
+        Проверка параметра fields: из базы читаются только запрошенные столбцы.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get('api_tasks', fields='id,description')
+        self.assertEqual(data['results'][1], {'id': self.tasks[1].pk,
+                                              'description': 'Description 1'})
+        sql = queries.captured_queries[-1]['sql']
+        self.assertIn('"description"', sql)
+        self.assertNotIn('"status_name"', sql)
+        self.assertNotIn('tasks_task_labels', sql)
+
+        data = self.get('api_tasks', status_code=400, fields='id,password')
+        self.assertIn('password', data['fields'][0])
+
+    def test_filters_and_pagination(self):
+        """
+        Проверка фильтров формы списка задач и навигации по курсору.
+        """
+        data = self.get('api_tasks', status=self.status.pk, fields='name')
+        self.assertEqual(data['results'], [{'name': 'Task 1'}, {'name': 'Task 3'}])
+        data = self.get('api_tasks', search='description 4', fields='name')
+        self.assertEqual(data['results'], [{'name': 'Task 4'}])
+
+        data = self.get('api_tasks', limit=2, fields='name')
+        names = [task['name'] for task in data['results']]
+        while data['next']:
+            data = self.client.get(data['next']).json()
+            names += [task['name'] for task in data['results']]
+        self.assertEqual(names, [f'Task {i}' for i in range(5)])
+        data = self.client.get(data['previous']).json()
+        self.assertEqual(data['results'], [{'name': 'Task 2'}, {'name': 'Task 3'}])
+
+    def test_errors(self):
+        """
+        Проверка ошибочных параметров и запроса без авторизации.
+        """
+        self.assertIn('status', self.get('api_tasks', 400, status='abc'))
+        self.assertIn('limit', self.get('api_tasks', 400, limit=0))
+        self.assertIn('cursor', self.get('api_tasks', 400, after='broken'))
+        for values in (['x', 1], [1, 2], [timezone.now(), 'abc'], [None, None]):
+            with self.subTest(values=values):
+                self.assertIn('cursor', self.get('api_tasks', 400,
+                                                 before=encode_cursor(values)))
+        self.client.logout()
+        self.get('api_tasks', 401)
+
+
+class TaskDetailApiTest(ApiTestCase):
+    def test_detail(self):
+        """
+        Проверка задачи по идентификатору и несуществующей задачи.
+        """
+        url = reverse('api_tasks_detail', kwargs={'pk': self.tasks[0].pk})
+        data = self.client.get(url, {'fields': 'name,labels'}).json()
+        self.assertEqual(data, {'name': 'Task 0', 'labels': [self.label.pk]})
+        data = self.client.get(url).json()
+        self.assertEqual(data['author_name'], 'Test User')
+        response = self.client.get(reverse('api_tasks_detail', kwargs={'pk': 0}))
+        self.assertEqual(response.status_code, 404)
+
+
+class ReferenceApiTest(ApiTestCase):
+    def test_references(self):
+        """
+        Проверка списков статусов, меток и пользователей со счетчиками задач.
+        """
+        data = self.get('api_statuses', fields='name,task_count')
+        self.assertEqual(data['results'], [{'name': 'New', 'task_count': 2},
+                                           {'name': 'Done', 'task_count': 3}])
+        data = self.get('api_labels')
+        self.assertEqual(data['results'][0]['task_count'], 1)
+        data = self.get('api_users')
+        self.assertEqual(data['results'][0]['authored_count'], 5)
+        ids = [user['id'] for user in data['results']]
+        self.assertEqual(ids, sorted(ids))
+        self.assertNotIn('password', data['results'][0])
+
+
+class ConditionalGetApiTest(ApiTestCase):
+    def test_not_modified(self):
+        """
+        Проверка ответа 304 для неизмененных списка и задачи.
+        """
+        url = reverse('api_tasks')
+        response = self.client.get(url, {'fields': 'name'})
+        response = self.client.get(url, {'fields': 'name'},
+                                   HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.tasks[0].labels.remove(self.label)
+        response = self.client.get(url, {'fields': 'name'},
+                                   HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+        url = reverse('api_tasks_detail', kwargs={'pk': self.tasks[1].pk})
+        response = self.client.get(url)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from task_manager.api import views
+
+urlpatterns = [
+    path('tasks/', views.TaskListView.as_view(), name='api_tasks'),
+    path('tasks/<int:pk>/', views.TaskDetailView.as_view(), name='api_tasks_detail'),
+    path('statuses/', views.StatusListView.as_view(), name='api_statuses'),
+    path('labels/', views.LabelListView.as_view(), name='api_labels'),
+    path('users/', views.UserListView.as_view(), name='api_users'),
+]
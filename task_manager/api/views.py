@@ -0,0 +1,238 @@
+from django.db.models import Count, Max
+from django.http import JsonResponse
+from django.views.generic import View
+
+from task_manager.labels.models import Label
+from task_manager.mixins import ConditionalGetMixin
+from task_manager.pagination import KeysetPaginator, InvalidCursor
+from task_manager.statuses.models import Status
+from task_manager.tasks.forms import TaskFilterForm
+from task_manager.tasks.models import Task, TaskListRow
+from task_manager.tasks.search import RANK
+from task_manager.users.models import User
+
+
+class ApiError(Exception):
+    def __init__(self, errors, status=400):
+        super().__init__(errors)
+        self.errors = errors
+        self.status = status
+
+
+class ApiView(View):
+    """
+    Базовое представление JSON API только для чтения.
+
+    Доступно авторизованным пользователям (сессия), ошибки возвращаются в
+    виде JSON. fields - поля ответа и соответствующие им столбцы для
+    values(); поле со столбцом None вычисляется в annotate_rows. Параметр
+    запроса fields выбирает подмножество полей, и из базы читаются только
+    нужные столбцы, без создания объектов моделей.
+    """
+    http_method_names = ['get', 'head', 'options']
+    model = None
+    fields = {}
+    default_fields = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'detail': 'Authentication required'}, status=401)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse(error.errors, status=error.status)
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def get_fields(self):
+        """
+        Поля ответа из параметра fields (через запятую).
+        """
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.default_fields or self.fields)
+        names = list(dict.fromkeys(name.strip() for name in requested.split(',')
+                                   if name.strip()))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown or not names:
+            raise ApiError({'fields': [f'Unknown fields: {", ".join(unknown)}. '
+                                       f'Available: {", ".join(self.fields)}']})
+        return names
+
+    def get_columns(self, names, extra=()):
+        columns = [self.fields[name] for name in names if self.fields[name]]
+        return list(dict.fromkeys(columns + list(extra)))
+
+    def annotate_rows(self, rows, names):
+        return rows
+
+    def serialize(self, rows, names):
+        rows = self.annotate_rows(rows, names)
+        return [{name: row[self.fields[name] or name] for name in names}
+                for row in rows]
+
+
+class ApiListView(ApiView):
+    """
+    Список объектов с постраничной навигацией по курсору.
+
+    Ответ: {"results": [...], "next": url, "previous": url}. Размер страницы
+    задается параметром limit (не больше max_page_size).
+    """
+    filterset_class = None
+    ordering = ('created_at', 'id')
+    paginate_by = 50
+    max_page_size = 200
+
+    def filter_queryset(self, queryset):
+        if self.filterset_class is None:
+            return queryset
+        filterset = self.filterset_class(self.request.GET or None,
+                                         queryset=queryset, request=self.request)
+        if filterset.is_bound and not filterset.is_valid():
+            raise ApiError(filterset.errors)
+        return filterset.qs
+
+    def get_ordering(self, queryset):
+        return self.ordering
+
+    def get_page_size(self):
+        try:
+            size = int(self.request.GET.get('limit', self.paginate_by))
+        except ValueError:
+            size = 0
+        if not 1 <= size <= self.max_page_size:
+            raise ApiError({'limit': [f'Must be between 1 and {self.max_page_size}']})
+        return size
+
+    def get_page_url(self, param, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        query[param] = cursor
+        return self.request.build_absolute_uri(f'{self.request.path}?'
+                                               f'{query.urlencode()}')
+
+    def get(self, request, *args, **kwargs):
+        names = self.get_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = self.get_ordering(queryset)
+        columns = self.get_columns(names, [field.lstrip('-') for field in ordering])
+        paginator = KeysetPaginator(queryset.values(*columns), self.get_page_size(),
+                                    ordering)
+        try:
+            page = paginator.get_page(after=request.GET.get('after'),
+                                      before=request.GET.get('before'))
+        except InvalidCursor:
+            raise ApiError({'cursor': ['Invalid cursor']})
+        return JsonResponse({
+            'results': self.serialize(page.object_list, names),
+            'next': self.get_page_url('after', page.next_cursor),
+            'previous': self.get_page_url('before', page.previous_cursor),
+        })
+
+
+class ApiDetailView(ApiView):
+    lookup_field = 'pk'
+
+    def get(self, request, pk, *args, **kwargs):
+        names = self.get_fields()
+        row = (self.get_queryset().filter(**{self.lookup_field: pk})
+               .values(*self.get_columns(names, [self.lookup_field])).first())
+        if row is None:
+            raise ApiError({'detail': 'Not found'}, status=404)
+        return JsonResponse(self.serialize([row], names)[0])
+
+
+class TaskApiMixin:
+    """
+    Задачи читаются из строк списка задач (TaskListRow): имена статусов и
+    пользователей уже денормализованы, описание присоединяется только по
+    запросу поля description.
+    """
+    model = TaskListRow
+    fields = {
+        'id': 'task_id',
+        'name': 'name',
+        'description': 'task__description',
+        'status': 'status_id',
+        'status_name': 'status_name',
+        'author': 'author_id',
+        'author_name': 'author_name',
+        'executor': 'executor_id',
+        'executor_name': 'executor_name',
+        'labels': None,
+        'label_names': 'label_names',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+    default_fields = [name for name in fields if name != 'description']
+
+    def annotate_rows(self, rows, names):
+        """
+        Идентификаторы меток задач - одним запросом на страницу.
+        """
+        if 'labels' not in names:
+            return rows
+        labels = {row['task_id']: [] for row in rows}
+        links = (Task.labels.through.objects.filter(task_id__in=labels)
+                 .order_by('label_id').values_list('task_id', 'label_id'))
+        for task_id, label_id in links:
+            labels[task_id].append(label_id)
+        for row in rows:
+            row['labels'] = labels[row['task_id']]
+        return rows
+
+
+class TaskListView(ConditionalGetMixin, TaskApiMixin, ApiListView):
+    filterset_class = TaskFilterForm
+    ordering = ('created_at', 'task_id')
+
+    def get_conditional_state(self):
+        """
+        Отпечаток отфильтрованного списка: время последнего изменения и
+        количество строк.
+        """
+        state = (self.filter_queryset(self.get_queryset())
+                 .aggregate(last=Max('updated_at'), count=Count('pk')))
+        return (state['last'], state['count']), None
+
+    def get_ordering(self, queryset):
+        """
+        При поиске задачи упорядочиваются по релевантности.
+        """
+        if RANK in queryset.query.annotations:
+            return (f'-{RANK}',) + self.ordering
+        return self.ordering
+
+
+class TaskDetailView(ConditionalGetMixin, TaskApiMixin, ApiDetailView):
+    lookup_field = 'task_id'
+
+    def get_conditional_state(self):
+        updated_at = (TaskListRow.objects.filter(pk=self.kwargs['pk'])
+                      .values_list('updated_at', flat=True).first())
+        return None if updated_at is None else (updated_at, updated_at)
+
+
+class StatusListView(ApiListView):
+    model = Status
+    fields = {name: name for name in ('id', 'name', 'task_count', 'created_at')}
+
+
+class LabelListView(ApiListView):
+    model = Label
+    fields = {name: name for name in ('id', 'name', 'task_count', 'created_at')}
+
+
+class UserListView(ApiListView):
+    model = User
+    fields = {name: name for name in ('id', 'username', 'first_name', 'last_name',
+                                      'authored_count', 'assigned_count',
+                                      'date_joined')}
+    # Порядок по первичному ключу: для date_joined нет индекса, а порядок
+    # регистрации совпадает с порядком id.
+    ordering = ('id',)
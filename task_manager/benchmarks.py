@@ -0,0 +1,459 @@
+import math
+import os
+import platform
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from time import perf_counter
+
+import django
+from asgiref.sync import async_to_sync
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db import OperationalError, connections, transaction
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import get_language
+
+from task_manager.context_processors import navbar
+from task_manager.db.sqlite3.base import PRODUCTION_PRAGMAS
+from task_manager.labels import views as labels_views
+from task_manager.labels.models import Label
+from task_manager.statuses import views as statuses_views
+from task_manager.statuses.models import Status
+from task_manager.tasks import fragments
+from task_manager.tasks import views as tasks_views
+from task_manager.tasks.forms import TaskFilterForm
+from task_manager.tasks.models import Task, TaskListRow
+from task_manager.tasks.views import IndexView, TaskDetailView
+from task_manager.users import views as users_views
+from task_manager.users.models import User
+
+
+def percentile(samples, percent):
+    """
+    Процентиль выборки с линейной интерполяцией между соседними значениями.
+
+    >>> percentile([1, 2, 3, 4], 50)
+    2.5
+    """
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * percent / 100
+    lower, upper = math.floor(position), math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples):
+    """
+    Сводка по замерам в миллисекундах.
+    """
+    return {
+        'iterations': len(samples),
+        'min_ms': round(min(samples) * 1000, 3),
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3),
+    }
+
+
+def measure(func, iterations, warmup):
+    """
+    Замер func и сводка по времени.
+
+    Если func возвращает словарь счетчиков операций (например, {'committed':
+    10, 'failed': 2}), счетчики суммируются по замерам и дополняются
+    скоростью <счетчик>_per_second за суммарное время замеров.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    counts = Counter()
+    for _ in range(iterations):
+        start = perf_counter()
+        result = func()
+        samples.append(perf_counter() - start)
+        if isinstance(result, dict):
+            counts.update(result)
+    summary = summarize(samples)
+    for name, count in counts.items():
+        summary[name] = count
+        summary[f'{name}_per_second'] = round(count / sum(samples), 1)
+    return summary
+
+
+@contextmanager
+def rolled_back():
+    """
+    Выполнение изменяющих операций с откатом, чтобы замеры не меняли данные.
+    """
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+SQLITE_PROFILES = {
+    'default': {'ENGINE': 'django.db.backends.sqlite3'},
+    'tuned': {'ENGINE': 'task_manager.db.sqlite3', 'PRAGMAS': PRODUCTION_PRAGMAS,
+              'IMMEDIATE_WRITES': True},
+}
+SQLITE_WRITERS = 4
+SQLITE_WRITES = 10
+
+
+@contextmanager
+def scratch_sqlite(profile):
+    """
+    Временная база SQLite с профилем настроек под псевдонимом bench_sqlite.
+    """
+    alias = 'bench_sqlite'
+    with tempfile.TemporaryDirectory() as directory:
+        connections.settings[alias] = {
+            **connections['default'].settings_dict, **SQLITE_PROFILES[profile],
+            'NAME': os.path.join(directory, 'bench.sqlite3'), 'TEST': {},
+        }
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('CREATE TABLE bench_writes '
+                               '(id INTEGER PRIMARY KEY, value INTEGER)')
+            yield alias
+        finally:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+
+
+def write_transactions(alias, count):
+    """
+    Транзакции "чтение, затем запись", как у изменяющих представлений.
+
+    Транзакция, потерявшая блокировку, откатывается; возвращается количество
+    таких ошибок.
+    """
+    failed = 0
+    for value in range(count):
+        try:
+            with transaction.atomic(using=alias), \
+                    connections[alias].cursor() as cursor:
+                cursor.execute('SELECT COUNT(*) FROM bench_writes')
+                cursor.execute('INSERT INTO bench_writes (value) VALUES (%s)',
+                               [value])
+        except OperationalError:
+            failed += 1
+    connections[alias].close()
+    return failed
+
+
+class BenchmarkSuite:
+    """
+    Набор микробенчмарков слоев ORM, фильтров, шаблонов и представлений.
+
+    Каждый метод bench_<name> готовит данные и возвращает функцию без
+    аргументов, время выполнения которой замеряется. Замеры выполняются на
+    текущей базе данных, поэтому ее стоит предварительно заполнить командой
+    seed_load.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.factory = RequestFactory()
+        self.client = Client()
+        self.client.force_login(user)
+        self.task = Task.objects.filter(author=user).order_by('-id').first() \
+            or Task.objects.order_by('-id').first()
+        self.label = Label.objects.order_by('id').first()
+
+    @classmethod
+    def names(cls):
+        return [name[len('bench_'):] for name in dir(cls)
+                if name.startswith('bench_')]
+
+    def run(self, names, iterations, warmup):
+        return {name: measure(getattr(self, f'bench_{name}')(), iterations, warmup)
+                for name in names}
+
+    def request(self, path='/', data=None):
+        request = self.factory.get(path, data or {})
+        request.user = self.user
+        return request
+
+    def filter_data(self):
+        return {
+            'status': Status.objects.values_list('id', flat=True).first(),
+            'executor': self.user.pk,
+            'labels': Label.objects.values_list('id', flat=True).first(),
+            'self_tasks': 'on',
+        }
+
+    def bench_filter_query(self):
+        request = self.request(reverse('tasks_index'), self.filter_data())
+
+        def run():
+            filterset = TaskFilterForm(request.GET,
+                                       queryset=TaskListRow.objects.all(),
+                                       request=request)
+            str(filterset.qs.query)
+        return run
+
+    def bench_template_tasks_index(self):
+        """
+        Рендеринг страницы списка задач с холодным кешем фрагментов строк.
+
+        Строки таблицы рендерятся при подготовке контекста, поэтому перед
+        каждым замером их фрагменты удаляются из кеша и рендерятся заново
+        вместе со страницей.
+        """
+        request = self.request(reverse('tasks_index'))
+        response = IndexView.as_view()(request)
+        context = response.context_data
+        select_name = context['bulk_form']['tasks'].html_name
+        keys = [fragments.row_key(row, get_language()) for row in context['tasks']]
+
+        def run():
+            cache.delete_many(keys)
+            context['task_rows'] = fragments.render_rows(context['tasks'],
+                                                         select_name=select_name)
+            response._is_rendered = False
+            response.render()
+        return run
+
+    def bench_template_tasks_detail(self):
+        request = self.request(reverse('tasks_detail', args=[self.task.pk]))
+        response = TaskDetailView.as_view()(request, pk=self.task.pk)
+
+        def run():
+            response._is_rendered = False
+            response.render()
+        return run
+
+    def bench_navbar(self):
+        request = self.request()
+        return lambda: list(navbar(request)['navbar_items'])
+
+    def view_bench(self, method, url_name, data=None, pk=None):
+        """
+        Запрос к странице через тестовый клиент с откатом изменений.
+
+        pk - первичный ключ объекта страницы или функция, которая создает
+        объект внутри откатываемой транзакции и возвращает его ключ (так
+        удаляется неиспользуемый объект, а не защищенный от удаления).
+        Непрочитанные сообщения об успехе сбрасываются, чтобы cookie не
+        росла от замера к замеру.
+        """
+        def run():
+            with rolled_back():
+                key = pk() if callable(pk) else pk
+                kwargs = {} if key is None else {'pk': key}
+                getattr(self.client, method)(reverse(url_name, kwargs=kwargs),
+                                             data or {}, secure=True)
+            self.client.cookies.pop(CookieStorage.cookie_name, None)
+        return run
+
+    def task_form_data(self):
+        return {
+            'name': f'Benchmark task {timezone.now().timestamp()}',
+            'description': 'Benchmark description',
+            'status': self.task.status_id,
+            'executor': self.user.pk,
+            'labels': list(self.task.labels.values_list('id', flat=True)),
+        }
+
+    def name_form_data(self, model):
+        return {'name': f'Benchmark {model._meta.model_name} '
+                        f'{timezone.now().timestamp()}'}
+
+    def user_form_data(self):
+        return {
+            'first_name': 'Benchmark',
+            'last_name': 'User',
+            'username': f'benchmark_{timezone.now().timestamp():.0f}',
+            'password1': 'benchmark-password',
+            'password2': 'benchmark-password',
+        }
+
+    def unused(self, model):
+        """
+        Функция для view_bench, создающая объект без связанных задач.
+        """
+        return lambda: model.objects.create(**self.name_form_data(model)).pk
+
+    def bench_view_tasks_index(self):
+        return self.view_bench('get', 'tasks_index')
+
+    def bench_view_tasks_detail(self):
+        return self.view_bench('get', 'tasks_detail', pk=self.task.pk)
+
+    def bench_view_tasks_create_get(self):
+        return self.view_bench('get', 'tasks_create')
+
+    def bench_view_tasks_create_post(self):
+        return self.view_bench('post', 'tasks_create', self.task_form_data())
+
+    def bench_view_tasks_update_get(self):
+        return self.view_bench('get', 'tasks_update', pk=self.task.pk)
+
+    def bench_view_tasks_update_post(self):
+        return self.view_bench('post', 'tasks_update', self.task_form_data(),
+                               pk=self.task.pk)
+
+    def bench_view_tasks_delete_get(self):
+        return self.view_bench('get', 'tasks_delete', pk=self.task.pk)
+
+    def bench_view_tasks_delete_post(self):
+        return self.view_bench('post', 'tasks_delete', pk=self.task.pk)
+
+    def bench_view_statuses_index(self):
+        return self.view_bench('get', 'statuses_index')
+
+    def bench_view_statuses_create_get(self):
+        return self.view_bench('get', 'statuses_create')
+
+    def bench_view_statuses_create_post(self):
+        return self.view_bench('post', 'statuses_create',
+                               self.name_form_data(Status))
+
+    def bench_view_statuses_update_get(self):
+        return self.view_bench('get', 'statuses_update', pk=self.task.status_id)
+
+    def bench_view_statuses_update_post(self):
+        return self.view_bench('post', 'statuses_update',
+                               self.name_form_data(Status),
+                               pk=self.task.status_id)
+
+    def bench_view_statuses_delete_get(self):
+        return self.view_bench('get', 'statuses_delete', pk=self.task.status_id)
+
+    def bench_view_statuses_delete_post(self):
+        return self.view_bench('post', 'statuses_delete', pk=self.unused(Status))
+
+    def bench_view_labels_index(self):
+        return self.view_bench('get', 'labels_index')
+
+    def bench_view_labels_create_get(self):
+        return self.view_bench('get', 'labels_create')
+
+    def bench_view_labels_create_post(self):
+        return self.view_bench('post', 'labels_create',
+                               self.name_form_data(Label))
+
+    def bench_view_labels_update_get(self):
+        return self.view_bench('get', 'labels_update', pk=self.label.pk)
+
+    def bench_view_labels_update_post(self):
+        return self.view_bench('post', 'labels_update',
+                               self.name_form_data(Label), pk=self.label.pk)
+
+    def bench_view_labels_delete_get(self):
+        return self.view_bench('get', 'labels_delete', pk=self.label.pk)
+
+    def bench_view_labels_delete_post(self):
+        return self.view_bench('post', 'labels_delete', pk=self.unused(Label))
+
+    def bench_view_users_index(self):
+        return self.view_bench('get', 'users_index')
+
+    def bench_view_users_create_get(self):
+        return self.view_bench('get', 'users_create')
+
+    def bench_view_users_create_post(self):
+        return self.view_bench('post', 'users_create', self.user_form_data())
+
+    def bench_view_users_update_get(self):
+        return self.view_bench('get', 'users_update', pk=self.user.pk)
+
+    def bench_view_users_update_post(self):
+        return self.view_bench('post', 'users_update', self.user_form_data(),
+                               pk=self.user.pk)
+
+    def bench_view_users_delete_get(self):
+        return self.view_bench('get', 'users_delete', pk=self.user.pk)
+
+    def bench_view_users_delete_post(self):
+        return self.view_bench('post', 'users_delete', pk=self.user.pk)
+
+    def class_view_bench(self, view_class, url_name, pk=None):
+        """
+        Вызов представления напрямую, без middleware, с рендерингом ответа.
+
+        Асинхронное представление выполняется в цикле событий через
+        async_to_sync, поэтому пары bench_sync_*/bench_async_* сравнивают
+        синхронный и асинхронный пути одной страницы.
+        """
+        kwargs = {} if pk is None else {'pk': pk}
+        request = self.request(reverse(url_name, kwargs=kwargs))
+        view = view_class.as_view()
+        if view_class.view_is_async:
+            view = async_to_sync(view)
+        return lambda: view(request, **kwargs).render()
+
+    def bench_sync_tasks_index(self):
+        return self.class_view_bench(tasks_views.IndexView, 'tasks_index')
+
+    def bench_async_tasks_index(self):
+        return self.class_view_bench(tasks_views.AsyncIndexView, 'tasks_index')
+
+    def bench_sync_tasks_detail(self):
+        return self.class_view_bench(tasks_views.TaskDetailView, 'tasks_detail',
+                                     pk=self.task.pk)
+
+    def bench_async_tasks_detail(self):
+        return self.class_view_bench(tasks_views.AsyncTaskDetailView,
+                                     'tasks_detail', pk=self.task.pk)
+
+    def bench_sync_statuses_index(self):
+        return self.class_view_bench(statuses_views.IndexView, 'statuses_index')
+
+    def bench_async_statuses_index(self):
+        return self.class_view_bench(statuses_views.AsyncIndexView,
+                                     'statuses_index')
+
+    def bench_sync_labels_index(self):
+        return self.class_view_bench(labels_views.IndexView, 'labels_index')
+
+    def bench_async_labels_index(self):
+        return self.class_view_bench(labels_views.AsyncIndexView, 'labels_index')
+
+    def bench_sync_users_index(self):
+        return self.class_view_bench(users_views.IndexView, 'users_index')
+
+    def bench_async_users_index(self):
+        return self.class_view_bench(users_views.AsyncIndexView, 'users_index')
+
+    def sqlite_write_bench(self, profile):
+        """
+        Параллельная запись SQLITE_WRITERS потоками во временную базу SQLite.
+
+        Кроме времени сообщается число зафиксированных и откатившихся из-за
+        блокировки транзакций: без них профиль, теряющий записи, выглядит
+        быстрее.
+        """
+        def run():
+            with scratch_sqlite(profile) as alias:
+                with ThreadPoolExecutor(SQLITE_WRITERS) as writers:
+                    failed = sum(writers.map(write_transactions,
+                                             [alias] * SQLITE_WRITERS,
+                                             [SQLITE_WRITES] * SQLITE_WRITERS))
+                with connections[alias].cursor() as cursor:
+                    cursor.execute('SELECT COUNT(*) FROM bench_writes')
+                    committed = cursor.fetchone()[0]
+            return {'committed': committed, 'failed': failed}
+        return run
+
+    def bench_sqlite_writes_default(self):
+        return self.sqlite_write_bench('default')
+
+    def bench_sqlite_writes_tuned(self):
+        return self.sqlite_write_bench('tuned')
+
+
+def environment():
+    return {
+        'timestamp': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': transaction.get_connection().vendor,
+        'tasks': Task.objects.count(),
+        'users': User.objects.count(),
+    }
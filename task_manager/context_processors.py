@@ -1,74 +1,75 @@
-from django.utils.translation import gettext_lazy as _
+from django.urls import get_script_prefix, reverse
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import get_language, gettext_lazy as _
+
+# Пункты навигации для анонимного (False) и авторизованного (True)
+# пользователя: подпись, имя маршрута и оформление. Пункт с user=True
+# дополняется именем пользователя в шаблоне.
+NAVBAR = {
+    False: (
+        {'label': _('Users'), 'url_name': 'users_index', 'class': 'nav-link',
+         'align': ''},
+        {'label': _('Login'), 'url_name': 'login',
+         'class': 'nav-link ms-auto', 'align': 'ms-auto'},
+        {'label': _('Registration'), 'url_name': 'users_create',
+         'class': 'nav-link ms-auto', 'align': ''},
+    ),
+    True: (
+        {'label': _('Users'), 'url_name': 'users_index', 'class': 'nav-link',
+         'align': ''},
+        {'label': _('Statuses'), 'url_name': 'statuses_index',
+         'class': 'nav-link', 'align': ''},
+        {'label': _('Labels'), 'url_name': 'labels_index', 'class': 'nav-link',
+         'align': ''},
+        {'label': _('Tasks'), 'url_name': 'tasks_index', 'class': 'nav-link',
+         'align': ''},
+        {'label': _('Wellcome'), 'user': True, 'class': 'nav-link',
+         'align': 'ms-auto'},
+        {'label': _('Logout'), 'url_name': 'logout', 'form': True,
+         'class': 'btn nav-link', 'align': ''},
+    ),
+}
+
+_items = {}
+
+
+def build_items(authenticated):
+    """
+    Пункты навигации с переведенными подписями и адресами для текущего языка.
+    """
+    items = []
+    for spec in NAVBAR[authenticated]:
+        item = {key: value for key, value in spec.items() if key != 'url_name'}
+        item['label'] = str(spec['label'])
+        if 'url_name' in spec:
+            item['url'] = reverse(spec['url_name'])
+        items.append(item)
+    return tuple(items)
+
+
+def get_items(authenticated):
+    """
+    Пункты навигации, построенные один раз для пары (язык, авторизация).
+    """
+    key = (get_language(), authenticated, get_script_prefix())
+    if key not in _items:
+        _items[key] = build_items(authenticated)
+    return _items[key]
 
 
 def navbar(request):
     """
     Provides the navbar items for the navigation bar.
 
-    It checks if the user is authenticated and returns the corresponding
-    navbar items. If the user is authenticated, it returns the links to the
-    users, statuses, labels, and tasks pages. If the user is not authenticated,
-    it returns the links to the login and registration pages.
+    Items are built once per language and authentication state and shared by
+    all requests; the username is added by the template. The value is lazy,
+    so neither the user nor the items are loaded unless the template renders
+    the navbar.
 
     :param request: The HTTP request.
     :type request: HttpRequest
     :return: A dictionary containing the navbar items.
     :rtype: dict
     """
-    user = request.user
-    navbar_items = [{
-        'label': _('Users'),
-        'url': '/users/',
-        'class': 'nav-link',
-        'align': ''
-    }]
-    if request.user.is_authenticated:
-        # Add the links to the users, statuses, labels, and tasks pages
-        navbar_items.append({
-            'label': _('Statuses'),
-            'url': '/statuses/',
-            'class': 'nav-link',
-            'align': ''
-        })
-        navbar_items.append({
-            'label': _('Labels'),
-            'url': '/labels/',
-            'class': 'nav-link',
-            'align': ''
-        })
-        navbar_items.append({
-            'label': _('Tasks'),
-            'url': '/tasks/',
-            'class': 'nav-link',
-            'align': ''
-        })
-        # Add the link to the user's profile
-        navbar_items.append({
-            'label': _('Wellcome') + ', ' + user.username,
-            'class': 'nav-link',
-            'align': 'ms-auto'
-        })
-        # Add the logout button
-        navbar_items.append({
-            'label': _('Logout'),
-            'url': '/logout/',
-            'form': True,
-            'class': 'btn nav-link',
-            'align': ''
-        })
-    else:
-        # Add the links to the login and registration pages
-        navbar_items.append({
-            'label': _('Login'),
-            'url': '/login/',
-            'class': 'nav-link ms-auto',
-            'align': 'ms-auto'
-        })
-        navbar_items.append({
-            'label': _('Registration'),
-            'url': '/users/create/',
-            'class': 'nav-link ms-auto',
-            'align': ''
-        })
-
-    return {'navbar_items': navbar_items}
+    return {'navbar_items': SimpleLazyObject(
+        lambda: get_items(request.user.is_authenticated))}
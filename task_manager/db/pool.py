@@ -0,0 +1,248 @@
+import json
+import logging
+import threading
+from collections import deque
+from time import monotonic, perf_counter
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'min_size': 2,
+    'max_size': 10,
+    'timeout': 10.0,
+    'check_interval': 30.0,
+    'max_lifetime': 3600.0,
+    'max_idle': 600.0,
+}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Ограниченный пул соединений с базой данных.
+
+    Открыто не больше max_size соединений; при исчерпании пула запрос ждет
+    освободившееся соединение не дольше timeout секунд. Соединение,
+    простоявшее без дела дольше check_interval секунд, перед выдачей
+    проверяется функцией check; соединения старше max_lifetime закрываются
+    при возврате, а лишние сверх min_size - после max_idle секунд простоя.
+
+    connect открывает соединение, check проверяет его работоспособность,
+    reset возвращает в исходное состояние (например, откатывает транзакцию)
+    и возбуждает исключение, если соединение больше нельзя использовать.
+    """
+
+    def __init__(self, connect, check=None, reset=None, label='', **options):
+        options = {**DEFAULTS, **options}
+        self.connect = connect
+        self.check = check or (lambda connection: True)
+        self.reset = reset or (lambda connection: None)
+        self.label = label
+        self.min_size = options['min_size']
+        self.max_size = options['max_size']
+        self.timeout = options['timeout']
+        self.check_interval = options['check_interval']
+        self.max_lifetime = options['max_lifetime']
+        self.max_idle = options['max_idle']
+        self.condition = threading.Condition()
+        self.idle = deque()
+        self.opened_at = {}
+        self.size = 0
+        self.waiting = 0
+        self.counters = {'checkouts': 0, 'timeouts': 0, 'failed_checks': 0,
+                         'opened': 0, 'closed': 0}
+        self.checkout_seconds = 0.0
+        self.checkout_max_seconds = 0.0
+
+    def fill(self):
+        """
+        Открытие соединений до min_size.
+        """
+        while True:
+            with self.condition:
+                if self.size >= self.min_size:
+                    return
+                self.size += 1
+            connection = self.open()
+            with self.condition:
+                self.idle.append((connection, monotonic()))
+                self.condition.notify()
+
+    def open(self):
+        try:
+            connection = self.connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.opened_at[id(connection)] = monotonic()
+            self.counters['opened'] += 1
+        return connection
+
+    def discard(self, connection):
+        with self.condition:
+            self.opened_at.pop(id(connection), None)
+            self.size -= 1
+            self.counters['closed'] += 1
+            self.condition.notify()
+        try:
+            connection.close()
+        except Exception:
+            logger.debug('Failed to close a pooled connection', exc_info=True)
+
+    def reserve(self, deadline):
+        """
+        Свободное соединение из пула или None, если можно открыть новое.
+        """
+        with self.condition:
+            while not self.idle and self.size >= self.max_size:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    self.counters['timeouts'] += 1
+                    raise PoolTimeout(
+                        f'No connection available in {self.timeout} seconds '
+                        f'(pool {self.label}, size {self.max_size})')
+                self.waiting += 1
+                try:
+                    self.condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            if self.idle:
+                return self.idle.pop()
+            self.size += 1
+            return None
+
+    def is_usable(self, connection, returned_at):
+        if monotonic() - returned_at < self.check_interval:
+            return True
+        try:
+            return self.check(connection)
+        except Exception:
+            return False
+
+    def getconn(self):
+        """
+        Выдача соединения: последнее возвращенное свободное, новое или
+        освободившееся за время ожидания.
+        """
+        start = perf_counter()
+        deadline = monotonic() + self.timeout
+        while True:
+            reserved = self.reserve(deadline)
+            if reserved is None:
+                connection = self.open()
+                break
+            connection, returned_at = reserved
+            if self.is_usable(connection, returned_at):
+                break
+            with self.condition:
+                self.counters['failed_checks'] += 1
+            self.discard(connection)
+        seconds = perf_counter() - start
+        with self.condition:
+            self.counters['checkouts'] += 1
+            self.checkout_seconds += seconds
+            self.checkout_max_seconds = max(self.checkout_max_seconds, seconds)
+        return connection
+
+    def putconn(self, connection):
+        """
+        Возврат соединения в пул; устаревшее или неисправное соединение
+        закрывается.
+        """
+        opened_at = self.opened_at.get(id(connection), 0)
+        try:
+            expired = monotonic() - opened_at >= self.max_lifetime
+            if not expired:
+                self.reset(connection)
+        except Exception:
+            expired = True
+        if expired:
+            self.discard(connection)
+            return
+        with self.condition:
+            self.idle.append((connection, monotonic()))
+            self.condition.notify()
+        self.prune()
+
+    def prune(self):
+        """
+        Закрытие соединений сверх min_size, простаивающих дольше max_idle.
+        """
+        stale = []
+        with self.condition:
+            while (len(self.idle) > 0 and self.size - len(stale) > self.min_size
+                   and monotonic() - self.idle[0][1] >= self.max_idle):
+                stale.append(self.idle.popleft()[0])
+        for connection in stale:
+            self.discard(connection)
+
+    def close(self):
+        with self.condition:
+            idle, self.idle = list(self.idle), deque()
+        for connection, returned_at in idle:
+            self.discard(connection)
+
+    def stats(self):
+        with self.condition:
+            checkouts = self.counters['checkouts']
+            return {
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                'waiting': self.waiting,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                **self.counters,
+                'checkout_avg_ms': round(self.checkout_seconds / checkouts * 1000, 3)
+                if checkouts else None,
+                'checkout_max_ms': round(self.checkout_max_seconds * 1000, 3),
+            }
+
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def get_pool(alias, conn_params, connect, **kwargs):
+    """
+    Пул процесса для псевдонима базы и параметров подключения.
+
+    Параметры входят в ключ, поэтому подключения к служебной базе (например,
+    при создании тестовой) получают отдельный пул.
+    """
+    key = (alias, json.dumps(conn_params, sort_keys=True, default=str))
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            database = conn_params.get('dbname') or conn_params.get('database')
+            label = f'{alias}:{database}'
+            pool = _pools[key] = ConnectionPool(connect, label=label, **kwargs)
+            created = True
+        else:
+            created = False
+    if created:
+        pool.fill()
+    return pool
+
+
+def close_pools(alias=None):
+    """
+    Закрытие свободных соединений пулов (всех или одного псевдонима базы).
+    """
+    with _lock:
+        pools = [pool for (pool_alias, _), pool in _pools.items()
+                 if alias is None or pool_alias == alias]
+    for pool in pools:
+        pool.close()
+
+
+def stats():
+    with _lock:
+        pools = list(_pools.values())
+    return {pool.label: pool.stats() for pool in pools}
@@ -0,0 +1,62 @@
+from functools import partial
+
+from django.db.backends.postgresql import base, creation
+
+from task_manager.db import pool
+
+
+def check_connection(connection):
+    """
+    Проверка соединения запросом SELECT 1.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+    if not connection.autocommit:
+        connection.rollback()
+    return True
+
+
+def reset_connection(connection):
+    """
+    Откат незавершенной транзакции перед возвратом соединения в пул.
+    """
+    if connection.closed:
+        raise base.Database.InterfaceError('connection already closed')
+    if connection.get_transaction_status() != \
+            base.Database.extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        pool.close_pools(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL с пулом соединений процесса.
+
+    Соединения берутся из ограниченного пула (task_manager.db.pool) и при
+    закрытии возвращаются в него, поэтому CONN_MAX_AGE должен быть 0:
+    соединение отдается в пул после каждого запроса. Параметры пула задаются
+    в словаре POOL настроек базы.
+    """
+    creation_class = DatabaseCreation
+
+    def get_pool(self, conn_params):
+        return pool.get_pool(self.alias, conn_params,
+                             partial(super().get_new_connection, conn_params),
+                             check=check_connection, reset=reset_connection,
+                             **self.settings_dict.get('POOL', {}))
+
+    def get_new_connection(self, conn_params):
+        try:
+            return self.get_pool(conn_params).getconn()
+        except pool.PoolTimeout as error:
+            raise self.Database.OperationalError(str(error)) from error
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.get_pool(self.get_connection_params()).putconn(self.connection)
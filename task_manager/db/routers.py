@@ -0,0 +1,80 @@
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+STICKY_SESSION_KEY = '_primary_until'
+
+_state = ContextVar('replica_routing', default=None)
+
+
+@dataclass
+class RoutingState:
+    replica: str = None
+    wrote: bool = False
+
+
+class ReplicaRouter:
+    """
+    Чтение с реплики для страниц списков и просмотра, запись - в основную
+    базу.
+
+    Реплика выбирается для запроса в ReplicaRoutingMiddleware. После первой
+    записи в запросе чтение до конца запроса тоже идет в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.wrote:
+            return None
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Выбор базы для чтения на время запроса.
+
+    GET-запросы к маршрутам REPLICA_READ_VIEWS читают со случайной реплики из
+    DATABASE_REPLICAS. После запроса с записью сессия на
+    REPLICA_STICKY_SECONDS секунд закрепляется за основной базой, чтобы
+    пользователь сразу видел свои изменения.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote and hasattr(request, 'session'):
+            request.session[STICKY_SESSION_KEY] = (time.time()
+                                                   + settings.REPLICA_STICKY_SECONDS)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (request.method in ('GET', 'HEAD')
+                and request.resolver_match.url_name in settings.REPLICA_READ_VIEWS
+                and request.session.get(STICKY_SESSION_KEY, 0) <= time.time()):
+            _state.get().replica = random.choice(settings.DATABASE_REPLICAS)
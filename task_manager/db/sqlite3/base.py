@@ -0,0 +1,37 @@
+from django.db.backends.sqlite3 import base
+
+# Профиль для нескольких процессов-писателей: журнал WAL не блокирует
+# читателей, synchronous=NORMAL в режиме WAL не вызывает fsync на каждую
+# фиксацию, busy_timeout ждет освобождения блокировки вместо ошибки
+# "database is locked".
+PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 268435456,
+    'cache_size': -65536,
+    'temp_store': 'MEMORY',
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite с настройкой каждого нового соединения.
+
+    PRAGMAS настроек базы выполняются при открытии соединения. При
+    IMMEDIATE_WRITES транзакции начинаются с BEGIN IMMEDIATE: блокировка на
+    запись берется сразу, и транзакция, начавшаяся с чтения, не получает
+    ошибку при повышении блокировки, а ждет очереди (busy_timeout).
+    """
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict.get('PRAGMAS', {}).items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        if self.settings_dict.get('IMMEDIATE_WRITES'):
+            self.cursor().execute('BEGIN IMMEDIATE')
+        else:
+            super()._start_transaction_under_autocommit()
@@ -0,0 +1,212 @@
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager import reference_cache
+from task_manager.benchmarks import scratch_sqlite, write_transactions
+from task_manager.db.pool import ConnectionPool, PoolTimeout
+from task_manager.db.routers import STICKY_SESSION_KEY
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.broken = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTest(TestCase):
+    def make_pool(self, **options):
+        def reset(conn):
+            if conn.broken:
+                raise ConnectionError('broken')
+        return ConnectionPool(FakeConnection, check=lambda conn: not conn.broken,
+                              reset=reset, label='test',
+                              **{'min_size': 0, 'max_size': 2, **options})
+
+    def test_reuse_and_stats(self):
+        """
+        Проверка повторного использования соединений и статистики пула.
+        """
+        pool = self.make_pool(min_size=1)
+        pool.fill()
+        first = pool.getconn()
+        second = pool.getconn()
+        self.assertIsNot(first, second)
+        self.assertEqual(pool.stats()['in_use'], 2)
+        pool.putconn(first)
+        self.assertIs(pool.getconn(), first)
+        stats = pool.stats()
+        self.assertEqual((stats['opened'], stats['checkouts'], stats['idle']),
+                         (2, 3, 0))
+        self.assertIsNotNone(stats['checkout_avg_ms'])
+
+    def test_timeout_and_waiting(self):
+        """
+        Проверка ожидания соединения при исчерпании пула и ошибки по
+        истечении времени ожидания.
+        """
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        conn = pool.getconn()
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+        pool.timeout = 5
+        timer = threading.Timer(0.05, pool.putconn, [conn])
+        timer.start()
+        self.assertIs(pool.getconn(), conn)
+        timer.join()
+        self.assertEqual(pool.stats()['opened'], 1)
+
+    def test_health_checks(self):
+        """
+        Проверка замены неисправных и устаревших соединений.
+        """
+        pool = self.make_pool(check_interval=0)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.broken = True
+        replacement = pool.getconn()
+        self.assertIsNot(replacement, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()['failed_checks'], 1)
+
+        replacement.broken = True
+        pool.putconn(replacement)
+        self.assertTrue(replacement.closed)
+
+        pool.max_lifetime = 0
+        conn = pool.getconn()
+        pool.putconn(conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+    def test_prune_and_close(self):
+        """
+        Проверка закрытия лишних простаивающих соединений и всего пула.
+        """
+        pool = self.make_pool(min_size=1, max_idle=0)
+        connections = [pool.getconn(), pool.getconn()]
+        for conn in connections:
+            pool.putconn(conn)
+        self.assertEqual(pool.stats()['size'], 1)
+        pool.close()
+        self.assertTrue(all(conn.closed for conn in connections))
+        self.assertEqual(pool.stats()['closed'], 2)
+
+
+class SqliteProfileTest(TestCase):
+    def test_tuned_connection(self):
+        """
+        Проверка настройки соединений и BEGIN IMMEDIATE в транзакциях.
+        """
+        with scratch_sqlite('tuned') as alias:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                self.assertEqual(cursor.fetchone(), ('wal',))
+                cursor.execute('PRAGMA busy_timeout')
+                self.assertEqual(cursor.fetchone(), (5000,))
+            with CaptureQueriesContext(connections[alias]) as queries:
+                with transaction.atomic(using=alias):
+                    pass
+            self.assertEqual(queries.captured_queries[0]['sql'], 'BEGIN IMMEDIATE')
+            self.assertEqual(write_transactions(alias, 3), 0)
+
+    def test_write_views_in_transaction(self):
+        """
+        Проверка выполнения изменяющего представления в одной транзакции
+        при IMMEDIATE_WRITES.
+        """
+        user = User.objects.create_user(username='writer', password='123')
+        self.client.force_login(user)
+        for immediate, names in ((False, ['First']), (True, ['First', 'Second'])):
+            with patch.dict(connection.settings_dict,
+                            {'IMMEDIATE_WRITES': immediate}), \
+                    CaptureQueriesContext(connection) as queries:
+                self.client.post(reverse('statuses_create'), {'name': names[-1]})
+            self.assertEqual(any(query['sql'].startswith('SAVEPOINT')
+                                 for query in queries.captured_queries), immediate)
+            self.assertEqual(list(Status.objects.values_list('name', flat=True)),
+                             names)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTest(TestCase):
+    def setUp(self):
+        """
+        Реплика - отдельный файл SQLite со своими данными, поэтому по
+        содержимому страницы видно, из какой базы она прочитана.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        connections.settings['replica'] = {
+            **connection.settings_dict, 'TEST': {},
+            'NAME': os.path.join(self.directory.name, 'replica.sqlite3'),
+        }
+        call_command('migrate', database='replica', verbosity=0)
+        self.user = User.objects.create_user(username='reader', password='123')
+        User.objects.using('replica').bulk_create([self.user])
+        Status.objects.using('replica').create(name='Replica status')
+        Status.objects.create(name='Primary status')
+        reference_cache.clear_all()
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        reference_cache.clear_all()
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        self.directory.cleanup()
+
+    def test_reads_from_replica(self):
+        """
+        Проверка чтения страниц списков с реплики и остальных страниц и
+        записей - из основной базы.
+        """
+        self.assertContains(self.client.get(reverse('statuses_index')),
+                            'Replica status')
+        Task.objects.create(name='Primary task', author=self.user,
+                            status=Status.objects.get())
+        self.assertNotContains(self.client.get(reverse('tasks_index')),
+                               'Primary task')
+        response = self.client.get(reverse('statuses_update',
+                                           args=[Status.objects.get().pk]))
+        self.assertContains(response, 'Primary status')
+
+    def test_sticky_after_write(self):
+        """
+        Проверка чтения из основной базы после записи, пока не истекло окно
+        REPLICA_STICKY_SECONDS.
+
+        Кеш справочника не отдает закрепленной сессии копию, загруженную с
+        реплики для другой сессии после записи, и наоборот.
+        """
+        self.client.post(reverse('statuses_create'), {'name': 'New status'})
+        self.assertTrue(Status.objects.filter(name='New status').exists())
+        self.assertIn(STICKY_SESSION_KEY, self.client.session)
+        other = Client()
+        other.force_login(self.user)
+        for client, present, absent in (
+                (other, 'Replica status', 'New status'),
+                (self.client, 'New status', 'Replica status'),
+                (other, 'Replica status', 'New status')):
+            response = client.get(reverse('statuses_index'))
+            self.assertContains(response, present)
+            self.assertNotContains(response, absent)
+
+        with patch('task_manager.db.routers.time') as clock:
+            clock.time.return_value = self.client.session[STICKY_SESSION_KEY] + 1
+            self.assertContains(self.client.get(reverse('statuses_index')),
+                                'Replica status')
@@ -0,0 +1,52 @@
+import django_filters
+from django import forms
+from django_filters import fields as filter_fields
+
+from task_manager import reference_cache
+
+
+class CachedChoiceMixin:
+    """
+    Проверка выбранного значения по кешу справочника вместо запроса к базе.
+
+    Используется только для нефильтрованных querysets кешируемых моделей;
+    если значения нет в кеше, выполняется обычная проверка запросом.
+    """
+
+    def get_reference_cache(self):
+        if self.queryset.query.has_filters():
+            return None
+        return reference_cache.for_model(self.queryset.model)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        cached = self.get_reference_cache()
+        obj = cached.get(value) if cached else None
+        if obj is None:
+            return super().to_python(value)
+        return obj
+
+
+class CachedModelChoiceField(CachedChoiceMixin, forms.ModelChoiceField):
+    pass
+
+
+class CachedModelMultipleChoiceField(CachedChoiceMixin,
+                                     forms.ModelMultipleChoiceField):
+    def _check_values(self, value):
+        cached = self.get_reference_cache()
+        if cached:
+            objects = cached.get_many(value)
+            if len(objects) == len(value):
+                return objects
+        return super()._check_values(value)
+
+
+class CachedFilterModelChoiceField(CachedChoiceMixin,
+                                   filter_fields.ModelChoiceField):
+    pass
+
+
+class CachedModelChoiceFilter(django_filters.ModelChoiceFilter):
+    field_class = CachedFilterModelChoiceField
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LabelsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.labels'
+
+    def ready(self):
+        from task_manager import reference_cache
+        reference_cache.labels.connect()
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:34
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_of(queryset, field):
+    counts = (queryset.filter(**{field: OuterRef('pk')}).order_by()
+              .values(field).annotate(total=Count('pk')).values('total'))
+    return Coalesce(Subquery(counts, output_field=models.IntegerField()), Value(0))
+
+
+def backfill(apps, schema_editor):
+    Label = apps.get_model('labels', 'Label')
+    Through = apps.get_model('tasks', 'Task').labels.through
+    Label.objects.update(task_count=count_of(Through.objects.all(), 'label'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0001_initial'),
+        ('tasks', '0003_task_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='label',
+            name='task_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -2,10 +2,15 @@ from django.db import models
 from django.db.models import ProtectedError
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.tasks.counters import CounterFieldsMixin
 
-class Label(models.Model):
+
+class Label(CounterFieldsMixin, models.Model):
     name = models.CharField(max_length=50, verbose_name=_('Name'), unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    task_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ('task_count',)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -17,9 +22,13 @@ class Label(models.Model):
         """
         Проверка на использование метки в задачах
 
+        Проверка выполняется по счетчику задач. Связи с задачами удаляются
+        каскадно без PROTECT, поэтому при нулевом счетчике наличие связей
+        дополнительно проверяется запросом на случай расхождения счетчика
+        с данными.
         Возбуждает ProtectedError если метка используется хотя бы одной задачей
         """
-        if self.task_set.exists():
+        if self.task_count or self.task_set.exists():
             raise ProtectedError("Cannot delete label because it is in use",
                                  self.task_set.all())
 
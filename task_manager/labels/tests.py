@@ -1,9 +1,18 @@
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from django.test import TestCase, Client
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase, Client, RequestFactory
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from task_manager.labels.models import Label
+from task_manager.labels.views import (AsyncIndexView, IndexView,
+                                       LabelAutocompleteView)
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.testing import without_csrf
 
 User = get_user_model()
 
@@ -79,6 +88,33 @@ class LabelsIndexViewTest(BaseTestCase):
         self.assertTemplateUsed(response, 'labels/index.html')
 
 
+class LabelsAsyncIndexViewTest(BaseTestCase):
+    def test_async_index(self):
+        """
+        Проверка асинхронного списка меток.
+
+        Страница должна совпадать с синхронной и читаться из базы, а не из
+        кеша справочника, неавторизованный пользователь перенаправляется на
+        страницу входа.
+        """
+        Label.objects.create(name='Async label')
+        request = RequestFactory().get(reverse('labels_index'))
+        request.user = self.user
+        expected = IndexView.as_view()(request).render()
+        response = async_to_sync(AsyncIndexView.as_view())(request).render()
+        self.assertContains(response, 'Async label')
+        self.assertEqual(without_csrf(response.content),
+                         without_csrf(expected.content))
+        Label.objects.update(name='Changed without signals')
+        response = async_to_sync(AsyncIndexView.as_view())(request).render()
+        self.assertContains(response, 'Changed without signals')
+
+        request.user = AnonymousUser()
+        response = async_to_sync(AsyncIndexView.as_view())(request)
+        self.assertRedirects(response, reverse('login'),
+                             fetch_redirect_response=False)
+
+
 class LabelsCreateViewTest(BaseTestCase):
     def test_label_create_view_get(self):
         """
@@ -287,3 +323,65 @@ class LabelsDeleteViewTest(BaseTestCase):
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse('labels_index'))
         self.assertEqual(Label.objects.count(), 0)
+
+    def test_label_in_use_with_stale_counter(self):
+        """
+        Проверка удаления метки, связанной с задачей, при нулевом счетчике.
+
+        Метка не удаляется, страница перенаправляется на список меток.
+        """
+        status = Status.objects.create(name='Test status')
+        task = Task.objects.create(name='Test task', description='Test',
+                                   status=status, author=self.user)
+        task.labels.add(self.label)
+        Label.objects.update(task_count=0)
+        response = self.client.post(
+            reverse('labels_delete', kwargs={'pk': self.label.pk}))
+        self.assertRedirects(response, reverse('labels_index'))
+        self.assertTrue(Label.objects.filter(pk=self.label.pk).exists())
+        self.assertEqual(list(task.labels.all()), [self.label])
+
+
+class LabelAutocompleteViewTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        for name in ('Alpha', 'Beta', 'alpine'):
+            Label.objects.create(name=name)
+
+    def test_autocomplete_search(self):
+        """
+        Проверка поиска меток по началу названия.
+
+        Поиск не зависит от регистра, в ответе - первичные ключи и названия.
+        """
+        response = self.client.get(reverse('labels_autocomplete'), {'term': 'al'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([item['text'] for item in data['results']],
+                         ['Alpha', 'alpine'])
+        self.assertEqual(data['results'][0]['id'],
+                         Label.objects.get(name='Alpha').id)
+        self.assertFalse(data['pagination']['more'])
+
+    def test_autocomplete_pages(self):
+        """
+        Проверка постраничной выдачи меток.
+        """
+        with patch.object(LabelAutocompleteView, 'paginate_by', 2):
+            first = self.client.get(reverse('labels_autocomplete')).json()
+            second = self.client.get(reverse('labels_autocomplete'),
+                                     {'page': 2}).json()
+            broken = self.client.get(reverse('labels_autocomplete'),
+                                     {'page': 'x'}).json()
+        self.assertTrue(first['pagination']['more'])
+        self.assertFalse(second['pagination']['more'])
+        self.assertEqual(len(first['results']) + len(second['results']), 3)
+        self.assertEqual(broken, first)
+
+    def test_autocomplete_unauthorized(self):
+        """
+        Проверка доступа к списку меток без авторизации.
+        """
+        self.client.logout()
+        response = self.client.get(reverse('labels_autocomplete'))
+        self.assertRedirects(response, reverse('login'))
@@ -1,10 +1,15 @@
+from django.conf import settings
 from django.urls import path
 
 from task_manager.labels import views
 
+IndexView = views.AsyncIndexView if settings.ASYNC_VIEWS else views.IndexView
+
 urlpatterns = [
-    path('', views.IndexView.as_view(), name='labels_index'),
+    path('', IndexView.as_view(), name='labels_index'),
     path('create/', views.LabelCreateView.as_view(), name='labels_create'),
     path('<int:pk>/update/', views.LabelUpdateView.as_view(), name='labels_update'),
     path('<int:pk>/delete/', views.LabelDeleteView.as_view(), name='labels_delete'),
+    path('autocomplete/', views.LabelAutocompleteView.as_view(),
+         name='labels_autocomplete'),
 ]
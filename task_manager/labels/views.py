@@ -1,9 +1,13 @@
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
+from task_manager import reference_cache
 from task_manager.labels.forms import LabelForm
 from task_manager.labels.models import Label
-from task_manager.mixins import (CustomIndexView,
+from task_manager.mixins import (AsyncListMixin,
+                                 AsyncLoginRequiredMixin,
+                                 CustomAutocompleteView,
+                                 CustomIndexView,
                                  CustomCreateView,
                                  CustomUpdateView,
                                  CustomDeleteView)
@@ -14,6 +18,20 @@ class IndexView(CustomIndexView):
     model = Label
     context_object_name = 'labels'
 
+    def get_queryset(self):
+        """
+        Список читается из базы одним запросом: счетчик задач task_count в
+        копиях кеша справочника не обновляется.
+        """
+        return Label.objects.order_by(*reference_cache.labels.ordering)
+
+
+class AsyncIndexView(AsyncListMixin, AsyncLoginRequiredMixin, IndexView):
+    """
+    Асинхронная версия списка: тот же запрос, что и в синхронной версии,
+    метки читаются через aiterator() без перехода в поток.
+    """
+
 
 class LabelCreateView(CustomCreateView):
     template_name = 'labels/create.html'
@@ -38,3 +56,7 @@ class LabelDeleteView(CustomDeleteView):
     success_message = _('Label successfully deleted')
     protected_error_message = _('Cannot delete label because it is in use')
     redirect_url = reverse_lazy('labels_index')
+
+
+class LabelAutocompleteView(CustomAutocompleteView):
+    model = Label
@@ -0,0 +1,210 @@
+import atexit
+import copy
+import json
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Запись лога одной строкой JSON.
+
+    Помимо стандартных полей в запись попадают дополнительные атрибуты
+    (extra), несериализуемые значения выводятся через str().
+    """
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        entry.update((key, value) for key, value in vars(record).items()
+                     if key not in RECORD_ATTRIBUTES and not key.startswith('_'))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Прореживание отладочных записей.
+
+    Записи уровня не выше max_level пропускаются с вероятностью rate и не
+    больше limit записей за period секунд на логгер (limit=0 - без
+    ограничения). Записи более высоких уровней проходят всегда.
+    """
+
+    def __init__(self, rate=1.0, limit=0, period=1.0, max_level='DEBUG'):
+        super().__init__()
+        self.rate = rate
+        self.limit = limit
+        self.period = period
+        self.max_level = logging.getLevelName(max_level) \
+            if isinstance(max_level, str) else max_level
+        self.lock = threading.Lock()
+        self.windows = {}
+        self.dropped = 0
+
+    def within_limit(self, name):
+        now = time.monotonic()
+        with self.lock:
+            start, count = self.windows.get(name, (now, 0))
+            if now - start >= self.period:
+                start, count = now, 0
+            self.windows[name] = (start, count + 1)
+            return count < self.limit
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        passed = ((self.rate >= 1 or random.random() < self.rate)
+                  and (not self.limit or self.within_limit(record.name)))
+        if not passed:
+            self.dropped += 1
+        return passed
+
+
+class RotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    Файл лога с ротацией по времени (when, interval) и по размеру
+    (max_bytes, 0 - без ограничения).
+
+    Ротированные файлы получают суффикс с временем ротации, хранятся
+    последние backup_count файлов. Ротация выполняется в процессе, поэтому
+    файл должен писать один процесс: для нескольких процессов с общим файлом
+    используется WatchedFileHandler и внешняя ротация (LOG_ROTATE=external).
+    """
+
+    def __init__(self, filename, when='midnight', interval=1, max_bytes=0,
+                 backup_count=7, encoding='utf-8', delay=True):
+        super().__init__(filename, when=when, interval=interval,
+                         backupCount=backup_count, encoding=encoding, delay=delay)
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record):
+        if int(time.time()) >= self.rolloverAt:
+            return True
+        if not self.max_bytes:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        return self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes
+
+    def rotated_name(self):
+        name = f"{self.baseFilename}.{time.strftime('%Y%m%d-%H%M%S')}"
+        target, number = name, 1
+        while os.path.exists(target):
+            target, number = f'{name}.{number}', number + 1
+        return target
+
+    def getFilesToDelete(self):
+        directory, base = os.path.split(self.baseFilename)
+        rotated = sorted((os.path.join(directory, name)
+                          for name in os.listdir(directory)
+                          if name.startswith(f'{base}.')), key=os.path.getmtime)
+        return rotated[:-self.backupCount] if self.backupCount else []
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename):
+            self.rotate(self.baseFilename, self.rotated_name())
+        for path in self.getFilesToDelete():
+            os.remove(path)
+        self.rolloverAt = self.computeRollover(int(time.time()))
+        if not self.delay:
+            self.stream = self._open()
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        """
+        Подготовка записи к передаче в поток записи: сообщение форматируется
+        сразу, трассировка исключения сохраняется текстом, остальные
+        атрибуты (extra) не меняются.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or \
+                logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def stop_listener():
+    """
+    Остановка потока записи с выводом оставшихся в очереди записей.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def start_listener(handlers, filters=(), logger_names=('',)):
+    """
+    Обработчики handlers переносятся в фоновый поток: логгеры logger_names
+    только помещают записи в очередь, прошедшие фильтры filters.
+    """
+    global _listener
+    stop_listener()
+    records = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    for log_filter in filters:
+        queue_handler.addFilter(log_filter)
+    for name in logger_names:
+        logging.getLogger(name).handlers = [queue_handler]
+    _listener = logging.handlers.QueueListener(records, *handlers,
+                                               respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def configure(config):
+    """
+    Настройка логирования (LOGGING_CONFIG) по словарю LOGGING.
+
+    Необязательный ключ queue ({"handlers": [...], "filters": [...],
+    "loggers": [...]}) переносит перечисленные обработчики в фоновый поток:
+    логгеры (по умолчанию корневой) только помещают записи в очередь, и
+    запись на диск не блокирует обработку запросов.
+    """
+    config = dict(config)
+    queue_config = config.pop('queue', None)
+    configurator = logging.config.DictConfigurator(config)
+    configurator.configure()
+    if not queue_config:
+        stop_listener()
+        return
+    handlers = configurator.config['handlers']
+    filters = configurator.config.get('filters', {})
+    start_listener([handlers[name] for name in queue_config['handlers']],
+                   [filters[name] for name in queue_config.get('filters', ())],
+                   queue_config.get('loggers', ('',)))
+
+
+atexit.register(stop_listener)
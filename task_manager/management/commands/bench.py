@@ -0,0 +1,54 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.benchmarks import BenchmarkSuite, environment
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Run in-process microbenchmarks and report p50/p95/p99 timings'
+
+    def add_arguments(self, parser):
+        names = ', '.join(BenchmarkSuite.names())
+        parser.add_argument('names', nargs='*', metavar='benchmark',
+                            help=f'Benchmarks to run (default: all): {names}')
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--username',
+                            help='User to run the views as (default: first author)')
+        parser.add_argument('--output', help='Write JSON results to this file')
+
+    def handle(self, *args, **options):
+        names = options['names'] or BenchmarkSuite.names()
+        unknown = set(names) - set(BenchmarkSuite.names())
+        if unknown:
+            raise CommandError(f'Unknown benchmarks: {", ".join(sorted(unknown))}')
+        user = self.get_user(options['username'])
+        suite = BenchmarkSuite(user)
+        results = suite.run(names, options['iterations'], options['warmup'])
+
+        for name, summary in results.items():
+            line = (f'{name:<32} p50 {summary["p50_ms"]:>9.3f} ms  '
+                    f'p95 {summary["p95_ms"]:>9.3f} ms  '
+                    f'p99 {summary["p99_ms"]:>9.3f} ms')
+            if 'committed' in summary:
+                line += (f'  committed {summary["committed_per_second"]:.1f}/s  '
+                         f'failed {summary["failed"]}')
+            self.stdout.write(line)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({'environment': environment(), 'results': results},
+                          output, indent=2)
+
+    def get_user(self, username):
+        if username:
+            user = User.objects.filter(username=username).first()
+        else:
+            task = Task.objects.select_related('author').first()
+            user = task.author if task else None
+        if user is None:
+            raise CommandError('No data to benchmark: run seed_load first '
+                               'or pass an existing --username')
+        return user
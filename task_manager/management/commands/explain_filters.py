@@ -0,0 +1,164 @@
+import json
+import re
+from itertools import combinations
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.tasks.views import IndexView
+from task_manager.users.models import User
+
+FILTERS = ('status', 'executor', 'labels', 'self_tasks', 'search')
+DEFAULT_SNAPSHOT_DIR = Path(settings.BASE_DIR) / 'task_manager' / 'tasks' / 'plans'
+
+# Признаки полного просмотра таблицы и сортировки вне индекса в выводе EXPLAIN
+SEQ_SCAN = {
+    'sqlite': re.compile(r'^SCAN (?!.*(USING|VIRTUAL TABLE))'),
+    'postgresql': re.compile(r'Seq Scan'),
+}
+SORT = {
+    'sqlite': re.compile(r'USE TEMP B-TREE FOR'),
+    'postgresql': re.compile(r'^(->\s*)?(Incremental )?Sort\b'),
+}
+# Оценки стоимости и номера узлов меняются от запуска к запуску
+VOLATILE = re.compile(r'\s*\((cost|actual)=[^)]*\)|^\d+ \d+ \d+ ')
+
+
+def normalize_plan(plan):
+    """
+    Строки плана без оценок стоимости.
+
+    >>> normalize_plan('Limit  (cost=0.29..9.1 rows=51 width=8)\\n  ->  Seq Scan on t')
+    ['Limit', '  ->  Seq Scan on t']
+    """
+    return [VOLATILE.sub('', line).rstrip() for line in plan.splitlines()
+            if line.strip()]
+
+
+def flag_plan(lines, vendor):
+    """
+    Полные просмотры таблиц и сортировки в плане запроса.
+
+    >>> flag_plan(['Limit', '  ->  Sort', '        ->  Seq Scan on tasks_task'],
+    ...           'postgresql')
+    ['sort: Sort', 'seq scan: Seq Scan on tasks_task']
+    """
+    flags = []
+    for line in lines:
+        text = line.strip().lstrip('-> ').strip()
+        if vendor in SEQ_SCAN and SEQ_SCAN[vendor].search(text):
+            flags.append(f'seq scan: {text}')
+        if vendor in SORT and SORT[vendor].search(text):
+            flags.append(f'sort: {text}')
+    return flags
+
+
+class Command(BaseCommand):
+    help = ('Run EXPLAIN for every TaskFilterForm combination, flag sequential '
+            'scans and sorts and compare plans with stored snapshots')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username',
+                            help='User for the "only your tasks" filter '
+                                 '(default: most active author)')
+        parser.add_argument('--search', default='task',
+                            help='Query used for the search filter')
+        parser.add_argument('--snapshot-dir', default=str(DEFAULT_SNAPSHOT_DIR))
+        parser.add_argument('--update', action='store_true',
+                            help='Write current plans to the snapshot file')
+        parser.add_argument('--check', action='store_true',
+                            help='Fail if plans differ from the snapshot')
+        parser.add_argument('--no-analyze', action='store_true',
+                            help='Do not refresh planner statistics first')
+
+    def handle(self, *args, **options):
+        if not Task.objects.exists():
+            raise CommandError('No tasks to explain, fill the database first '
+                               '(for example with seed_load)')
+        if not options['no_analyze']:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        self.user = self.get_user(options['username'])
+        self.values = self.sample_values(options['search'])
+        plans = {'+'.join(combo) or 'none': self.explain(combo)
+                 for combo in self.combinations()}
+        self.report(plans)
+
+        path = Path(options['snapshot_dir']) / f'{connection.vendor}.json'
+        if options['update']:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(plans, indent=2, ensure_ascii=False) + '\n')
+            self.stdout.write(f'Snapshot written to {path}')
+        elif options['check']:
+            self.check_snapshot(path, plans)
+
+    def get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'User "{username}" does not exist')
+        return User.objects.order_by('-authored_count', 'id').first()
+
+    def sample_values(self, search):
+        """
+        Значения фильтров - самые частые варианты, как у реальных запросов.
+        """
+        executor = (User.objects.order_by('-assigned_count', 'id')
+                    .values_list('id', flat=True).first())
+        return {
+            'status': Status.objects.order_by('-task_count', 'id')
+            .values_list('id', flat=True).first(),
+            'executor': executor,
+            'labels': Label.objects.order_by('-task_count', 'id')
+            .values_list('id', flat=True).first(),
+            'self_tasks': 'on',
+            'search': search,
+        }
+
+    def combinations(self):
+        for size in range(len(FILTERS) + 1):
+            yield from combinations(FILTERS, size)
+
+    def build_queryset(self, combo):
+        """
+        Запрос страницы списка задач так же, как его строит IndexView.
+        """
+        data = {name: self.values[name] for name in combo}
+        request = RequestFactory().get(reverse('tasks_index'), data)
+        request.user = self.user
+        view = IndexView()
+        view.setup(request)
+        filterset = view.get_filterset(view.get_filterset_class())
+        if filterset.is_bound and not filterset.is_valid():
+            raise CommandError(f'Invalid filter {data}: {filterset.errors}')
+        view.object_list = filterset.qs
+        return (view.object_list.order_by(*view.get_keyset_ordering())
+                [:view.paginate_by + 1])
+
+    def explain(self, combo):
+        plan = normalize_plan(self.build_queryset(combo).explain())
+        return {'plan': plan, 'flags': flag_plan(plan, connection.vendor)}
+
+    def report(self, plans):
+        for name, result in plans.items():
+            status = '; '.join(result['flags']) or 'ok'
+            style = self.style.WARNING if result['flags'] else self.style.SUCCESS
+            self.stdout.write(f'{name:<45} {style(status)}')
+
+    def check_snapshot(self, path, plans):
+        if not path.exists():
+            raise CommandError(f'Snapshot {path} does not exist, run with --update')
+        snapshot = json.loads(path.read_text())
+        changed = sorted(name for name in plans.keys() | snapshot.keys()
+                         if plans.get(name) != snapshot.get(name))
+        if changed:
+            raise CommandError(f'Plans differ from {path}: {", ".join(changed)}')
+        self.stdout.write(self.style.SUCCESS('Plans match the snapshot'))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.tasks.importer import (DEFAULT_BATCH_SIZE, FORMATS,
+                                         EncodingError, TaskImporter,
+                                         decode_lines, detect_format)
+from task_manager.users.models import User
+
+
+class Command(BaseCommand):
+    help = ('Import tasks from a CSV or JSON Lines file with columns name, '
+            'description, status, author, executor and labels')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=FORMATS,
+                            help='File format (default: by file extension)')
+        parser.add_argument('--author',
+                            help='Username used when a record has no author')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        author = None
+        if options['author']:
+            author = User.objects.filter(username=options['author']).first()
+            if author is None:
+                raise CommandError(f'User "{options["author"]}" does not exist')
+        file_format = options['format'] or detect_format(options['path'])
+        importer = TaskImporter(author, options['batch_size'])
+        try:
+            with open(options['path'], 'rb') as lines:
+                importer.run(decode_lines(lines), file_format)
+        except OSError as error:
+            raise CommandError(error)
+        except EncodingError as error:
+            self.write_errors(importer)
+            raise CommandError(f'{error}, imported {importer.created} tasks '
+                               f'before it')
+
+        self.write_errors(importer)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {importer.created} tasks, skipped {len(importer.errors)} '
+            f'invalid records'))
+
+    def write_errors(self, importer):
+        for line_number, message in importer.errors:
+            self.stderr.write(f'Line {line_number}: {message}')
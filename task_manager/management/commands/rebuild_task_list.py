@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.tasks import read_model, versions
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized task list table from tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            default=read_model.DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        rebuilt, removed = read_model.rebuild(options['batch_size'])
+        versions.bump()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rebuilt} task list rows, removed {removed} stale rows'))
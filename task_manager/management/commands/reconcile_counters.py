@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.tasks import counters
+
+
+class Command(BaseCommand):
+    help = 'Compare denormalized task counters with actual data and fix drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report drift, do not update counters')
+
+    def handle(self, *args, **options):
+        drift = counters.reconcile(fix=not options['dry_run'])
+        for counter, rows in drift.items():
+            self.stdout.write(f'{counter:<32} {rows} rows drifted')
+        if not any(drift.values()):
+            self.stdout.write(self.style.SUCCESS('All counters are consistent'))
+        elif not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS('Counters reconciled'))
@@ -0,0 +1,192 @@
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.labels.models import Label
+from task_manager.tasks import counters, read_model, versions
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+FIRST_NAMES = ('Alex', 'Maria', 'Ivan', 'Olga', 'Dmitry', 'Anna', 'Sergey',
+               'Elena', 'Pavel', 'Natalia', 'Andrey', 'Irina')
+LAST_NAMES = ('Ivanov', 'Smirnov', 'Kuznetsov', 'Popov', 'Sokolov', 'Lebedev',
+              'Kozlov', 'Novikov', 'Morozov', 'Petrov', 'Volkov', 'Fedorov')
+LABELS_PER_TASK_WEIGHTS = (30, 35, 20, 10, 5)
+NO_EXECUTOR_SHARE = 0.15
+DEFAULT_START = '2024-01-01'
+
+
+def zipf_weights(size, exponent=1.1):
+    """
+    Кумулятивные веса распределения Ципфа.
+
+    Небольшая часть пользователей, статусов и меток встречается в большинстве
+    задач, как и в реальных данных.
+    """
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, size + 1)))
+
+
+def start_date(value):
+    """
+    Дата создания первой задачи; дата без часового пояса считается UTC.
+
+    >>> start_date('2024-01-01')
+    datetime.datetime(2024, 1, 1, 0, 0, tzinfo=datetime.timezone.utc)
+    """
+    value = datetime.fromisoformat(value)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@contextmanager
+def explicit_created_at():
+    """
+    Временное отключение auto_now_add у Task.created_at.
+
+    Позволяет распределить даты создания задач по периоду, а не записывать
+    всем задачам момент загрузки.
+    """
+    field = Task._meta.get_field('created_at')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with a deterministic synthetic dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--labels', type=int, default=50)
+        parser.add_argument('--statuses', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--days', type=int, default=365,
+                            help='Spread task creation dates over this period')
+        parser.add_argument('--start', type=start_date,
+                            default=start_date(DEFAULT_START),
+                            help='Creation date of the first task, ISO 8601 '
+                                 f'(default: {DEFAULT_START})')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='load',
+                            help='Prefix for generated names')
+        parser.add_argument('--password', default='password',
+                            help='Password shared by all generated users')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if Task.objects.filter(name__startswith=f'{prefix} task ').exists():
+            raise CommandError(f'Dataset with prefix "{prefix}" already exists')
+        if min(options['users'], options['statuses']) < 1:
+            raise CommandError('At least one user and one status are required')
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
+
+        user_ids = self.create_users(prefix, options['users'], options['password'])
+        status_ids = self.create_named(Status, f'{prefix} status',
+                                       options['statuses'])
+        label_ids = self.create_named(Label, f'{prefix} label', options['labels'])
+        self.create_tasks(prefix, options['tasks'], options['start'],
+                          options['days'], user_ids, status_ids, label_ids)
+        counters.reconcile()
+        read_model.rebuild(self.batch_size)
+        versions.bump()
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {options["tasks"]} tasks, {options["users"]} users, '
+            f'{options["statuses"]} statuses and {options["labels"]} labels'))
+
+    def bulk_insert(self, model, objects):
+        with transaction.atomic():
+            model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def create_users(self, prefix, count, password):
+        """
+        Создание пользователей с общим заранее вычисленным хешем пароля.
+        """
+        password_hash = make_password(password)
+        self.bulk_insert(User, [
+            User(username=f'{prefix}_user_{i}',
+                 first_name=self.rng.choice(FIRST_NAMES),
+                 last_name=self.rng.choice(LAST_NAMES),
+                 password=password_hash)
+            for i in range(count)
+        ])
+        return list(User.objects.filter(username__startswith=f'{prefix}_user_')
+                    .order_by('id').values_list('id', flat=True))
+
+    def create_named(self, model, name_prefix, count):
+        self.bulk_insert(model, [model(name=f'{name_prefix} {i}')
+                                 for i in range(count)])
+        return list(model.objects.filter(name__startswith=f'{name_prefix} ')
+                    .order_by('id').values_list('id', flat=True))
+
+    def create_tasks(self, prefix, count, start, days, user_ids, status_ids,
+                     label_ids):
+        """
+        Пакетное создание задач и связей с метками.
+
+        Даты создания равномерно распределены по days дням от start и, как и
+        остальные данные, не зависят от момента загрузки.
+
+        Каждый пакет задач и строк промежуточной таблицы вставляется одной
+        транзакцией без вызова save() для отдельных объектов, поэтому счетчики
+        задач и строки списка задач пересчитываются после загрузки.
+        """
+        self.user_ids, self.user_weights = user_ids, zipf_weights(len(user_ids))
+        self.status_ids, self.status_weights = (status_ids,
+                                                zipf_weights(len(status_ids)))
+        self.label_ids, self.label_weights = label_ids, zipf_weights(len(label_ids))
+        step = timedelta(days=days) / max(count, 1)
+
+        for offset in range(0, count, self.batch_size):
+            tasks, task_labels = [], []
+            for i in range(offset, min(offset + self.batch_size, count)):
+                tasks.append(self.build_task(f'{prefix} task {i}', start + step * i))
+                task_labels.append(self.pick_labels())
+            self.insert_tasks(tasks, task_labels)
+            if self.verbosity > 1:
+                self.stdout.write(f'{offset + len(tasks)} / {count} tasks')
+
+    def pick(self, ids, weights):
+        return self.rng.choices(ids, cum_weights=weights)[0]
+
+    def build_task(self, name, created_at):
+        executor_id = None
+        if self.rng.random() >= NO_EXECUTOR_SHARE:
+            executor_id = self.pick(self.user_ids, self.user_weights)
+        return Task(name=name,
+                    description=f'Synthetic {name}',
+                    created_at=created_at,
+                    status_id=self.pick(self.status_ids, self.status_weights),
+                    author_id=self.pick(self.user_ids, self.user_weights),
+                    executor_id=executor_id)
+
+    def insert_tasks(self, tasks, task_labels):
+        Through = Task.labels.through
+        with transaction.atomic(), explicit_created_at():
+            Task.objects.bulk_create(tasks, batch_size=self.batch_size)
+            if tasks and tasks[0].pk is None:
+                ids = dict(Task.objects.filter(name__in=[task.name for task in tasks])
+                           .values_list('name', 'id'))
+                for task in tasks:
+                    task.pk = ids[task.name]
+            Through.objects.bulk_create(
+                [Through(task_id=task.pk, label_id=label_id)
+                 for task, labels in zip(tasks, task_labels)
+                 for label_id in labels],
+                batch_size=self.batch_size)
+
+    def pick_labels(self):
+        if not self.label_ids:
+            return set()
+        size = self.rng.choices(range(len(LABELS_PER_TASK_WEIGHTS)),
+                                weights=LABELS_PER_TASK_WEIGHTS)[0]
+        return {self.pick(self.label_ids, self.label_weights) for _ in range(size)}
@@ -0,0 +1,287 @@
+import json
+import os
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from task_manager.benchmarks import SQLITE_WRITERS, SQLITE_WRITES
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters
+from task_manager.tasks.models import Task, TaskListRow
+from task_manager.users.models import User
+
+
+class SeedLoadCommandTest(TestCase):
+    def seed(self, prefix, seed=1):
+        call_command('seed_load', tasks=30, users=5, labels=4, statuses=3,
+                     seed=seed, batch_size=7, prefix=prefix, stdout=StringIO())
+        return [
+            (task.status.name.split()[-1], task.author.username.split('_')[-1],
+             sorted(label.name.split()[-1] for label in task.labels.all()),
+             task.created_at)
+            for task in Task.objects.filter(name__startswith=f'{prefix} task ')
+            .select_related('status', 'author').prefetch_related('labels')
+            .order_by('id')
+        ]
+
+    def test_seed_load(self):
+        """
+        Проверка генерации тестового набора данных.
+
+        Должны быть созданы задачи, пользователи, статусы и метки в заданном
+        количестве, у всех пользователей - один хеш пароля, даты создания задач
+        распределены по периоду.
+        """
+        self.seed('first')
+        self.assertEqual(Task.objects.count(), 30)
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Status.objects.count(), 3)
+        self.assertEqual(Label.objects.count(), 4)
+        self.assertEqual(User.objects.values('password').distinct().count(), 1)
+        self.assertTrue(User.objects.first().check_password('password'))
+        self.assertGreater(Task.labels.through.objects.count(), 0)
+        dates = list(Task.objects.order_by('id').values_list('created_at', flat=True))
+        self.assertEqual(dates, sorted(dates))
+        self.assertGreater(dates[-1] - dates[0], dates[1] - dates[0])
+        self.assertEqual(dates[0], datetime(2024, 1, 1, tzinfo=dt_timezone.utc))
+        call_command('seed_load', '--start=2025-06-01T12:00:00+03:00', tasks=2,
+                     users=1, labels=0, statuses=1, prefix='later',
+                     stdout=StringIO())
+        self.assertEqual(Task.objects.get(name='later task 0').created_at,
+                         datetime(2025, 6, 1, 9, tzinfo=dt_timezone.utc))
+
+    def test_seed_load_deterministic(self):
+        """
+        Проверка детерминированности генерации.
+
+        Одинаковый seed дает одинаковый набор данных, другой seed - другой.
+        """
+        first = self.seed('first')
+        self.assertEqual(first, self.seed('second'))
+        self.assertNotEqual(first, self.seed('third', seed=2))
+
+    def test_seed_load_counters(self):
+        """
+        Проверка пересчета счетчиков задач после пакетной загрузки.
+        """
+        self.seed('first')
+        self.assertFalse(any(counters.reconcile(fix=False).values()))
+
+    def test_seed_load_existing_prefix(self):
+        """
+        Проверка повторной генерации с тем же префиксом.
+        """
+        self.seed('first')
+        with self.assertRaises(CommandError):
+            self.seed('first')
+
+
+class ReconcileCountersCommandTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='author', password='x')
+        self.status = Status.objects.create(name='Status')
+        self.label = Label.objects.create(name='Label')
+        task = Task.objects.create(name='Task', status=self.status,
+                                   author=self.user)
+        task.labels.add(self.label)
+
+    def reconcile(self, *args):
+        output = StringIO()
+        call_command('reconcile_counters', *args, stdout=output)
+        return output.getvalue()
+
+    def test_reconcile_counters(self):
+        """
+        Проверка сверки и исправления расхождений счетчиков.
+
+        С --dry-run расхождения только выводятся, без него - исправляются.
+        """
+        self.assertIn('All counters are consistent', self.reconcile())
+        Status.objects.update(task_count=5)
+        User.objects.update(authored_count=0, assigned_count=3)
+        Label.objects.update(task_count=0)
+
+        output = self.reconcile('--dry-run')
+        self.assertIn('statuses.Status.task_count', output)
+        self.assertIn('1 rows drifted', output)
+        self.assertEqual(Status.objects.get().task_count, 5)
+
+        self.assertIn('Counters reconciled', self.reconcile())
+        self.assertEqual(Status.objects.get().task_count, 1)
+        self.assertEqual(Label.objects.get().task_count, 1)
+        self.assertEqual(
+            list(User.objects.values_list('authored_count', 'assigned_count')),
+            [(1, 0)])
+        self.assertIn('All counters are consistent', self.reconcile())
+
+
+class ExplainFiltersCommandTest(TestCase):
+    def setUp(self):
+        call_command('seed_load', tasks=60, users=5, labels=4, statuses=3,
+                     stdout=StringIO())
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.snapshot_dir.cleanup)
+
+    def explain(self, *args):
+        output = StringIO()
+        call_command('explain_filters', *args,
+                     snapshot_dir=self.snapshot_dir.name, stdout=output)
+        return output.getvalue()
+
+    def test_explain_filters(self):
+        """
+        Проверка EXPLAIN для всех сочетаний фильтров и снимков планов.
+
+        Для каждого из 32 сочетаний сохраняется план, фильтр по статусу
+        использует составной индекс строк списка задач. Проверка по снимку
+        проходит, пока планы не изменились, и падает после их изменения.
+        """
+        output = self.explain('--update')
+        self.assertIn('status+executor+labels+self_tasks+search', output)
+        path = os.path.join(self.snapshot_dir.name, f'{connection.vendor}.json')
+        with open(path) as snapshot:
+            plans = json.load(snapshot)
+        self.assertEqual(len(plans), 32)
+        self.assertTrue(any('tasks_row_status_idx' in line
+                            for line in plans['status']['plan']))
+        self.assertEqual(plans['status']['flags'], [])
+
+        self.assertIn('Plans match the snapshot', self.explain('--check'))
+        plans['status']['plan'] = ['SCAN tasks_task']
+        with open(path, 'w') as snapshot:
+            json.dump(plans, snapshot)
+        with self.assertRaisesMessage(CommandError, 'status'):
+            self.explain('--check')
+
+    def test_explain_filters_without_tasks(self):
+        """
+        Проверка запуска на пустой базе данных.
+        """
+        Task.objects.all().delete()
+        with self.assertRaises(CommandError):
+            self.explain()
+
+
+class RebuildTaskListCommandTest(TestCase):
+    def test_rebuild_task_list(self):
+        """
+        Проверка перестроения строк списка задач после расхождения с задачами.
+        """
+        call_command('seed_load', tasks=20, users=3, labels=3, statuses=2,
+                     stdout=StringIO())
+        # время изменения строк при перестроении обновляется
+        rows = TaskListRow.objects.order_by('pk').values(*(
+            field.attname for field in TaskListRow._meta.concrete_fields
+            if field.name != 'updated_at'))
+        expected = list(rows)
+        TaskListRow.objects.filter(pk__in=Task.objects.values('pk')[:5]).delete()
+        TaskListRow.objects.update(status_name='stale', label_names='')
+        TaskListRow.objects.bulk_create([TaskListRow(
+            task_id=10 ** 6, name='Deleted', created_at=timezone.now(),
+            status_id=1, status_name='', author_id=1, author_name='')])
+
+        output = StringIO()
+        call_command('rebuild_task_list', batch_size=7, stdout=output)
+        self.assertIn('Rebuilt 20 task list rows, removed 1 stale rows',
+                      output.getvalue())
+        self.assertEqual(list(rows.all()), expected)
+
+
+class ImportTasksCommandTest(TestCase):
+    def test_import_tasks(self):
+        """
+        Проверка импорта задач из файла: ошибочные строки выводятся с номером
+        строки, остальные задачи создаются.
+        """
+        author = User.objects.create_user(username='author', password='12345')
+        Status.objects.create(name='New')
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as source:
+            source.write('name,description,status,author\n'
+                         'First,Text,New,\n'
+                         'Second,Text,Unknown,\n'
+                         'Third,Text,New,missing\n')
+            source.flush()
+            output, errors = StringIO(), StringIO()
+            call_command('import_tasks', source.name, author='author',
+                         batch_size=1, stdout=output, stderr=errors)
+        self.assertIn('Imported 1 tasks, skipped 2 invalid records',
+                      output.getvalue())
+        self.assertIn('Line 3:', errors.getvalue())
+        self.assertIn('Line 4:', errors.getvalue())
+        self.assertEqual(Task.objects.get().author, author)
+        self.assertEqual(TaskListRow.objects.get().name, 'First')
+
+    def test_import_tasks_encoding_error(self):
+        """
+        Проверка файла не в UTF-8: команда сообщает номер строки и количество
+        задач, созданных до нее.
+        """
+        User.objects.create_user(username='author', password='12345')
+        Status.objects.create(name='New')
+        with tempfile.NamedTemporaryFile('wb', suffix='.csv') as source:
+            source.write('name,description,status\n'
+                         'First,Text,New\n'
+                         'Вторая,Текст,New\n'.encode('cp1251'))
+            source.flush()
+            with self.assertRaisesMessage(
+                    CommandError, 'Line 3 is not in UTF-8 encoding, imported 1 '
+                                  'tasks before it'):
+                call_command('import_tasks', source.name, author='author',
+                             batch_size=1, stdout=StringIO())
+        self.assertEqual(list(TaskListRow.objects.values_list('name', flat=True)),
+                         ['First'])
+
+    def test_import_tasks_errors(self):
+        """
+        Проверка неизвестного автора и отсутствующего файла.
+        """
+        with self.assertRaisesMessage(CommandError, 'User "nobody" does not exist'):
+            call_command('import_tasks', 'tasks.csv', author='nobody')
+        with self.assertRaises(CommandError):
+            call_command('import_tasks', '/nonexistent/tasks.jsonl')
+
+
+class BenchCommandTest(TestCase):
+    def test_bench(self):
+        """
+        Проверка запуска микробенчмарков.
+
+        Для каждого бенчмарка должны быть посчитаны процентили, результаты
+        записаны в JSON-файл, данные базы не должны измениться.
+        """
+        call_command('seed_load', tasks=10, users=3, labels=3, statuses=2,
+                     stdout=StringIO())
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command('bench', iterations=3, warmup=1, output=output.name,
+                         stdout=StringIO())
+            report = json.load(output)
+        self.assertEqual(report['environment']['tasks'], 10)
+        self.assertEqual(Task.objects.count(), 10)
+        self.assertEqual(Status.objects.count(), 2)
+        self.assertEqual(Label.objects.count(), 3)
+        self.assertEqual(User.objects.count(), 3)
+        for name, summary in report['results'].items():
+            with self.subTest(name=name):
+                self.assertEqual(summary['iterations'], 3)
+                self.assertLessEqual(summary['p50_ms'], summary['p99_ms'])
+        for profile in ('default', 'tuned'):
+            summary = report['results'][f'sqlite_writes_{profile}']
+            self.assertEqual(summary['committed'] + summary['failed'],
+                             3 * SQLITE_WRITERS * SQLITE_WRITES)
+            self.assertGreater(summary['committed_per_second'], 0)
+        self.assertEqual(report['results']['sqlite_writes_tuned']['failed'], 0)
+
+    def test_bench_errors(self):
+        """
+        Проверка ошибок запуска: неизвестный бенчмарк и пустая база данных.
+        """
+        with self.assertRaises(CommandError):
+            call_command('bench', 'unknown', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('bench', 'navbar', stdout=StringIO())
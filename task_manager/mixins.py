@@ -1,16 +1,28 @@
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.mixins import UserPassesTestMixin, LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models import ProtectedError
+from django.db import connection, transaction
+from django.db.models import ProtectedError, Q
+from django.http import Http404, JsonResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
-from django.utils.translation import gettext_lazy as _
-from django.views.generic import (ListView,
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language, gettext_lazy as _
+from django.views.generic import (View,
+                                  ListView,
                                   CreateView,
                                   UpdateView,
                                   DeleteView,
                                   DetailView)
 
+from task_manager.pagination import KeysetPaginator, InvalidCursor
+
 LOGIN_URL = reverse_lazy('login')
 
 
@@ -52,6 +64,81 @@ class CustomLoginRequiredMixin(LoginRequiredMixin):
         return redirect(self.login_url)
 
 
+async def is_authenticated(request):
+    """
+    Проверка авторизации из асинхронного кода.
+
+    Пользователь загружается из сессии синхронным запросом в отдельном
+    потоке; после этого request.user доступен и синхронному коду (шаблонам).
+    """
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+class AsyncLoginRequiredMixin(CustomLoginRequiredMixin):
+    """
+    CustomLoginRequiredMixin для представлений с асинхронными обработчиками.
+
+    Неавторизованный пользователь так же перенаправляется на страницу входа.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        if not await is_authenticated(request):
+            return self.handle_no_permission()
+        return await super(LoginRequiredMixin, self).dispatch(  # noqa
+            request, *args, **kwargs)
+
+
+class AsyncListMixin:
+    """
+    Асинхронный вывод списка: объекты читаются через QuerySet.aiterator().
+
+    Страница рендерится теми же шаблоном и контекстом, что и у синхронного
+    представления.
+    """
+
+    def get_async_queryset(self):
+        return self.get_queryset()
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = [obj async for obj in
+                            self.get_async_queryset().aiterator()]
+        return self.render_to_response(self.get_context_data())
+
+
+class AsyncDetailMixin:
+    """
+    Асинхронный вывод объекта: объект читается через QuerySet.aget().
+    """
+
+    async def aget_object(self):
+        queryset = self.get_queryset()
+        try:
+            return await queryset.aget(pk=self.kwargs[self.pk_url_kwarg])
+        except queryset.model.DoesNotExist:
+            raise Http404(f'No {queryset.model._meta.verbose_name} found')
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return self.render_to_response(
+            self.get_context_data(object=self.object))
+
+
+class WriteTransactionMixin:
+    """
+    POST-запрос изменяющего представления в одной транзакции.
+
+    Включается параметром IMMEDIATE_WRITES настроек базы: с профилем SQLite
+    транзакция начинается с BEGIN IMMEDIATE, поэтому проверка формы и запись
+    выполняются под одной блокировкой на запись.
+    """
+
+    def post(self, request, *args, **kwargs):
+        if not connection.settings_dict.get('IMMEDIATE_WRITES'):
+            return super().post(request, *args, **kwargs)  # noqa
+        with transaction.atomic():
+            return super().post(request, *args, **kwargs)  # noqa
+
+
 class ProtectedErrorHandlerMixin:
     protected_error_message = None
     redirect_url = None
@@ -67,18 +154,167 @@ class ProtectedErrorHandlerMixin:
             return redirect(self.redirect_url)
 
 
+class KeysetPaginationMixin:
+    """
+    Постраничный вывод списка по курсору вместо номера страницы.
+
+    Включается заданием paginate_by. Курсоры передаются в GET-параметрах
+    after/before, остальные параметры запроса (например, фильтры) сохраняются
+    в ссылках навигации.
+    """
+    keyset_ordering = ('created_at', 'id')
+    cursor_after_kwarg = 'after'
+    cursor_before_kwarg = 'before'
+
+    def get_keyset_ordering(self):
+        return self.keyset_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Выборка страницы по курсору.
+
+        Поврежденный курсор не приводит к ошибке - выводится первая страница.
+        """
+        paginator = KeysetPaginator(queryset, page_size, self.get_keyset_ordering())
+        try:
+            page = paginator.get_page(
+                after=self.request.GET.get(self.cursor_after_kwarg),
+                before=self.request.GET.get(self.cursor_before_kwarg))
+        except InvalidCursor:
+            page = paginator.get_page()
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """
+        Асинхронная выборка страницы по курсору.
+        """
+        paginator = KeysetPaginator(queryset, page_size, self.get_keyset_ordering())
+        try:
+            page = await paginator.aget_page(
+                after=self.request.GET.get(self.cursor_after_kwarg),
+                before=self.request.GET.get(self.cursor_before_kwarg))
+        except InvalidCursor:
+            page = await paginator.aget_page()
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_query_without_cursor(self):
+        query = self.request.GET.copy()
+        query.pop(self.cursor_after_kwarg, None)
+        query.pop(self.cursor_before_kwarg, None)
+        return query
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)  # noqa
+        query = self.get_query_without_cursor()
+        context['pagination_query'] = f'{query.urlencode()}&' if query else ''
+        return context
+
+
+class ConditionalGetMixin:
+    """
+    Условный GET (ETag и Last-Modified) для страниц, зависящих от данных.
+
+    get_conditional_state() дешевым запросом возвращает отпечаток данных
+    страницы и время их последнего изменения (или None, если условный ответ
+    невозможен). ETag дополнительно учитывает адрес с параметрами,
+    пользователя, язык и CSRF-токен формы, поэтому при неизменных данных
+    ответ 304 отдается без выборки и рендеринга страницы. Пока есть
+    непоказанные flash-сообщения, страница всегда формируется заново.
+    """
+
+    def get_conditional_state(self):
+        return None
+
+    def get_etag(self, fingerprint):
+        request = self.request  # noqa
+        get_token(request)
+        raw = json.dumps([fingerprint, request.get_full_path(), request.user.pk,
+                          get_language(), request.META['CSRF_COOKIE']],
+                         default=str)
+        return quote_etag(hashlib.sha1(raw.encode()).hexdigest())
+
+    def get_request_conditional_state(self):
+        if len(messages.get_messages(self.request)):
+            return None
+        return self.get_conditional_state()
+
+    def get_validators(self, state):
+        fingerprint, last_modified = state
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return self.get_etag(fingerprint), timestamp
+
+    def set_validators(self, response, etag, timestamp):
+        if response.status_code in (200, 304):
+            response.headers.setdefault('ETag', etag)
+            if timestamp is not None:
+                response.headers.setdefault('Last-Modified', http_date(timestamp))
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        state = self.get_request_conditional_state()
+        if state is None:
+            return super().get(request, *args, **kwargs)  # noqa
+        etag, timestamp = self.get_validators(state)
+        response = (get_conditional_response(request, etag=etag,
+                                             last_modified=timestamp)
+                    or super().get(request, *args, **kwargs))  # noqa
+        return self.set_validators(response, etag, timestamp)
+
+    async def conditional_aget(self, handler, request, *args, **kwargs):
+        """
+        Условный GET для асинхронного обработчика handler: отпечаток данных
+        вычисляется синхронным кодом в отдельном потоке.
+        """
+        state = await sync_to_async(self.get_request_conditional_state)()
+        if state is None:
+            return await handler(request, *args, **kwargs)
+        etag, timestamp = await sync_to_async(self.get_validators)(state)
+        response = (get_conditional_response(request, etag=etag,
+                                             last_modified=timestamp)
+                    or await handler(request, *args, **kwargs))
+        return self.set_validators(response, etag, timestamp)
+
+
+class QuerySetOptimizationMixin:
+    """
+    Оптимизация запроса объектов представления.
+
+    Связанные объекты, которые выводятся в шаблоне, загружаются заранее
+    (select_related/prefetch_related), а неиспользуемые тяжелые поля
+    откладываются (defer). Количество запросов не зависит от числа объектов.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    deferred_fields = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()  # noqa
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        if self.deferred_fields:
+            queryset = queryset.defer(*self.deferred_fields)
+        return queryset
+
+
 class CustomIndexView(CustomLoginRequiredMixin,
+                      QuerySetOptimizationMixin,
                       ListView):
     pass
 
 
 class CustomCreateView(CustomLoginRequiredMixin,
+                       WriteTransactionMixin,
                        SuccessMessageMixin,
                        CreateView):
     pass
 
 
 class CustomUpdateView(CustomLoginRequiredMixin,
+                       WriteTransactionMixin,
+                       QuerySetOptimizationMixin,
                        SuccessMessageMixin,
                        UpdateView):
     def get_redirect_url(self):
@@ -87,12 +323,54 @@ class CustomUpdateView(CustomLoginRequiredMixin,
 
 class CustomDeleteView(ProtectedErrorHandlerMixin,
                        CustomLoginRequiredMixin,
+                       WriteTransactionMixin,
+                       QuerySetOptimizationMixin,
                        SuccessMessageMixin,
                        DeleteView):
     pass
 
 
 class CustomDetailView(CustomLoginRequiredMixin,
+                       QuerySetOptimizationMixin,
                        SuccessMessageMixin,
                        DetailView):
     pass
+
+
+class CustomAutocompleteView(CustomLoginRequiredMixin, View):
+    """
+    JSON-список вариантов для выпадающих списков с автодополнением.
+
+    Поиск выполняется по началу строки в полях search_fields, результаты
+    выдаются страницами в формате select2: {"results": [...],
+    "pagination": {"more": ...}}.
+    """
+    model = None
+    search_fields = ('name',)
+    ordering = ('name', 'id')
+    paginate_by = 20
+
+    def get_queryset(self):
+        return self.model.objects.order_by(*self.ordering)
+
+    def get_page_number(self):
+        try:
+            return max(int(self.request.GET.get('page', 1)), 1)
+        except ValueError:
+            return 1
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        term = request.GET.get('term', '').strip()
+        if term:
+            condition = Q()
+            for field in self.search_fields:
+                condition |= Q(**{f'{field}__istartswith': term})
+            queryset = queryset.filter(condition)
+        offset = (self.get_page_number() - 1) * self.paginate_by
+        objects = list(queryset[offset:offset + self.paginate_by + 1])
+        return JsonResponse({
+            'results': [{'id': obj.pk, 'text': str(obj)}
+                        for obj in objects[:self.paginate_by]],
+            'pagination': {'more': len(objects) > self.paginate_by},
+        })
@@ -0,0 +1,198 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Q
+
+
+VALUE_TYPES = (
+    (models.DateTimeField, (datetime,)),
+    (models.IntegerField, (int,)),
+    ((models.FloatField, models.DecimalField), (int, float)),
+)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    """
+    Кодирование значений ключа сортировки в курсор.
+
+    Значения сериализуются в JSON (даты - в формате ISO) и кодируются в
+    url-safe base64 без завершающих символов '='.
+    """
+    payload = [{'dt': value.isoformat()} if isinstance(value, datetime) else value
+               for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Декодирование курсора в список значений ключа сортировки.
+
+    Возбуждает InvalidCursor, если курсор поврежден или подделан.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list):
+            raise InvalidCursor(cursor)
+        return [datetime.fromisoformat(value['dt']) if isinstance(value, dict)
+                else value for value in payload]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        raise InvalidCursor(cursor)
+
+
+def value_types(model, name):
+    """
+    Допустимые типы значения курсора для поля сортировки модели.
+
+    Поля, которых нет в модели (аннотации, например ранг поиска), считаются
+    числовыми.
+    """
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return (int, float)
+    if field.is_relation:
+        field = field.target_field
+    return next((types for field_class, types in VALUE_TYPES
+                 if isinstance(field, field_class)), (str,))
+
+
+def reverse_ordering(ordering):
+    return tuple(field[1:] if field.startswith('-') else f'-{field}'
+                 for field in ordering)
+
+
+def keyset_filter(ordering, values):
+    """
+    Построение условия "строго после" для ключа сортировки.
+
+    Для ключа (a, b) и значений (x, y) возвращает Q, эквивалентное
+    a > x OR (a = x AND b > y) с учетом направления сортировки каждого поля.
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def row_values(row, ordering):
+    """
+    Значения ключа сортировки для объекта модели или словаря из values().
+    """
+    names = [field.lstrip('-') for field in ordering]
+    if isinstance(row, dict):
+        return [row[name] for name in names]
+    return [getattr(row, name) for name in names]
+
+
+class KeysetPage:
+    def __init__(self, object_list, ordering, has_next, has_previous):
+        self.object_list = object_list
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+        self.next_cursor = None
+        self.previous_cursor = None
+        if object_list and has_next:
+            self.next_cursor = encode_cursor(row_values(object_list[-1], ordering))
+        if object_list and has_previous:
+            self.previous_cursor = encode_cursor(row_values(object_list[0],
+                                                            ordering))
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+
+class KeysetPaginator:
+    """
+    Постраничная навигация по курсору (keyset pagination).
+
+    В отличие от OFFSET, каждая страница выбирается по условию на индексированный
+    ключ сортировки, поэтому стоимость запроса не зависит от глубины страницы.
+    Последнее поле ключа должно быть уникальным (обычно первичный ключ).
+    """
+
+    def __init__(self, queryset, per_page, ordering=('created_at', 'id')):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+
+    def get_page(self, after=None, before=None):
+        """
+        Выборка страницы после курсора after или перед курсором before.
+
+        Без курсоров возвращается первая страница.
+        Возбуждает InvalidCursor, если курсор не удалось декодировать.
+        """
+        queryset, backwards, values = self.page_query(after, before)
+        return self.make_page(list(queryset), backwards, values)
+
+    async def aget_page(self, after=None, before=None):
+        """
+        Асинхронная версия get_page: строки читаются через асинхронный ORM.
+        """
+        queryset, backwards, values = self.page_query(after, before)
+        return self.make_page([row async for row in queryset], backwards, values)
+
+    def page_query(self, after=None, before=None):
+        """
+        Запрос страницы (на одну строку больше размера страницы, чтобы узнать
+        о наличии следующей), направление выборки и значения курсора.
+        """
+        backwards = before is not None
+        values = self.check_values(decode_cursor(before if backwards else after)) \
+            if backwards or after is not None else None
+        ordering = reverse_ordering(self.ordering) if backwards else self.ordering
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(ordering, values))
+        return queryset[:self.per_page + 1], backwards, values
+
+    def check_values(self, values):
+        """
+        Проверка числа и типов значений курсора по ключу сортировки.
+
+        Возбуждает InvalidCursor, если курсор не подходит к ключу: иначе
+        значения неверного типа дошли бы до запроса к базе данных.
+        """
+        model = self.queryset.model
+        if len(values) != len(self.ordering):
+            raise InvalidCursor(values)
+        for field, value in zip(self.ordering, values):
+            if isinstance(value, bool) or not isinstance(
+                    value, value_types(model, field.lstrip('-'))):
+                raise InvalidCursor(values)
+        return values
+
+    def make_page(self, rows, backwards, values):
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            return KeysetPage(rows[::-1], self.ordering, has_next=True,
+                              has_previous=more)
+        return KeysetPage(rows, self.ordering, has_next=more,
+                          has_previous=values is not None)
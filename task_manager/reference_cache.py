@@ -0,0 +1,181 @@
+import threading
+import uuid
+from time import monotonic
+from typing import NamedTuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+DEFAULT_TTL = 30
+
+
+class Snapshot(NamedTuple):
+    objects: list
+    by_pk: dict
+    version: str
+    loaded_at: float
+
+
+class ReferenceCache:
+    """
+    Кеш небольшой справочной таблицы в памяти процесса.
+
+    Таблица целиком загружается одним запросом и хранится до изменения. При
+    записи в таблицу (сигналы post_save/post_delete/m2m_changed) локальная копия
+    сбрасывается, а общая версия в django cache меняется - процессы с общим
+    бэкендом кеша замечают ее при следующем обращении. Независимо от этого
+    копия живет не дольше REFERENCE_CACHE_TTL секунд, поэтому запись из другого
+    процесса становится видна за ограниченное время даже с локальным кешем.
+    Для каждой базы, из которой читает роутер (основной и репликам), хранится
+    своя копия.
+
+    Счетчики (counter_fields) меняются при каждой записи задач и копию не
+    сбрасывают, поэтому в кешированных объектах они не актуальны и читаются
+    из базы.
+    """
+
+    def __init__(self, model_label, ordering=('id',)):
+        self.model_label = model_label
+        self.ordering = ordering
+        self.version_key = f'reference_cache:{model_label}:version'
+        self.lock = threading.Lock()
+        self.snapshots = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'REFERENCE_CACHE_TTL', DEFAULT_TTL)
+
+    def is_fresh(self, snapshot):
+        return (snapshot is not None
+                and monotonic() - snapshot.loaded_at < self.ttl
+                and cache.get(self.version_key) == snapshot.version)
+
+    def load(self, alias):
+        """
+        Загрузка копии таблицы.
+
+        Версия читается до и после запроса: если таблица изменилась во время
+        чтения, строки возвращаются, но копия не сохраняется.
+        """
+        with self.lock:
+            snapshot = self.snapshots.get(alias)
+            if self.is_fresh(snapshot):
+                return snapshot
+            self.misses += 1
+            version = cache.get(self.version_key)
+            objects = list(self.model.objects.using(alias).order_by(*self.ordering))
+            snapshot = Snapshot(objects, {obj.pk: obj for obj in objects}, version,
+                                monotonic())
+            if cache.get(self.version_key) == version:
+                self.snapshots[alias] = snapshot
+            return snapshot
+
+    def snapshot(self):
+        """
+        Копия таблицы из базы, выбранной роутером для чтения.
+
+        Копии хранятся отдельно для каждой базы: строки, прочитанные с реплики,
+        не выдаются запросам, читающим из основной базы, и наоборот.
+        """
+        alias = router.db_for_read(self.model)
+        snapshot = self.snapshots.get(alias)
+        if self.is_fresh(snapshot):
+            self.hits += 1
+            return snapshot
+        return self.load(alias)
+
+    def all(self):
+        """
+        Все строки таблицы в порядке ordering.
+        """
+        return self.snapshot().objects
+
+    def get_many(self, pks):
+        """
+        Объекты по первичным ключам; отсутствующие в кеше ключи пропускаются.
+        """
+        by_pk = self.snapshot().by_pk
+        objects = []
+        for pk in pks:
+            try:
+                obj = by_pk.get(int(pk))
+            except (TypeError, ValueError):
+                obj = None
+            if obj is not None:
+                objects.append(obj)
+        return objects
+
+    def get(self, pk):
+        objects = self.get_many([pk])
+        return objects[0] if objects else None
+
+    def clear(self):
+        self.snapshots = {}
+
+    def invalidate(self, **kwargs):
+        """
+        Сброс кеша после изменения таблицы.
+
+        Сброс и смена версии выполняются сразу и повторно после фиксации
+        транзакции, чтобы копия, загруженная внутри транзакции или другим
+        процессом до ее фиксации, не пережила ее.
+        """
+        self.invalidations += 1
+        self.bump()
+        transaction.on_commit(self.bump)
+
+    def bump(self):
+        self.clear()
+        cache.set(self.version_key, uuid.uuid4().hex, None)
+
+    def connect(self, *m2m_senders):
+        post_save.connect(self.invalidate, sender=self.model,
+                          dispatch_uid=f'{self.version_key}:save')
+        post_delete.connect(self.invalidate, sender=self.model,
+                            dispatch_uid=f'{self.version_key}:delete')
+        for sender in m2m_senders:
+            m2m_changed.connect(self.invalidate, sender=sender,
+                                dispatch_uid=f'{self.version_key}:{sender}')
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'copies': {alias: {
+                'size': len(snapshot.by_pk),
+                'age_seconds': round(monotonic() - snapshot.loaded_at, 3),
+            } for alias, snapshot in self.snapshots.items()},
+        }
+
+
+statuses = ReferenceCache('statuses.Status')
+labels = ReferenceCache('labels.Label')
+
+REGISTRY = {cached.model_label: cached for cached in (statuses, labels)}
+
+
+def for_model(model):
+    """
+    Кеш справочника для модели или None, если модель не кешируется.
+    """
+    return REGISTRY.get(model._meta.label)
+
+
+def stats():
+    return {label: cached.stats() for label, cached in REGISTRY.items()}
+
+
+def clear_all():
+    for cached in REGISTRY.values():
+        cached.clear()
@@ -50,6 +50,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'task_manager.db.routers.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -59,9 +60,15 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'task_manager.urls'
 
+# In production mode templates are loaded through the cached loader and all
+# project templates are compiled when a worker starts (see wsgi.py/asgi.py)
+TEMPLATE_MODE = os.getenv('TEMPLATE_MODE', 'development' if DEBUG else 'production')
+TEMPLATE_PREWARM = TEMPLATE_MODE == 'production'
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'task_manager.template_backend.TimedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -76,6 +83,15 @@ TEMPLATES = [
     },
 ]
 
+if TEMPLATE_MODE == 'production':
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 WSGI_APPLICATION = 'task_manager.wsgi.application'
 
 # Database
@@ -90,11 +106,83 @@ DATABASES = {
         },
     },
 }
+# SQLITE_PROFILE=production tunes every SQLite connection for concurrent
+# workers (WAL, synchronous=NORMAL, busy_timeout, mmap/cache sizes) and, unless
+# SQLITE_IMMEDIATE_WRITES=False, runs write views in BEGIN IMMEDIATE
+# transactions
+if os.getenv('SQLITE_PROFILE') == 'production':
+    from task_manager.db.sqlite3.base import PRODUCTION_PRAGMAS
+
+    DATABASES['default'].update({
+        'ENGINE': 'task_manager.db.sqlite3',
+        'PRAGMAS': PRODUCTION_PRAGMAS,
+        'IMMEDIATE_WRITES': os.getenv('SQLITE_IMMEDIATE_WRITES', 'True') == 'True',
+    })
+# With DATABASE_POOL=True PostgreSQL connections come from a bounded
+# per-process pool (task_manager.db.postgresql) instead of persistent
+# per-thread connections
+DATABASE_POOL = os.getenv('DATABASE_POOL', 'False') == 'True'
+DATABASE_POOL_OPTIONS = {
+    'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', '2')),
+    'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', '10')),
+    'timeout': float(os.getenv('DATABASE_POOL_TIMEOUT', '10')),
+    'check_interval': float(os.getenv('DATABASE_POOL_CHECK_INTERVAL', '30')),
+    'max_lifetime': float(os.getenv('DATABASE_POOL_MAX_LIFETIME', '3600')),
+    'max_idle': float(os.getenv('DATABASE_POOL_MAX_IDLE', '600')),
+}
+
+
+def parse_database_url(url):
+    database = dj_database_url.parse(url, conn_max_age=0 if DATABASE_POOL else 600)
+    if DATABASE_POOL and database['ENGINE'].endswith('postgresql'):
+        database.update(ENGINE='task_manager.db.postgresql',
+                        POOL=DATABASE_POOL_OPTIONS)
+    return database
+
+
 if os.getenv('DATABASE_URL'):
-    DATABASES = {
-        'default': dj_database_url.parse(os.getenv('DATABASE_URL'),
-                                         conn_max_age=600),
-    }
+    DATABASES = {'default': parse_database_url(os.getenv('DATABASE_URL'))}
+
+# Read replicas (comma-separated DATABASE_REPLICA_URLS) serve the list and
+# detail pages in REPLICA_READ_VIEWS; after a write the session reads from the
+# primary for REPLICA_STICKY_SECONDS so users always see their own changes
+DATABASE_REPLICAS = []
+for number, url in enumerate(filter(None, os.getenv('DATABASE_REPLICA_URLS',
+                                                    '').split(',')), 1):
+    DATABASES[f'replica{number}'] = {**parse_database_url(url.strip()),
+                                     'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica{number}')
+DATABASE_ROUTERS = ['task_manager.db.routers.ReplicaRouter']
+REPLICA_READ_VIEWS = ['tasks_index', 'tasks_detail', 'users_index',
+                      'statuses_index', 'labels_index']
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '10'))
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND',
+                             'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    },
+}
+
+# Maximum age (in seconds) of the process-local Status/Label cache, i.e. how
+# soon a worker sees writes made by other workers without a shared cache backend
+REFERENCE_CACHE_TTL = int(os.getenv('REFERENCE_CACHE_TTL', '30'))
+
+# Lifetime (in seconds) of cached facet counts on the tasks index, i.e. how long
+# the counts may lag behind task writes
+TASK_FACETS_TTL = int(os.getenv('TASK_FACETS_TTL', '10'))
+
+# Lifetime (in seconds) of rendered task list rows; a changed task or a renamed
+# status, label or user gets a new cache key, so this only bounds memory use
+TASK_ROW_CACHE_TTL = int(os.getenv('TASK_ROW_CACHE_TTL', '3600'))
+
+# Serve the tasks, statuses, labels and users index (and the task detail) pages
+# with their async views; the sync views stay the default under WSGI
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -165,35 +253,80 @@ if not DEBUG:
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Logging handlers run on a background thread (task_manager.log): request
+# threads only put records on a queue. LOG_LEVELS overrides levels per logger
+# ("django.db.backends=DEBUG,task_manager=INFO"); DEBUG records are sampled
+# (LOG_DEBUG_SAMPLE_RATE) and rate-limited per logger (LOG_DEBUG_RATE_LIMIT
+# records per second). LOG_ROTATE=internal rotates the log file by size and
+# time inside the process and suits a single process (runserver); several
+# processes (gunicorn workers) would rotate the shared file independently, so by
+# default without DEBUG (LOG_ROTATE=external) they append to one file and
+# rotation is left to logrotate: WatchedFileHandler reopens the moved file
+LOGGING_CONFIG = 'task_manager.log.configure'
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG' if DEBUG else 'INFO')
+LOG_LEVELS = dict(item.strip().split('=', 1)
+                  for item in os.getenv('LOG_LEVELS', '').split(',') if '=' in item)
+LOG_ROTATE = os.getenv('LOG_ROTATE', 'internal' if DEBUG else 'external')
+LOG_FILE_HANDLERS = {
+    'internal': {
+        'level': 'DEBUG',
+        'class': 'task_manager.log.RotatingFileHandler',
+        'formatter': os.getenv('LOG_FORMAT', 'json'),
+        'filename': os.getenv('LOG_FILE', 'debug.log'),
+        'when': os.getenv('LOG_ROTATE_WHEN', 'midnight'),
+        'max_bytes': int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+        'backup_count': int(os.getenv('LOG_BACKUP_COUNT', '7')),
+    },
+    'external': {
+        'level': 'DEBUG',
+        'class': 'logging.handlers.WatchedFileHandler',
+        'formatter': os.getenv('LOG_FORMAT', 'json'),
+        'filename': os.getenv('LOG_FILE', 'debug.log'),
+        'encoding': 'utf-8',
+        'delay': True,
+    },
+}
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'filters': {
+        'sample_debug': {
+            '()': 'task_manager.log.DebugSamplingFilter',
+            'rate': float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1')),
+            'limit': int(os.getenv('LOG_DEBUG_RATE_LIMIT', '100')),
+        },
+    },
     'formatters': {
         'console': {
             'format': '%(name)-12s %(levelname)-8s %(message)s'
         },
         'file': {
             'format': '%(asctime)s %(name)-12s %(levelname)-8s %(message)s'
-        }
+        },
+        'json': {
+            '()': 'task_manager.log.JsonFormatter',
+        },
     },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
             'formatter': 'console'
         },
-        'file': {
-            'level': 'DEBUG',
-            'class': 'logging.FileHandler',
-            'formatter': 'file',
-            'filename': 'debug.log'
-        }
+        'file': LOG_FILE_HANDLERS[LOG_ROTATE],
+    },
+    'root': {
+        'level': LOG_LEVEL,
+        'handlers': [],
     },
     'loggers': {
-        '': {
-            'level': 'DEBUG',
-            'handlers': ['console', 'file']
-        }
-    }
+        name.strip(): {'level': level.strip().upper()}
+        for name, level in LOG_LEVELS.items()
+    },
+    'queue': {
+        'handlers': ['console', 'file'],
+        'filters': ['sample_debug'],
+    },
 }
 
 if not DEBUG:
@@ -0,0 +1,18 @@
+document.addEventListener('DOMContentLoaded', function () {
+  $('select[data-autocomplete-url]').each(function () {
+    const $select = $(this);
+    $select.select2({
+      width: '100%',
+      allowClear: !this.multiple,
+      placeholder: '',
+      ajax: {
+        url: $select.data('autocomplete-url'),
+        dataType: 'json',
+        delay: 250,
+        data: function (params) {
+          return {term: params.term || '', page: params.page || 1};
+        },
+      },
+    });
+  });
+});
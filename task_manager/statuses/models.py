@@ -2,10 +2,15 @@ from django.db import models
 from django.db.models import ProtectedError
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.tasks.counters import CounterFieldsMixin
 
-class Status(models.Model):
+
+class Status(CounterFieldsMixin, models.Model):
     name = models.CharField(max_length=50, verbose_name=_('Name'), unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    task_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ('task_count',)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -17,9 +22,10 @@ class Status(models.Model):
         """
         Проверка на использование статуса в задачах
 
+        Проверка выполняется по счетчику задач без запроса к базе данных.
         Возбуждает ProtectedError если статус используется хотя бы одной задачей
         """
-        if self.task_set.exists():
+        if self.task_count:
             raise ProtectedError("Cannot delete status because it is in use",
                                  self.task_set.all())
 
@@ -1,9 +1,18 @@
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from django.test import TestCase, Client
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import ProtectedError
+from django.test import TestCase, Client, RequestFactory
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from task_manager.statuses.models import Status
+from task_manager.statuses.views import (AsyncIndexView, IndexView,
+                                         StatusAutocompleteView)
+from task_manager.tasks.models import Task
+from task_manager.testing import without_csrf
 
 User = get_user_model()
 
@@ -79,6 +88,33 @@ class StatusesIndexViewTest(BaseTestCase):
         self.assertTemplateUsed(response, 'statuses/index.html')
 
 
+class StatusesAsyncIndexViewTest(BaseTestCase):
+    def test_async_index(self):
+        """
+        Проверка асинхронного списка статусов.
+
+        Страница должна совпадать с синхронной и читаться из базы, а не из
+        кеша справочника, неавторизованный пользователь перенаправляется на
+        страницу входа.
+        """
+        Status.objects.create(name='Async status')
+        request = RequestFactory().get(reverse('statuses_index'))
+        request.user = self.user
+        expected = IndexView.as_view()(request).render()
+        response = async_to_sync(AsyncIndexView.as_view())(request).render()
+        self.assertContains(response, 'Async status')
+        self.assertEqual(without_csrf(response.content),
+                         without_csrf(expected.content))
+        Status.objects.update(name='Changed without signals')
+        response = async_to_sync(AsyncIndexView.as_view())(request).render()
+        self.assertContains(response, 'Changed without signals')
+
+        request.user = AnonymousUser()
+        response = async_to_sync(AsyncIndexView.as_view())(request)
+        self.assertRedirects(response, reverse('login'),
+                             fetch_redirect_response=False)
+
+
 class StatusesCreateViewTest(BaseTestCase):
     def test_status_create_view_get(self):
         """
@@ -287,3 +323,66 @@ class StatusesDeleteViewTest(BaseTestCase):
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse('statuses_index'))
         self.assertEqual(Status.objects.count(), 0)
+
+    def test_status_delete_view_post_in_use(self):
+        """
+        Проверка POST-запроса на удаление статуса, используемого задачей.
+
+        Статус не удаляется, страница перенаправляется на список статусов. Проверка
+        использования выполняется по счетчику без запросов к базе данных.
+        """
+        Task.objects.create(name='Test task', status=self.status, author=self.user)
+        response = self.client.post(
+            reverse('statuses_delete', kwargs={'pk': self.status.pk}))
+        self.assertRedirects(response, reverse('statuses_index'))
+        self.assertEqual(Status.objects.count(), 1)
+
+        status = Status.objects.get(pk=self.status.pk)
+        self.assertEqual(status.task_count, 1)
+        with self.assertNumQueries(0), self.assertRaises(ProtectedError):
+            status.delete()
+
+
+class StatusAutocompleteViewTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        for name in ('Alpha', 'Beta', 'alpine'):
+            Status.objects.create(name=name)
+
+    def test_autocomplete_search(self):
+        """
+        Проверка поиска статусов по началу названия.
+
+        Поиск не зависит от регистра, в ответе - первичные ключи и названия.
+        """
+        response = self.client.get(reverse('statuses_autocomplete'), {'term': 'al'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([item['text'] for item in data['results']],
+                         ['Alpha', 'alpine'])
+        self.assertEqual(data['results'][0]['id'],
+                         Status.objects.get(name='Alpha').id)
+        self.assertFalse(data['pagination']['more'])
+
+    def test_autocomplete_pages(self):
+        """
+        Проверка постраничной выдачи статусов.
+        """
+        with patch.object(StatusAutocompleteView, 'paginate_by', 2):
+            first = self.client.get(reverse('statuses_autocomplete')).json()
+            second = self.client.get(reverse('statuses_autocomplete'),
+                                     {'page': 2}).json()
+            broken = self.client.get(reverse('statuses_autocomplete'),
+                                     {'page': 'x'}).json()
+        self.assertTrue(first['pagination']['more'])
+        self.assertFalse(second['pagination']['more'])
+        self.assertEqual(len(first['results']) + len(second['results']), 3)
+        self.assertEqual(broken, first)
+
+    def test_autocomplete_unauthorized(self):
+        """
+        Проверка доступа к списку статусов без авторизации.
+        """
+        self.client.logout()
+        response = self.client.get(reverse('statuses_autocomplete'))
+        self.assertRedirects(response, reverse('login'))
@@ -1,10 +1,15 @@
+from django.conf import settings
 from django.urls import path
 
 from task_manager.statuses import views
 
+IndexView = views.AsyncIndexView if settings.ASYNC_VIEWS else views.IndexView
+
 urlpatterns = [
-    path('', views.IndexView.as_view(), name='statuses_index'),
+    path('', IndexView.as_view(), name='statuses_index'),
     path('create/', views.StatusCreateView.as_view(), name='statuses_create'),
     path('<int:pk>/update/', views.StatusUpdateView.as_view(), name='statuses_update'),
     path('<int:pk>/delete/', views.StatusDeleteView.as_view(), name='statuses_delete'),
+    path('autocomplete/', views.StatusAutocompleteView.as_view(),
+         name='statuses_autocomplete'),
 ]
@@ -1,7 +1,11 @@
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
-from task_manager.mixins import (CustomIndexView,
+from task_manager import reference_cache
+from task_manager.mixins import (AsyncListMixin,
+                                 AsyncLoginRequiredMixin,
+                                 CustomAutocompleteView,
+                                 CustomIndexView,
                                  CustomCreateView,
                                  CustomUpdateView,
                                  CustomDeleteView)
@@ -14,6 +18,20 @@ class IndexView(CustomIndexView):
     model = Status
     context_object_name = 'statuses'
 
+    def get_queryset(self):
+        """
+        Список читается из базы одним запросом: счетчик задач task_count в
+        копиях кеша справочника не обновляется.
+        """
+        return Status.objects.order_by(*reference_cache.statuses.ordering)
+
+
+class AsyncIndexView(AsyncListMixin, AsyncLoginRequiredMixin, IndexView):
+    """
+    Асинхронная версия списка: тот же запрос, что и в синхронной версии,
+    статусы читаются через aiterator() без перехода в поток.
+    """
+
 
 class StatusCreateView(CustomCreateView):
     template_name = 'statuses/create.html'
@@ -38,3 +56,7 @@ class StatusDeleteView(CustomDeleteView):
     success_message = _('Status successfully deleted')
     protected_error_message = _('Cannot delete status because it is in use')
     redirect_url = reverse_lazy('statuses_index')
+
+
+class StatusAutocompleteView(CustomAutocompleteView):
+    model = Status
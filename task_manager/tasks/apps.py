@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.tasks'
+
+    def ready(self):
+        from task_manager.tasks import counters, read_model, versions
+        counters.connect()
+        read_model.connect()
+        versions.connect()
@@ -0,0 +1,103 @@
+from django.db import transaction
+from django.utils import timezone
+
+from task_manager.tasks import counters, read_model, versions
+from task_manager.tasks.models import Task, TaskListRow
+
+COUNTED_FIELDS = ('status_id', 'author_id', 'executor_id')
+
+
+def status_row_values(status):
+    return {'status_id': status.pk, 'status_name': status.name}
+
+
+def executor_row_values(executor):
+    if executor is None:
+        return {'executor_id': None, 'executor_name': ''}
+    return {'executor_id': executor.pk,
+            'executor_name': read_model.full_name(executor.first_name,
+                                                  executor.last_name)}
+
+
+ROW_VALUES = {
+    'status': status_row_values,
+    'executor': executor_row_values,
+}
+
+
+def set_field(task_ids, field, value):
+    """
+    Изменение статуса или исполнителя задач одним UPDATE.
+
+    Задачи, у которых поле уже имеет нужное значение, не затрагиваются.
+    Строки списка задач обновляются таким же UPDATE, счетчики - пакетом.
+    Возвращает количество измененных задач.
+    """
+    index = COUNTED_FIELDS.index(f'{field}_id')
+    tasks = Task.objects.filter(pk__in=task_ids).exclude(**{field: value})
+    with transaction.atomic():
+        rows = list(tasks.select_for_update().values_list('pk', *COUNTED_FIELDS))
+        if not rows:
+            return 0
+        changed, now = [pk for pk, *old in rows], timezone.now()
+        Task.objects.filter(pk__in=changed).update(**{field: value}, updated_at=now)
+        TaskListRow.objects.filter(task_id__in=changed).update(
+            **ROW_VALUES[field](value), updated_at=now)
+        changes = []
+        for pk, *old in rows:
+            new = list(old)
+            new[index] = getattr(value, 'pk', None)
+            changes.append((tuple(old), tuple(new)))
+        counters.apply_task_changes(changes)
+    versions.bump()
+    return len(changed)
+
+
+def set_status(task_ids, status):
+    return set_field(task_ids, 'status', status)
+
+
+def set_executor(task_ids, executor):
+    return set_field(task_ids, 'executor', executor)
+
+
+def add_label(task_ids, label):
+    """
+    Добавление метки задачам одним INSERT в промежуточную таблицу.
+    """
+    Through = Task.labels.through
+    with transaction.atomic():
+        added = list(Task.objects.filter(pk__in=task_ids).exclude(labels=label)
+                     .values_list('pk', flat=True))
+        if not added:
+            return 0
+        Through.objects.bulk_create([Through(task_id=pk, label_id=label.pk)
+                                     for pk in added])
+        counters.apply_label_change([label.pk] * len(added), 1)
+        read_model.refresh(added)
+    versions.bump()
+    return len(added)
+
+
+def remove_label(task_ids, label):
+    """
+    Удаление метки у задач одним DELETE из промежуточной таблицы.
+    """
+    links = Task.labels.through.objects.filter(task_id__in=task_ids, label=label)
+    with transaction.atomic():
+        removed = list(links.values_list('task_id', flat=True))
+        if not removed:
+            return 0
+        links.filter(task_id__in=removed).delete()
+        counters.apply_label_change([label.pk] * len(removed), -1)
+        read_model.refresh(removed)
+    versions.bump()
+    return len(removed)
+
+
+ACTIONS = {
+    'set_status': set_status,
+    'set_executor': set_executor,
+    'add_label': add_label,
+    'remove_label': remove_label,
+}
@@ -0,0 +1,155 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed
+
+
+class CounterFieldsMixin:
+    """
+    Исключение счетчиков из UPDATE при сохранении модели.
+
+    Счетчики меняются только атомарными UPDATE ... SET x = x + n, поэтому
+    сохранение объекта, загруженного до изменения счетчика, не должно
+    перезаписывать его устаревшим значением.
+    """
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+def counted_values(task):
+    return task.status_id, task.author_id, task.executor_id
+
+
+def _apply(model, field, deltas):
+    """
+    Изменение счетчиков на заданные величины по одному UPDATE на величину.
+    """
+    by_delta = {}
+    for pk, delta in deltas.items():
+        if pk is not None and delta:
+            by_delta.setdefault(delta, []).append(pk)
+    for delta, pks in by_delta.items():
+        model.objects.filter(pk__in=pks).update(**{field: F(field) + delta})
+    return bool(by_delta)
+
+
+def apply_task_change(old, new):
+    """
+    Обновление счетчиков статусов и пользователей при изменении задачи.
+
+    old и new - кортежи (status_id, author_id, executor_id) до и после
+    изменения; None вместо кортежа означает создание или удаление задачи.
+    """
+    apply_task_changes([(old, new)])
+
+
+def apply_task_changes(changes):
+    """
+    Обновление счетчиков для набора изменений задач пакетом UPDATE.
+
+    Изменения суммируются, поэтому число запросов зависит от количества
+    различных приращений, а не от количества задач.
+    """
+    from task_manager.statuses.models import Status
+    from task_manager.users.models import User
+
+    statuses, authored, assigned = Counter(), Counter(), Counter()
+    for old, new in changes:
+        for values, sign in ((old, -1), (new, 1)):
+            if values is None:
+                continue
+            status_id, author_id, executor_id = values
+            statuses[status_id] += sign
+            authored[author_id] += sign
+            assigned[executor_id] += sign
+    _apply(Status, 'task_count', statuses)
+    _apply(User, 'authored_count', authored)
+    _apply(User, 'assigned_count', assigned)
+
+
+def apply_label_change(label_ids, sign):
+    """
+    Обновление счетчиков меток при добавлении или удалении связей с задачами.
+    """
+    from task_manager.labels.models import Label
+
+    deltas = Counter()
+    for label_id in label_ids:
+        deltas[label_id] += sign
+    _apply(Label, 'task_count', deltas)
+
+
+def labels_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Обработчик m2m_changed для Task.labels.
+
+    Перед удалением и очисткой запоминаются реально существующие связи, чтобы
+    не уменьшать счетчики для несвязанных меток.
+    """
+    if action in ('pre_remove', 'pre_clear'):
+        links = sender.objects.filter(**{'label' if reverse else 'task': instance})
+        if pk_set is not None:
+            links = links.filter(**{'task_id__in' if reverse else 'label_id__in':
+                                    pk_set})
+        instance._removed_label_links = list(links.values_list('label_id',
+                                                               flat=True))
+    elif action == 'post_add':
+        label_ids = [instance.pk] * len(pk_set) if reverse else pk_set
+        apply_label_change(label_ids, 1)
+    elif action in ('post_remove', 'post_clear'):
+        apply_label_change(instance.__dict__.pop('_removed_label_links', []), -1)
+
+
+def connect():
+    from task_manager.tasks.models import Task
+
+    m2m_changed.connect(labels_changed, sender=Task.labels.through,
+                        dispatch_uid='tasks_label_counters')
+
+
+def _count_subquery(queryset, field):
+    counts = (queryset.filter(**{field: OuterRef('pk')}).order_by()
+              .values(field).annotate(total=Count('pk')).values('total'))
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def counter_definitions():
+    from task_manager.labels.models import Label
+    from task_manager.statuses.models import Status
+    from task_manager.tasks.models import Task
+    from task_manager.users.models import User
+
+    Through = Task.labels.through
+    return [
+        (Status, 'task_count', _count_subquery(Task.objects.all(), 'status')),
+        (Label, 'task_count', _count_subquery(Through.objects.all(), 'label')),
+        (User, 'authored_count', _count_subquery(Task.objects.all(), 'author')),
+        (User, 'assigned_count', _count_subquery(Task.objects.all(), 'executor')),
+    ]
+
+
+def reconcile(fix=True):
+    """
+    Сверка счетчиков с фактическими данными.
+
+    Возвращает количество расходящихся строк для каждого счетчика. При fix=True
+    расхождения исправляются одним UPDATE на счетчик.
+    """
+    drift = {}
+    with transaction.atomic():
+        for model, field, expected in counter_definitions():
+            queryset = model.objects.annotate(expected=expected).exclude(
+                **{field: F('expected')})
+            drift[f'{model._meta.label}.{field}'] = queryset.count()
+            if fix and drift[f'{model._meta.label}.{field}']:
+                model.objects.update(**{field: expected})
+    return drift
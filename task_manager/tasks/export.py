@@ -0,0 +1,97 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+
+FIELDS = ('id', 'name', 'description', 'status', 'author', 'executor', 'labels',
+          'created_at')
+ROW_VALUES = ('task_id', 'name', 'task__description', 'status_name', 'author_name',
+              'executor_name', 'label_names', 'created_at')
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """
+    Псевдобуфер для csv.writer: записанная строка сразу возвращается.
+    """
+
+    def write(self, value):
+        return value
+
+
+def export_values(row):
+    values = dict(zip(FIELDS, row))
+    values['created_at'] = values['created_at'].isoformat()
+    return values
+
+
+def export_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Строки выгрузки из строк списка задач (TaskListRow).
+
+    Строки читаются через iterator() порциями по chunk_size (на PostgreSQL -
+    серверным курсором), поэтому память не зависит от размера выгрузки.
+    Названия меток уже собраны в строке списка, отдельная загрузка меток для
+    каждой порции не нужна.
+    """
+    rows = (queryset.order_by('created_at', 'task_id').values_list(*ROW_VALUES)
+            .iterator(chunk_size=chunk_size))
+    for row in rows:
+        yield export_values(row)
+
+
+async def aexport_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Асинхронная версия export_rows для ASGI.
+
+    StreamingHttpResponse с синхронным итератором под ASGI сначала собирает
+    весь ответ в список, поэтому порции export_rows по chunk_size строк
+    читаются в потоке через sync_to_async. QuerySet.aiterator() в Django 4.2
+    выполняет запрос в асинхронном контексте и здесь не подходит.
+    """
+    rows = export_rows(queryset, chunk_size)
+    next_chunk = sync_to_async(lambda: list(islice(rows, chunk_size)))
+    try:
+        while True:
+            chunk = await next_chunk()
+            for row in chunk:
+                yield row
+            if len(chunk) < chunk_size:
+                break
+    finally:
+        await sync_to_async(rows.close)()
+
+
+def csv_header():
+    return csv.writer(Echo()).writerow(FIELDS)
+
+
+def csv_line(row):
+    return csv.writer(Echo()).writerow([row[field] for field in FIELDS])
+
+
+def jsonl_line(row):
+    return json.dumps(row, ensure_ascii=False) + '\n'
+
+
+FORMATS = {
+    'csv': (csv_header, csv_line, 'text/csv; charset=utf-8'),
+    'jsonl': (None, jsonl_line, 'application/x-ndjson; charset=utf-8'),
+}
+
+
+def stream(rows, export_format):
+    header, line, content_type = FORMATS[export_format]
+    if header is not None:
+        yield header()
+    for row in rows:
+        yield line(row)
+
+
+async def astream(rows, export_format):
+    header, line, content_type = FORMATS[export_format]
+    if header is not None:
+        yield header()
+    async for row in rows:
+        yield line(row)
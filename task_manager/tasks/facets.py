@@ -0,0 +1,145 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from task_manager import reference_cache
+from task_manager.tasks.models import Task, TaskListRow
+from task_manager.tasks.search import parse_terms
+
+DEFAULT_TTL = 10
+FACETS = ('status', 'executor', 'labels')
+FACET_SIZE = 10
+
+
+def normalize_value(value):
+    """
+    Значение фильтра в виде, пригодном для ключа кеша.
+
+    >>> normalize_value(True), normalize_value(None), normalize_value(' A  b ')
+    (True, None, 'a b')
+    """
+    if isinstance(value, str):
+        return ' '.join(parse_terms(value)) or None
+    if isinstance(value, bool) or value is None:
+        return value
+    return getattr(value, 'pk', value)
+
+
+def get_filters(filterset):
+    """
+    Значения фильтров формы; без параметров запроса фильтры не заданы.
+    """
+    return filterset.form.cleaned_data if filterset.is_bound else {}
+
+
+def filter_key(filterset):
+    """
+    Нормализованный ключ фильтра.
+
+    Пустые значения отбрасываются, поэтому "?status=" и запрос без параметров
+    дают один ключ. Фильтр "только мои задачи" зависит от пользователя.
+    """
+    values = {name: normalize_value(value)
+              for name, value in get_filters(filterset).items()}
+    values = {name: value for name, value in values.items()
+              if value not in (None, False)}
+    if values.get('self_tasks'):
+        values['self_tasks'] = filterset.request.user.pk
+    raw = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def filtered_queryset(filterset, exclude):
+    """
+    Строки списка задач, отобранные всеми фильтрами формы, кроме exclude.
+
+    Счетчики варианта фасета не зависят от выбранного значения этого же
+    фасета, поэтому видно, сколько задач даст переключение на другой вариант.
+    """
+    queryset = TaskListRow.objects.all()
+    for name, value in get_filters(filterset).items():
+        if name != exclude:
+            queryset = filterset.filters[name].filter(queryset, value)
+    return queryset.order_by()
+
+
+def count_statuses(filterset):
+    rows = (filtered_queryset(filterset, 'status').values('status')
+            .annotate(count=Count('pk')).order_by('-count', 'status'))
+    return [(row['status'], row['count']) for row in rows[:FACET_SIZE]]
+
+
+def count_executors(filterset):
+    rows = (filtered_queryset(filterset, 'executor').filter(executor__isnull=False)
+            .values('executor', 'executor_name')
+            .annotate(count=Count('pk')).order_by('-count', 'executor'))
+    return [(row['executor'], row['count'], row['executor_name'])
+            for row in rows[:FACET_SIZE]]
+
+
+def count_labels(filterset):
+    tasks = filtered_queryset(filterset, 'labels').values('pk')
+    rows = (Task.labels.through.objects.filter(task__in=tasks).values('label')
+            .annotate(count=Count('task')).order_by('-count', 'label'))
+    return [(row['label'], row['count']) for row in rows[:FACET_SIZE]]
+
+
+def compute_counts(filterset):
+    """
+    Количество задач по вариантам фасетов - по одному GROUP BY на фасет.
+    """
+    return {
+        'status': count_statuses(filterset),
+        'executor': count_executors(filterset),
+        'labels': count_labels(filterset),
+    }
+
+
+def get_counts(filterset):
+    """
+    Закешированные счетчики фасетов для фильтра.
+
+    Задачи меняются постоянно, поэтому счетчики не сбрасываются при записи, а
+    живут TASK_FACETS_TTL секунд: под нагрузкой записи ключ, зависящий от
+    версии данных, почти всегда был бы холодным. Счетчики могут отставать от
+    данных не дольше этого времени.
+    """
+    key = f'task_facets:{filter_key(filterset)}'
+    counts = cache.get(key)
+    if counts is None:
+        counts = compute_counts(filterset)
+        cache.set(key, counts, getattr(settings, 'TASK_FACETS_TTL', DEFAULT_TTL))
+    return counts
+
+
+def get_facets(filterset, query):
+    """
+    Фасеты для шаблона: подпись, количество и ссылка с выбранным вариантом.
+
+    query - параметры текущего запроса без курсоров постраничной навигации.
+    Названия статусов и меток берутся из кеша справочников.
+    """
+    counts = get_counts(filterset)
+    names = {
+        'status': {obj.pk: obj.name for obj in reference_cache.statuses.all()},
+        'labels': {obj.pk: obj.name for obj in reference_cache.labels.all()},
+    }
+    selected = {name: str(filterset.data.get(name, '')) for name in FACETS}
+    facets = []
+    for name in FACETS:
+        options = []
+        for pk, count, *label in counts[name]:
+            params = query.copy()
+            params[name] = pk
+            options.append({
+                'label': label[0] if label else names[name].get(pk, pk),
+                'count': count,
+                'selected': selected[name] == str(pk),
+                'query': params.urlencode(),
+            })
+        facets.append({'name': name, 'label': filterset.filters[name].label,
+                       'options': options})
+    return facets
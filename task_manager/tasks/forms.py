@@ -1,10 +1,19 @@
+import codecs
+
 import django_filters
 from django import forms
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.fields import (CachedModelChoiceField,
+                                 CachedModelMultipleChoiceField,
+                                 CachedModelChoiceFilter)
 from task_manager.labels.models import Label
-from task_manager.tasks.models import Task
+from task_manager.statuses.models import Status
+from task_manager.tasks.importer import FORMATS
+from task_manager.tasks.models import Task, TaskListRow
+from task_manager.tasks.search import search_tasks
+from task_manager.widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 User = get_user_model()
 
@@ -20,16 +29,122 @@ class TaskForm(forms.ModelForm):
             'labels',
         )
         required_fields = ('name', 'description', 'status')
+        field_classes = {
+            'status': CachedModelChoiceField,
+            'labels': CachedModelMultipleChoiceField,
+        }
+        widgets = {
+            'status': AutocompleteSelect('statuses_autocomplete'),
+            'executor': AutocompleteSelect('users_autocomplete'),
+            'labels': AutocompleteSelectMultiple('labels_autocomplete'),
+        }
+
+
+class TaskImportForm(forms.Form):
+    file = forms.FileField(label=_('File'))
+    format = forms.ChoiceField(
+        label=_('Format'), required=False,
+        choices=[('', _('By file extension'))] + [(name, name.upper())
+                                                  for name in FORMATS])
+
+    def clean_file(self):
+        """
+        Проверка кодировки файла до импорта.
+
+        Файл декодируется по частям, чтобы ошибка кодировки не прервала импорт
+        после уже сохраненных пакетов.
+        """
+        upload = self.cleaned_data['file']
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for chunk in upload.chunks():
+                decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            raise forms.ValidationError(_('File must be in UTF-8 encoding'))
+        upload.seek(0)
+        return upload
+
+
+class TaskBulkActionForm(forms.Form):
+    """
+    Массовое действие над выбранными в списке задачами.
+
+    Поле значения зависит от действия: исполнителя можно сбросить, для
+    остальных действий значение обязательно.
+    """
+    prefix = 'bulk'
+    ACTION_FIELDS = {
+        'set_status': 'status',
+        'set_executor': 'executor',
+        'add_label': 'label',
+        'remove_label': 'label',
+    }
+
+    tasks = forms.ModelMultipleChoiceField(queryset=Task.objects.only('id'),
+                                           widget=forms.MultipleHiddenInput)
+    action = forms.ChoiceField(label=_('Action'), choices=(
+        ('set_status', _('Change status')),
+        ('set_executor', _('Change executor')),
+        ('add_label', _('Add label')),
+        ('remove_label', _('Remove label')),
+    ))
+    status = CachedModelChoiceField(
+        label=_('Status'), required=False, queryset=Status.objects.all(),
+        widget=AutocompleteSelect('statuses_autocomplete'))
+    executor = forms.ModelChoiceField(
+        label=_('Executor'), required=False, queryset=User.objects.all(),
+        widget=AutocompleteSelect('users_autocomplete'))
+    label = CachedModelChoiceField(
+        label=_('Label'), required=False, queryset=Label.objects.all(),
+        widget=AutocompleteSelect('labels_autocomplete'))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        field = self.ACTION_FIELDS.get(cleaned_data.get('action'))
+        if field and field != 'executor' and not cleaned_data.get(field):
+            self.add_error(field, forms.Field.default_error_messages['required'])
+        return cleaned_data
+
+    def get_value(self):
+        return self.cleaned_data[self.ACTION_FIELDS[self.cleaned_data['action']]]
 
 
 class TaskFilterForm(django_filters.FilterSet):
-    labels = django_filters.ModelChoiceFilter(label=_('Label'),
-                                              queryset=Label.objects.all())
+    search = django_filters.CharFilter(label=_('Search'),
+                                       method='filter_by_search')
+    status = CachedModelChoiceFilter(
+        label=_('Status'),
+        queryset=Status.objects.all(),
+        widget=AutocompleteSelect('statuses_autocomplete'))
+    executor = django_filters.ModelChoiceFilter(
+        label=_('Executor'),
+        queryset=User.objects.all(),
+        widget=AutocompleteSelect('users_autocomplete'))
+    labels = CachedModelChoiceFilter(
+        label=_('Label'),
+        method='filter_by_label',
+        queryset=Label.objects.all(),
+        widget=AutocompleteSelect('labels_autocomplete'))
     self_tasks = django_filters.BooleanFilter(label=_('Only your tasks'),
                                               widget=forms.CheckboxInput,
                                               method='filter_by_self_tasks',
                                               required=False)
 
+    def filter_by_search(self, queryset, name, value):
+        """
+        Полнотекстовый поиск по названию и описанию задачи.
+        """
+        return search_tasks(queryset, value)
+
+    def filter_by_label(self, queryset, name, value):
+        """
+        Фильтрация задач по метке через промежуточную таблицу без соединения
+        с таблицей задач.
+        """
+        links = Task.labels.through.objects.filter(label=value)
+        return queryset.filter(pk__in=links.values('task_id'))
+
     def filter_by_self_tasks(self, queryset, author, value):
         """
         Фильтрация задач по текущему пользователю.
@@ -39,5 +154,5 @@ class TaskFilterForm(django_filters.FilterSet):
         return queryset
 
     class Meta:
-        model = Task
+        model = TaskListRow
         fields = ['status', 'executor']
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+DEFAULT_TTL = 3600
+ROW_TEMPLATE = 'tasks/row.html'
+
+
+def row_key(row, language):
+    """
+    Ключ кеша строки: задача, время изменения строки списка задач и язык.
+
+    Время изменения строки меняется и при переименовании статуса, меток или
+    пользователей задачи, поэтому устаревшие фрагменты просто перестают
+    читаться.
+    """
+    return f'task_row:{language}:{row.task_id}:{row.updated_at.timestamp()}'
+
+
+def render_rows(rows, **context):
+    """
+    HTML строк таблицы задач.
+
+    Закешированные строки читаются одним get_many, шаблон рендерится только
+    для новых и измененных задач, которые затем сохраняются одним set_many.
+    context - дополнительные переменные шаблона, одинаковые для всех запросов
+    (в ключ кеша они не входят).
+    """
+    language = get_language()
+    keys = {row_key(row, language): row for row in rows}
+    fragments = cache.get_many(keys)
+    missing = {}
+    if len(fragments) < len(keys):
+        template = get_template(ROW_TEMPLATE)
+        missing = {key: template.render({'task': row, **context})
+                   for key, row in keys.items() if key not in fragments}
+        cache.set_many(missing, getattr(settings, 'TASK_ROW_CACHE_TTL',
+                                        DEFAULT_TTL))
+    fragments.update(missing)
+    return [mark_safe(fragments[key]) for key in keys]
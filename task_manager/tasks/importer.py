@@ -0,0 +1,290 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext as _
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters, read_model, versions
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+FORMATS = ('csv', 'jsonl')
+DEFAULT_BATCH_SIZE = 1000
+NAME_MAX_LENGTH = Task._meta.get_field('name').max_length
+
+
+class RecordError(ValueError):
+    pass
+
+
+class EncodingError(ValueError):
+    def __init__(self, line_number):
+        super().__init__(f'Line {line_number} is not in UTF-8 encoding')
+        self.line_number = line_number
+
+
+def detect_format(filename, default='csv'):
+    """
+    Формат файла по расширению.
+
+    >>> detect_format('tasks.jsonl'), detect_format('tasks.ndjson')
+    ('jsonl', 'jsonl')
+    >>> detect_format('tasks.CSV'), detect_format('tasks')
+    ('csv', 'csv')
+    """
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    return 'csv' if extension == 'csv' else default
+
+
+def decode_lines(lines):
+    """
+    Строки файла, открытого в двоичном режиме, декодированные из UTF-8.
+
+    Файл декодируется по мере чтения, поэтому ошибка кодировки обнаруживается
+    после импорта предыдущих пакетов; EncodingError сообщает номер строки.
+
+    >>> list(decode_lines([b'\\xef\\xbb\\xbfname\\n', b'first\\n']))
+    ['name\\n', 'first\\n']
+    >>> list(decode_lines([b'name\\n', b'\\xff\\n']))
+    Traceback (most recent call last):
+    task_manager.tasks.importer.EncodingError: Line 2 is not in UTF-8 encoding
+    """
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            yield line.decode('utf-8-sig' if line_number == 1 else 'utf-8')
+        except UnicodeDecodeError as error:
+            raise EncodingError(line_number) from error
+
+
+def read_csv(lines):
+    reader = csv.DictReader(lines)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def read_jsonl(lines):
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            record = error
+        yield line_number, record
+
+
+def split_labels(value):
+    """
+    Названия меток из списка строк JSON или строки через запятую.
+
+    >>> split_labels('bug, urgent,,'), split_labels(['bug']), split_labels(None)
+    (['bug', 'urgent'], ['bug'], [])
+
+    Возбуждает RecordError для значений другого типа.
+
+    >>> split_labels(5)  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    RecordError: labels
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list) or not all(isinstance(name, str)
+                                              for name in value):
+        raise RecordError(_('Field "%(field)s" must be a list of names or a '
+                            'comma-separated string') % {'field': 'labels'})
+    return [name.strip() for name in value if name.strip()]
+
+
+def label_names(records):
+    """
+    Названия меток всех записей пакета; ошибочные значения пропускаются и
+    попадают в ошибки при разборе записи.
+    """
+    names = set()
+    for record in records:
+        try:
+            names.update(split_labels(record.get('labels')))
+        except RecordError:
+            continue
+    return names
+
+
+def clean_text(record, field):
+    value = record.get(field)
+    return '' if value is None else str(value).strip()
+
+
+class Batch:
+    """
+    Пакет записей файла со справочниками, загруженными одним запросом на
+    каждую таблицу.
+    """
+
+    def __init__(self, records, default_author=None, author_column=True):
+        self.records = records
+        records = [record for line_number, record in records
+                   if isinstance(record, dict)]
+        fields = ('author', 'executor') if author_column else ('executor',)
+        usernames = {clean_text(record, field) for record in records
+                     for field in fields}
+        self.users = dict(User.objects.filter(username__in=usernames)
+                          .values_list('username', 'pk'))
+        self.statuses = dict(Status.objects.filter(
+            name__in={clean_text(record, 'status') for record in records})
+            .values_list('name', 'pk'))
+        self.labels = dict(Label.objects.filter(name__in=label_names(records))
+                           .values_list('name', 'pk'))
+        self.existing = set(Task.objects.filter(
+            name__in={clean_text(record, 'name') for record in records})
+            .values_list('name', flat=True))
+        self.default_author = default_author
+        self.author_column = author_column
+
+    def lookup(self, mapping, name, message):
+        if name not in mapping:
+            raise RecordError(message % {'name': name})
+        return mapping[name]
+
+    def build_task(self, record):
+        """
+        Задача и ее метки из записи файла.
+
+        Возбуждает RecordError с описанием первой найденной ошибки.
+        """
+        if not isinstance(record, dict):
+            raise RecordError(_('Invalid record: %(error)s') % {'error': record})
+        name, description = clean_text(record, 'name'), clean_text(record,
+                                                                   'description')
+        for field, value in (('name', name), ('description', description)):
+            if not value:
+                raise RecordError(_('Field "%(field)s" is required')
+                                  % {'field': field})
+        if len(name) > NAME_MAX_LENGTH:
+            raise RecordError(_('Name is longer than %(max)s characters')
+                              % {'max': NAME_MAX_LENGTH})
+        if name in self.existing:
+            raise RecordError(_('Task "%(name)s" already exists') % {'name': name})
+        task = Task(name=name, description=description,
+                    status_id=self.lookup(self.statuses, clean_text(record, 'status'),
+                                          _('Status "%(name)s" does not exist')),
+                    author_id=self.get_author(clean_text(record, 'author')),
+                    executor_id=self.get_executor(clean_text(record, 'executor')))
+        label_ids = {self.lookup(self.labels, label,
+                                 _('Label "%(name)s" does not exist'))
+                     for label in split_labels(record.get('labels'))}
+        self.existing.add(name)
+        return task, label_ids
+
+    def get_author(self, username):
+        if not self.author_column:
+            return self.default_author.pk
+        if not username and self.default_author is not None:
+            return self.default_author.pk
+        return self.lookup(self.users, username, _('User "%(name)s" does not exist'))
+
+    def get_executor(self, username):
+        if not username:
+            return None
+        return self.lookup(self.users, username, _('User "%(name)s" does not exist'))
+
+
+def conflict_message(task, error):
+    if Task.objects.filter(name=task.name).exists():
+        return _('Task "%(name)s" already exists') % {'name': task.name}
+    return _('Invalid record: %(error)s') % {'error': error}
+
+
+class TaskImporter:
+    """
+    Пакетный импорт задач из CSV или JSON Lines.
+
+    Файл читается построчно, записи обрабатываются пакетами по batch_size.
+    Для пакета статусы, метки, пользователи и существующие названия задач
+    загружаются одним запросом на таблицу, задачи и их связи с метками
+    вставляются через bulk_create в одной транзакции. Ошибочные записи
+    пропускаются и попадают в errors с номером строки, остальные записи файла
+    импортируются.
+
+    Автор задачи берется из колонки author, для записей без нее - author.
+    При author_column=False колонка author не используется, автор всех
+    задач - author (загрузка файла пользователем).
+    """
+
+    def __init__(self, author=None, batch_size=DEFAULT_BATCH_SIZE,
+                 author_column=True):
+        self.author = author
+        self.batch_size = batch_size
+        self.author_column = author_column
+        self.created = 0
+        self.errors = []
+
+    def run(self, lines, file_format='csv'):
+        if file_format not in FORMATS:
+            raise ValueError(f'Unknown format "{file_format}"')
+        records = read_csv(lines) if file_format == 'csv' else read_jsonl(lines)
+        try:
+            while True:
+                batch = list(islice(records, self.batch_size))
+                if not batch:
+                    break
+                self.import_batch(Batch(batch, self.author, self.author_column))
+        finally:
+            if self.created:
+                versions.bump()
+            self.errors.sort()
+        return self
+
+    def import_batch(self, batch):
+        rows = []
+        for line_number, record in batch.records:
+            try:
+                task, label_ids = batch.build_task(record)
+            except RecordError as error:
+                self.errors.append((line_number, str(error)))
+                continue
+            rows.append((line_number, task, label_ids))
+        if rows:
+            self.insert(rows)
+
+    def insert(self, rows):
+        """
+        Вставка пакета одной транзакцией.
+
+        Если задача с тем же названием создана параллельно после проверки
+        пакета, пакет вставляется заново по одной задаче, и в errors попадают
+        только конфликтующие строки.
+        """
+        try:
+            self.insert_tasks([task for line_number, task, label_ids in rows],
+                              [label_ids for line_number, task, label_ids in rows])
+        except IntegrityError:
+            for line_number, task, label_ids in rows:
+                task.pk = None
+                try:
+                    self.insert_tasks([task], [label_ids])
+                except IntegrityError as error:
+                    self.errors.append((line_number, conflict_message(task, error)))
+
+    def insert_tasks(self, tasks, task_labels):
+        """
+        Вставка задач со связями, счетчиками и строками списка задач.
+        """
+        Through = Task.labels.through
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks, batch_size=self.batch_size)
+            links = [Through(task_id=task.pk, label_id=label_id)
+                     for task, label_ids in zip(tasks, task_labels)
+                     for label_id in label_ids]
+            Through.objects.bulk_create(links, batch_size=self.batch_size)
+            counters.apply_task_changes([(None, counters.counted_values(task))
+                                         for task in tasks])
+            counters.apply_label_change([link.label_id for link in links], 1)
+            read_model.refresh(task.pk for task in tasks)
+        self.created += len(tasks)
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def full_name(user):
+    return f'{user.first_name} {user.last_name}' if user else ''
+
+
+def backfill(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskListRow = apps.get_model('tasks', 'TaskListRow')
+    tasks = (Task.objects.select_related('status', 'author', 'executor')
+             .prefetch_related('labels').order_by('pk'))
+    TaskListRow.objects.bulk_create((
+        TaskListRow(task_id=task.pk, name=task.name, created_at=task.created_at,
+                    status_id=task.status_id, status_name=task.status.name,
+                    author_id=task.author_id, author_name=full_name(task.author),
+                    executor_id=task.executor_id,
+                    executor_name=full_name(task.executor),
+                    label_names=', '.join(sorted(label.name
+                                                 for label in task.labels.all())))
+        for task in tasks.iterator(chunk_size=1000)
+    ), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('statuses', '0002_task_counters'),
+        ('tasks', '0005_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskListRow',
+            fields=[
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='list_row', serialize=False, to='tasks.task')),
+                ('name', models.CharField(max_length=50)),
+                ('created_at', models.DateTimeField()),
+                ('status_name', models.CharField(max_length=50)),
+                ('author_name', models.CharField(max_length=301)),
+                ('executor_name', models.CharField(blank=True, max_length=301)),
+                ('label_names', models.TextField(blank=True)),
+                ('author', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('executor', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('status', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='statuses.status')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at', 'task'], name='tasks_row_created_idx'), models.Index(fields=['status', 'created_at', 'task'], name='tasks_row_status_idx'), models.Index(fields=['status', 'executor', 'created_at', 'task'], name='tasks_row_status_executor_idx'), models.Index(fields=['executor', 'created_at', 'task'], name='tasks_row_executor_idx'), models.Index(fields=['author', 'created_at', 'task'], name='tasks_row_author_idx')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:10
+
+from django.db import migrations, models
+
+from task_manager.tasks import search
+
+
+def backfill(apps, schema_editor):
+    # До миграции задачи не менялись отдельно от создания - известно только
+    # время создания
+    for name in ('Task', 'TaskListRow'):
+        model = apps.get_model('tasks', name)
+        model.objects.update(updated_at=models.F('created_at'))
+    # SQLite пересоздает таблицу при добавлении поля, триггеры FTS теряются
+    search.create_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_list_row'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='tasklistrow',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
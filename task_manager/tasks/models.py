@@ -1,27 +1,139 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.tasks import counters
+
 
 class Task(models.Model):
     name = models.CharField(max_length=50, verbose_name=_('Name'), unique=True)
     description = models.TextField(verbose_name=_('Description'))
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.ForeignKey('statuses.Status',
                                on_delete=models.PROTECT,
-                               verbose_name=_('Status'))
+                               verbose_name=_('Status'),
+                               db_index=False)
     author = models.ForeignKey('users.User',
                                on_delete=models.PROTECT,
                                verbose_name=_('Author'),
-                               related_name='author')
+                               related_name='author',
+                               db_index=False)
     executor = models.ForeignKey('users.User',
                                  on_delete=models.PROTECT,
                                  verbose_name=_('Executor'),
                                  related_name='executor',
                                  null=True,
-                                 blank=True)
+                                 blank=True,
+                                 db_index=False)
     labels = models.ManyToManyField('labels.Label',
                                     verbose_name=_('Labels'),
                                     blank=True)
 
+    class Meta:
+        # Индексы повторяют сочетания фильтров TaskFilterForm с сортировкой
+        # списка по (created_at, id) и заменяют одиночные индексы внешних
+        # ключей, которые покрываются их префиксами.
+        indexes = [
+            models.Index(fields=['created_at', 'id'],
+                         name='tasks_created_at_id_idx'),
+            models.Index(fields=['status', 'created_at', 'id'],
+                         name='tasks_status_created_idx'),
+            models.Index(fields=['status', 'executor', 'created_at', 'id'],
+                         name='tasks_status_executor_idx'),
+            models.Index(fields=['executor', 'created_at', 'id'],
+                         name='tasks_executor_created_idx'),
+            models.Index(fields=['author', 'created_at', 'id'],
+                         name='tasks_author_created_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def get_counted_values(self):
+        """
+        Значения полей, учтенные в счетчиках, до текущего изменения.
+
+        Значения читаются из базы с блокировкой строки, поэтому вызывается
+        внутри транзакции: параллельное сохранение той же задачи ждет ее
+        завершения и видит уже учтенные значения, а не снимок, загруженный
+        вместе с объектом.
+        """
+        if self._state.adding:
+            return None
+        return Task.objects.select_for_update().filter(pk=self.pk).values_list(
+            'status_id', 'author_id', 'executor_id').first()
+
+    def save(self, *args, **kwargs):
+        """
+        Сохранение задачи с обновлением счетчиков в той же транзакции.
+        """
+        with transaction.atomic():
+            old = self.get_counted_values()
+            super().save(*args, **kwargs)
+            new = counters.counted_values(self)
+            if old != new:
+                counters.apply_task_change(old, new)
+
+    def delete(self, *args, **kwargs):
+        """
+        Удаление задачи с обновлением счетчиков статуса, пользователей и меток.
+
+        Связи с метками удаляются каскадно без сигнала m2m_changed, поэтому
+        метки задачи запоминаются до удаления.
+        """
+        with transaction.atomic():
+            old = self.get_counted_values()
+            label_ids = list(self.labels.values_list('id', flat=True))
+            result = super().delete(*args, **kwargs)
+            counters.apply_task_change(old, None)
+            counters.apply_label_change(label_ids, -1)
+        return result
+
+
+class TaskListRow(models.Model):
+    """
+    Строка списка задач (read model).
+
+    Денормализованная копия данных, выводимых в списке задач: названия статуса
+    и меток, имена автора и исполнителя хранятся в самой строке, поэтому
+    список читается из одной таблицы без соединений. Строки обновляются
+    сигналами при записи задач и связанных объектов (tasks.read_model), при
+    расхождении их можно перестроить командой rebuild_task_list.
+    """
+    task = models.OneToOneField(Task, on_delete=models.CASCADE,
+                                primary_key=True, related_name='list_row')
+    name = models.CharField(max_length=50)
+    created_at = models.DateTimeField()
+    status = models.ForeignKey('statuses.Status', on_delete=models.DO_NOTHING,
+                               db_constraint=False, db_index=False,
+                               related_name='+')
+    status_name = models.CharField(max_length=50)
+    author = models.ForeignKey('users.User', on_delete=models.DO_NOTHING,
+                               db_constraint=False, db_index=False,
+                               related_name='+')
+    author_name = models.CharField(max_length=301)
+    executor = models.ForeignKey('users.User', on_delete=models.DO_NOTHING,
+                                 db_constraint=False, db_index=False,
+                                 related_name='+', null=True, blank=True)
+    executor_name = models.CharField(max_length=301, blank=True)
+    label_names = models.TextField(blank=True)
+    # Время последнего изменения строки, в том числе из-за переименования
+    # статуса, метки или пользователя - основа для условных GET
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'task'],
+                         name='tasks_row_created_idx'),
+            models.Index(fields=['status', 'created_at', 'task'],
+                         name='tasks_row_status_idx'),
+            models.Index(fields=['status', 'executor', 'created_at', 'task'],
+                         name='tasks_row_status_executor_idx'),
+            models.Index(fields=['executor', 'created_at', 'task'],
+                         name='tasks_row_executor_idx'),
+            models.Index(fields=['author', 'created_at', 'task'],
+                         name='tasks_row_author_idx'),
+        ]
+
     def __str__(self):
         return self.name
@@ -0,0 +1,157 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models.signals import post_save, m2m_changed
+from django.utils import timezone
+
+ROW_FIELDS = ('name', 'created_at', 'status_id', 'status_name', 'author_id',
+              'author_name', 'executor_id', 'executor_name', 'label_names',
+              'updated_at')
+TASK_VALUES = ('id', 'name', 'created_at', 'status_id', 'status__name',
+               'author_id', 'author__first_name', 'author__last_name',
+               'executor_id', 'executor__first_name', 'executor__last_name')
+DEFAULT_BATCH_SIZE = 1000
+
+
+def full_name(first_name, last_name):
+    """
+    Имя пользователя в том же виде, что и User.get_full_name().
+
+    >>> full_name('Ivan', 'Petrov'), full_name(None, None)
+    ('Ivan Petrov', '')
+    """
+    if first_name is None and last_name is None:
+        return ''
+    return f'{first_name} {last_name}'
+
+
+def label_names(task_ids):
+    from task_manager.tasks.models import Task
+
+    names = defaultdict(list)
+    links = (Task.labels.through.objects.filter(task_id__in=task_ids)
+             .order_by('label__name').values_list('task_id', 'label__name'))
+    for task_id, name in links:
+        names[task_id].append(name)
+    return {task_id: ', '.join(items) for task_id, items in names.items()}
+
+
+def build_rows(task_ids):
+    """
+    Строки списка для задач - двумя запросами независимо от числа задач.
+    """
+    from task_manager.tasks.models import Task, TaskListRow
+
+    labels = label_names(task_ids)
+    return [
+        TaskListRow(
+            task_id=task['id'], name=task['name'], created_at=task['created_at'],
+            status_id=task['status_id'], status_name=task['status__name'],
+            author_id=task['author_id'],
+            author_name=full_name(task['author__first_name'],
+                                  task['author__last_name']),
+            executor_id=task['executor_id'],
+            executor_name=full_name(task['executor__first_name'],
+                                    task['executor__last_name']),
+            label_names=labels.get(task['id'], ''))
+        for task in Task.objects.filter(pk__in=task_ids).values(*TASK_VALUES)
+    ]
+
+
+def refresh(task_ids):
+    """
+    Пересборка строк списка для задач одним INSERT ... ON CONFLICT UPDATE.
+    """
+    from task_manager.tasks.models import TaskListRow
+
+    task_ids = list(task_ids)
+    if not task_ids:
+        return 0
+    rows = build_rows(task_ids)
+    TaskListRow.objects.bulk_create(rows, update_conflicts=True,
+                                    unique_fields=['task'],
+                                    update_fields=ROW_FIELDS)
+    return len(rows)
+
+
+def rebuild(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Полная пересборка read model: лишние строки удаляются, остальные
+    пересобираются пакетами по batch_size задач.
+    """
+    from task_manager.tasks.models import Task, TaskListRow
+
+    with transaction.atomic():
+        removed, _ = TaskListRow.objects.exclude(
+            task__in=Task.objects.values('pk')).delete()
+        task_ids = list(Task.objects.order_by('pk').values_list('pk', flat=True))
+        for offset in range(0, len(task_ids), batch_size):
+            refresh(task_ids[offset:offset + batch_size])
+    return len(task_ids), removed
+
+
+def task_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh([instance.pk])
+
+
+def labels_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Обработчик m2m_changed для Task.labels.
+
+    При очистке связей со стороны метки затронутые задачи запоминаются до
+    удаления связей.
+    """
+    if reverse and action == 'pre_clear':
+        instance._list_row_tasks = list(sender.objects.filter(label=instance)
+                                        .values_list('task_id', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            refresh([instance.pk])
+        elif action == 'post_clear':
+            refresh(instance.__dict__.pop('_list_row_tasks', []))
+        else:
+            refresh(pk_set)
+
+
+def status_saved(sender, instance, created, raw=False, **kwargs):
+    from task_manager.tasks.models import TaskListRow
+
+    if not (created or raw):
+        TaskListRow.objects.filter(status=instance).update(
+            status_name=instance.name, updated_at=timezone.now())
+
+
+def label_saved(sender, instance, created, raw=False, **kwargs):
+    from task_manager.tasks.models import Task
+
+    if not (created or raw):
+        refresh(Task.objects.filter(labels=instance).values_list('pk', flat=True))
+
+
+def user_saved(sender, instance, created, raw=False, update_fields=None,
+               **kwargs):
+    from task_manager.tasks.models import TaskListRow
+
+    if created or raw or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    name, now = instance.get_full_name(), timezone.now()
+    rows = TaskListRow.objects
+    rows.filter(author=instance).update(author_name=name, updated_at=now)
+    rows.filter(executor=instance).update(executor_name=name, updated_at=now)
+
+
+def connect():
+    from task_manager.labels.models import Label
+    from task_manager.statuses.models import Status
+    from task_manager.tasks.models import Task
+    from task_manager.users.models import User
+
+    post_save.connect(task_saved, sender=Task, dispatch_uid='task_list_row:task')
+    m2m_changed.connect(labels_changed, sender=Task.labels.through,
+                        dispatch_uid='task_list_row:labels')
+    post_save.connect(status_saved, sender=Status,
+                      dispatch_uid='task_list_row:status')
+    post_save.connect(label_saved, sender=Label,
+                      dispatch_uid='task_list_row:label')
+    post_save.connect(user_saved, sender=User, dispatch_uid='task_list_row:user')
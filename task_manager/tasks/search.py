@@ -0,0 +1,153 @@
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+RANK = 'search_rank'
+FTS_TABLE = 'tasks_task_fts'
+VECTOR_COLUMN = 'search_vector'
+VECTOR_INDEX = 'tasks_task_search_idx'
+MAX_TERMS = 16
+
+SQLITE_SCHEMA = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description, content='tasks_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2')""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, description
+        ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+SQLITE_DROP = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+POSTGRESQL_SCHEMA = (
+    f"""ALTER TABLE tasks_task ADD COLUMN IF NOT EXISTS {VECTOR_COLUMN} tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+        ) STORED""",
+    f'CREATE INDEX IF NOT EXISTS {VECTOR_INDEX} '
+    f'ON tasks_task USING GIN ({VECTOR_COLUMN})',
+)
+POSTGRESQL_DROP = (
+    f'DROP INDEX IF EXISTS {VECTOR_INDEX}',
+    f'ALTER TABLE tasks_task DROP COLUMN IF EXISTS {VECTOR_COLUMN}',
+)
+
+
+def parse_terms(query):
+    """
+    Слова поискового запроса без операторов и спецсимволов.
+
+    >>> parse_terms('Fix "login" -page, Ошибка*')
+    ['fix', 'login', 'page', 'ошибка']
+    """
+    return re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+
+
+def pk_column(queryset):
+    """
+    Столбец первичного ключа в запросе.
+
+    Первичный ключ задачи и строки списка задач (TaskListRow) совпадает с
+    rowid поискового индекса, поэтому поиск работает для обеих моделей.
+    """
+    meta = queryset.model._meta
+    return f'"{meta.db_table}"."{meta.pk.column}"'
+
+
+def sqlite_search(queryset, terms):
+    """
+    Поиск через FTS5 с соединением поискового индекса в основном запросе.
+
+    Индекс добавляется в FROM один раз, совпадения и релевантность bm25
+    берутся из той же строки индекса, без подзапроса на каждую задачу.
+    Условие соединения задано через pk, чтобы псевдоним таблицы задач
+    переименовывался, когда запрос используется как подзапрос (фасеты).
+    """
+    match = ' '.join(f'"{term}"*' for term in terms)
+    return queryset.extra(
+        tables=[FTS_TABLE], where=[f'{FTS_TABLE} MATCH %s'], params=[match],
+    ).filter(pk=RawSQL(f'{FTS_TABLE}.rowid', ())).annotate(
+        **{RANK: RawSQL(f'-bm25({FTS_TABLE}, 10.0, 1.0)', (),
+                        output_field=FloatField())})
+
+
+def postgresql_search(queryset, terms):
+    tsquery = ' & '.join(f"'{term}':*" for term in terms)
+    rank = RawSQL(f"SELECT ts_rank({VECTOR_COLUMN}, to_tsquery('simple', %s)) "
+                  f"FROM tasks_task WHERE id = {pk_column(queryset)}", (tsquery,),
+                  output_field=FloatField())
+    matched = RawSQL(f"SELECT id FROM tasks_task "
+                     f"WHERE {VECTOR_COLUMN} @@ to_tsquery('simple', %s)", (tsquery,))
+    return queryset.filter(pk__in=matched).annotate(**{RANK: rank})
+
+
+def fallback_search(queryset, terms):
+    from task_manager.tasks.models import Task
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(name__icontains=term) | Q(description__icontains=term)
+    matched = Task.objects.filter(condition).values('pk')
+    return queryset.filter(pk__in=matched).annotate(
+        **{RANK: Value(0.0, output_field=FloatField())})
+
+
+BACKENDS = {
+    'sqlite': sqlite_search,
+    'postgresql': postgresql_search,
+}
+
+
+def search_tasks(queryset, query):
+    """
+    Полнотекстовый поиск задач по названию и описанию.
+
+    Возвращает queryset задач или строк списка задач, отфильтрованный по всем
+    словам запроса (с поиском по префиксу) и аннотированный релевантностью
+    search_rank: чем больше, тем выше совпадение, совпадения в названии весят
+    больше, чем в описании.
+    Поиск использует индекс базы данных: FTS5 для SQLite и tsvector с GIN
+    для PostgreSQL. Пустой запрос возвращает queryset без изменений.
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return queryset
+    backend = BACKENDS.get(connection.vendor, fallback_search)
+    return backend(queryset, terms)
+
+
+def create_index(schema_editor):
+    """
+    Создание поискового индекса и перестроение его по текущим данным.
+
+    Операция идемпотентна: SQLite пересоздает таблицу при изменении ее схемы
+    миграциями и теряет триггеры, поэтому такие миграции вызывают ее повторно.
+    """
+    statements = {'sqlite': SQLITE_SCHEMA, 'postgresql': POSTGRESQL_SCHEMA}
+    for statement in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def drop_index(schema_editor):
+    statements = {'sqlite': SQLITE_DROP, 'postgresql': POSTGRESQL_DROP}
+    for statement in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
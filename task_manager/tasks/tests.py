@@ -1,10 +1,36 @@
-from django.test import TestCase, Client
+import csv
+import io
+import json
+import time
+from unittest import skipUnless
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.http import Http404
+from django.test import AsyncClient, TestCase, Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.template.loader import get_template as get_template_original
 from django.urls import reverse
+from django.utils import timezone, translation
 
+from task_manager import reference_cache
 from task_manager.labels.models import Label
+from task_manager.pagination import encode_cursor
 from task_manager.statuses.models import Status
+from task_manager.tasks import export, fragments
 from task_manager.tasks.forms import TaskForm
-from task_manager.tasks.models import Task
+from task_manager.tasks.importer import Batch, TaskImporter
+from task_manager.tasks.models import Task, TaskListRow
+from task_manager.tasks.search import FTS_TABLE, search_tasks
+from task_manager.tasks.views import (AsyncIndexView, AsyncTaskDetailView,
+                                      IndexView, TaskDetailView, TaskExportView)
+from task_manager.testing import without_csrf
 from task_manager.users.models import User
 
 
@@ -85,6 +111,868 @@ class TasksIndexViewTest(BaseTestCase):
         self.assertTemplateUsed(response, 'tasks/index.html')
 
 
+@patch.object(IndexView, 'paginate_by', 2)
+class TasksPaginationTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_status = Status.objects.create(name='Other status')
+        for i in range(5):
+            Task.objects.create(name=f'Task {i}', description='Test description',
+                                status=self.status, author=self.author)
+        Task.objects.create(name='Other task', description='Test description',
+                            status=self.other_status, author=self.author)
+
+    def test_tasks_index_pages(self):
+        """
+        Проверка постраничного вывода задач по курсору.
+
+        Переходя по ссылкам "вперед", должны получить все задачи ровно один раз
+        в порядке создания. Ссылка "назад" возвращает предыдущую страницу.
+        """
+        seen = []
+        response = self.client.get(reverse('tasks_index'))
+        pages = [list(response.context['tasks'])]
+        while response.context['page_obj'].has_next():
+            cursor = response.context['page_obj'].next_cursor
+            response = self.client.get(reverse('tasks_index'), {'after': cursor})
+            pages.append(list(response.context['tasks']))
+        for page in pages:
+            seen.extend(task.name for task in page)
+        self.assertEqual(seen, list(Task.objects.order_by('created_at', 'id')
+                                    .values_list('name', flat=True)))
+        self.assertEqual([len(page) for page in pages], [2, 2, 2])
+
+        cursor = response.context['page_obj'].previous_cursor
+        response = self.client.get(reverse('tasks_index'), {'before': cursor})
+        self.assertEqual(list(response.context['tasks']), pages[1])
+        self.assertTrue(response.context['page_obj'].has_previous())
+
+    def test_tasks_index_pages_with_filter(self):
+        """
+        Проверка постраничного вывода вместе с фильтром.
+
+        Курсор не должен терять параметры фильтра в ссылках навигации.
+        """
+        response = self.client.get(reverse('tasks_index'),
+                                   {'status': self.status.id})
+        self.assertEqual(response.context['pagination_query'],
+                         f'status={self.status.id}&')
+        cursor = response.context['page_obj'].next_cursor
+        response = self.client.get(reverse('tasks_index'),
+                                   {'status': self.status.id, 'after': cursor})
+        names = [task.name for task in response.context['tasks']]
+        self.assertEqual(names, ['Task 2', 'Task 3'])
+        self.assertContains(response, f'?status={self.status.id}&amp;after=')
+
+    def test_tasks_index_invalid_cursor(self):
+        """
+        Проверка поврежденного курсора.
+
+        Вместо ошибки должна выводиться первая страница.
+        """
+        response = self.client.get(reverse('tasks_index'), {'after': 'broken!'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task.name for task in response.context['tasks']],
+                         ['Task 0', 'Task 1'])
+
+    def test_tasks_index_wrong_typed_cursor(self):
+        """
+        Проверка курсора с корректным JSON, не подходящего к ключу сортировки.
+
+        Неверное число или типы значений обрабатываются как поврежденный курсор.
+        """
+        for values in (['x', 1], [1, 2], [timezone.now(), 'abc'], [None, None],
+                       [timezone.now()], [timezone.now(), True]):
+            for param in ('after', 'before'):
+                with self.subTest(values=values, param=param):
+                    response = self.client.get(reverse('tasks_index'),
+                                               {param: encode_cursor(values)})
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual([task.name for task in
+                                      response.context['tasks']],
+                                     ['Task 0', 'Task 1'])
+
+
+@patch.object(IndexView, 'paginate_by', 2)
+class TasksSearchTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_status = Status.objects.create(name='Other status')
+        self.create('Login page error', 'Users cannot log in', self.status)
+        self.create('Profile page', 'Login button is misplaced', self.status)
+        self.create('Ошибка входа', 'Не работает страница входа', self.status)
+        self.create('Login timeout', 'Session expires', self.other_status)
+
+    def create(self, name, description, status):
+        return Task.objects.create(name=name, description=description,
+                                   status=status, author=self.author)
+
+    def search(self, **params):
+        response = self.client.get(reverse('tasks_index'), params)
+        return response, [task.name for task in response.context['tasks']]
+
+    def test_search_ranked(self):
+        """
+        Проверка поиска по названию и описанию с ранжированием.
+
+        Совпадение в названии ранжируется выше совпадения в описании, поиск
+        выполняется по префиксу слов без учета регистра.
+        """
+        response, names = self.search(search='LOGIN', status=self.status.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(names, ['Login page error', 'Profile page'])
+        self.assertFalse(response.context['page_obj'].has_next())
+        self.assertEqual(self.search(search='вход')[1], ['Ошибка входа'])
+        self.assertEqual(self.search(search='login page')[1],
+                         ['Login page error', 'Profile page'])
+        self.assertEqual(self.search(search='"(*')[1],
+                         ['Login page error', 'Profile page'])
+        self.assertEqual(self.search(search='missing')[1], [])
+
+    def test_search_pages(self):
+        """
+        Проверка постраничного вывода результатов поиска.
+
+        Курсор содержит релевантность, поэтому страницы не пересекаются.
+        """
+        response, first = self.search(search='login')
+        cursor = response.context['page_obj'].next_cursor
+        self.assertEqual(response.context['pagination_query'], 'search=login&')
+        second = self.search(search='login', after=cursor)[1]
+        self.assertEqual(len(first + second), 3)
+        self.assertEqual(set(first + second), {'Login page error', 'Profile page',
+                                               'Login timeout'})
+
+    def test_search_index_updated_on_writes(self):
+        """
+        Проверка обновления поискового индекса при изменении и удалении задач.
+        """
+        task = Task.objects.get(name='Profile page')
+        task.description = 'Avatar upload'
+        task.save()
+        self.assertEqual(self.search(search='avatar')[1], ['Profile page'])
+        self.assertNotIn('Profile page', self.search(search='button')[1])
+        task.delete()
+        self.assertEqual(self.search(search='avatar')[1], [])
+
+    @skipUnless(connection.vendor == 'sqlite', 'FTS5 index is SQLite only')
+    def test_search_index_schema(self):
+        """
+        Проверка триггеров поискового индекса после всех миграций и запроса
+        поиска без подзапросов.
+
+        SQLite пересоздает таблицу задач при изменении ее схемы и удаляет ее
+        триггеры, поэтому такие миграции должны создавать их заново.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master "
+                           "WHERE type = 'trigger' AND tbl_name = 'tasks_task'")
+            triggers = {name for name, in cursor.fetchall()}
+        self.assertEqual(triggers, {f'{FTS_TABLE}_{suffix}'
+                                    for suffix in ('ai', 'ad', 'au')})
+        queryset = search_tasks(TaskListRow.objects.all(), 'login')
+        self.assertEqual(str(queryset.query).count('SELECT'), 1)
+
+
+class TasksFacetsTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_status = Status.objects.create(name='Other status')
+        for i, status in enumerate([self.status] * 3 + [self.other_status]):
+            task = Task.objects.create(name=f'Task {i}', status=status,
+                                       author=self.author,
+                                       executor=self.executor if i else None)
+            if i % 2:
+                task.labels.add(self.label)
+
+    def facets(self, **params):
+        response = self.client.get(reverse('tasks_index'), params)
+        return {facet['name']: [(option['label'], option['count'],
+                                 option['selected'])
+                                for option in facet['options']]
+                for facet in response.context['facets']}
+
+    def test_facet_counts(self):
+        """
+        Проверка количества задач по вариантам фасетов.
+
+        Фильтр по фасету не влияет на счетчики этого же фасета, но учитывается
+        в остальных фасетах.
+        """
+        self.assertEqual(self.facets(), {
+            'status': [('Test status', 3, False), ('Other status', 1, False)],
+            'executor': [(str(self.executor), 3, False)],
+            'labels': [('Test label', 2, False)],
+        })
+        facets = self.facets(status=self.other_status.id)
+        self.assertEqual(facets['status'], [('Test status', 3, False),
+                                            ('Other status', 1, True)])
+        self.assertEqual(facets['executor'][0][1], 1)
+        self.assertEqual(facets['labels'], [('Test label', 1, False)])
+
+    def test_facet_links(self):
+        """
+        Проверка ссылок фасетов: выбранный вариант добавляется к текущему фильтру,
+        курсор постраничной навигации отбрасывается.
+        """
+        response = self.client.get(reverse('tasks_index'),
+                                   {'search': 'task', 'after': 'cursor'})
+        option = response.context['facets'][0]['options'][0]
+        self.assertEqual(option['query'], f'search=task&status={self.status.id}')
+        self.assertContains(response, f'?search=task&amp;status={self.status.id}')
+
+    def test_facet_counts_cached(self):
+        """
+        Проверка кеширования счетчиков по нормализованному ключу фильтра.
+
+        Счетчики считаются тремя запросами GROUP BY, повторная загрузка с тем же
+        фильтром (в том числе записанным иначе) не выполняет группирующих
+        запросов.
+        Изменение задачи кеш не сбрасывает, новые счетчики видны после
+        TASK_FACETS_TTL.
+        """
+        with CaptureQueriesContext(connection) as first:
+            self.facets(search='Task')
+        with CaptureQueriesContext(connection) as second:
+            self.facets(search='  TASK ', status='')
+        self.assertEqual(
+            len([query for query in first if 'GROUP BY' in query['sql']]), 3)
+        self.assertFalse([query for query in second if 'GROUP BY' in query['sql']])
+
+        Task.objects.filter(name='Task 0').get().labels.add(self.label)
+        self.assertEqual(self.facets(search='task')['labels'],
+                         [('Test label', 2, False)])
+        expired = time.time() + settings.TASK_FACETS_TTL + 1
+        with patch('time.time', return_value=expired):
+            self.assertEqual(self.facets(search='task')['labels'],
+                             [('Test label', 3, False)])
+
+
+class TaskListRowTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.post(reverse('tasks_create'), {
+            'name': 'Test task',
+            'description': 'Test description',
+            'status': self.status.id,
+            'executor': self.executor.id,
+            'labels': [self.label.id],
+        })
+        self.task = Task.objects.get()
+
+    def row(self):
+        return TaskListRow.objects.values(
+            'name', 'status_name', 'author_name', 'executor_name',
+            'label_names').get(pk=self.task.pk)
+
+    def test_row_created(self):
+        """
+        Проверка создания строки списка вместе с задачей.
+        """
+        self.assertEqual(self.row(), {
+            'name': 'Test task', 'status_name': 'Test status',
+            'author_name': 'Test User', 'executor_name': str(self.executor),
+            'label_names': 'Test label',
+        })
+
+    def test_row_updated(self):
+        """
+        Проверка обновления строки при изменении задачи и связанных объектов.
+        """
+        other_label = Label.objects.create(name='Another label')
+        self.client.post(reverse('tasks_update', args=[self.task.pk]), {
+            'name': 'Renamed task',
+            'description': 'Test description',
+            'status': self.status.id,
+            'executor': '',
+            'labels': [self.label.id, other_label.id],
+        })
+        self.status.name = 'Renamed status'
+        self.status.save()
+        self.label.name = 'Renamed label'
+        self.label.save()
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        self.assertEqual(self.row(), {
+            'name': 'Renamed task', 'status_name': 'Renamed status',
+            'author_name': 'Renamed User', 'executor_name': '',
+            'label_names': 'Another label, Renamed label',
+        })
+        other_label.task_set.clear()
+        self.label.task_set.remove(self.task)
+        self.assertEqual(self.row()['label_names'], '')
+
+    def test_row_deleted(self):
+        """
+        Проверка удаления строки вместе с задачей.
+        """
+        self.client.post(reverse('tasks_delete', args=[self.task.pk]))
+        self.assertFalse(TaskListRow.objects.exists())
+
+    def test_index_reads_single_table(self):
+        """
+        Проверка чтения списка задач из одной таблицы без соединений.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('tasks_index'),
+                                       {'status': self.status.id})
+        self.assertContains(response, 'Test label')
+        queries = [query['sql'] for query in context
+                   if 'FROM "tasks_tasklistrow"' in query['sql']
+                   and 'GROUP BY' not in query['sql']]
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('JOIN', queries[0])
+
+
+@patch.object(TaskExportView, 'chunk_size', 2)
+class TaskExportViewTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_status = Status.objects.create(name='Other status')
+        for i in range(5):
+            task = Task.objects.create(
+                name=f'Task {i}', description=f'Description, "{i}"',
+                status=self.status if i % 2 else self.other_status,
+                author=self.author, executor=self.executor)
+            task.labels.add(self.label)
+
+    def export(self, **params):
+        response = self.client.get(reverse('tasks_export'), params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_export_csv(self):
+        """
+        Проверка потоковой выгрузки всех задач в CSV.
+        """
+        response, content = self.export()
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="tasks-', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row['name'] for row in rows],
+                         [f'Task {i}' for i in range(5)])
+        self.assertEqual(rows[0]['description'], 'Description, "0"')
+        self.assertEqual(rows[0]['status'], 'Other status')
+        self.assertEqual(rows[0]['labels'], 'Test label')
+
+    def test_export_jsonl_with_filter(self):
+        """
+        Проверка выгрузки в JSON Lines с параметрами фильтра списка задач.
+        """
+        response, content = self.export(format='jsonl', status=self.status.id)
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['name'] for row in rows], ['Task 1', 'Task 3'])
+        self.assertEqual(rows[0]['author'], 'Test User')
+        self.assertEqual(rows[0]['id'], Task.objects.get(name='Task 1').pk)
+
+    def test_export_asgi(self):
+        """
+        Проверка выгрузки под ASGI.
+
+        Ответ отдается асинхронным итератором по строке на задачу, а не
+        списком, собранным из синхронного итератора.
+        """
+        client = AsyncClient()
+        client.force_login(self.user)
+
+        async def get_export(**params):
+            response = await client.get(reverse('tasks_export'), params)
+            return response, [chunk async for chunk in response.streaming_content]
+
+        for export_format in export.FORMATS:
+            with self.subTest(format=export_format):
+                response, chunks = async_to_sync(get_export)(format=export_format)
+                self.assertTrue(response.is_async)
+                self.assertEqual(b''.join(chunks).decode(),
+                                 self.export(format=export_format)[1])
+        self.assertEqual(len(chunks), 5)
+
+    def test_export_errors(self):
+        """
+        Проверка неизвестного формата и ошибочного фильтра.
+        """
+        response = self.client.get(reverse('tasks_export'), {'format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('tasks_export'), {'status': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.json())
+
+    def test_export_unauthorized(self):
+        """
+        Проверка выгрузки без авторизации.
+        """
+        self.client.logout()
+        response = self.client.get(reverse('tasks_export'))
+        self.assertRedirects(response, reverse('login'))
+
+
+class TaskImportTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        Task.objects.create(name='Existing', description='Existing task',
+                            status=self.status, author=self.author)
+
+    def records(self, *names):
+        return [json.dumps({'name': name, 'description': f'{name} description',
+                            'status': 'Test status', 'executor': 'executor',
+                            'labels': ['Test label']}) + '\n'
+                for name in names]
+
+    def upload(self, content, name='tasks.csv', **data):
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post(reverse('tasks_import'), {'file': upload, **data})
+
+    def test_import_csv(self):
+        """
+        Проверка импорта CSV с ошибочными строками.
+
+        Ошибочные строки пропускаются с номером строки и причиной, остальные
+        задачи создаются вместе с метками, счетчиками и строками списка задач.
+        """
+        content = (
+            'name,description,status,executor,labels\n'
+            'Imported one,First,Test status,executor,Test label\n'
+            'Imported two,"Second, with comma",Test status,,\n'
+            'Existing,Duplicate,Test status,,\n'
+            'Bad status,Text,Missing,,\n'
+            ',No name,Test status,,\n'
+            'Bad label,Text,Test status,,"Test label, Missing"\n'
+        )
+        response = self.upload(content)
+        self.assertEqual(response.status_code, 200)
+        result = response.context['result']
+        self.assertEqual(result.created, 2)
+        self.assertEqual([line for line, message in result.errors], [4, 5, 6, 7])
+        self.assertContains(response, 'Статус &quot;Missing&quot; не существует')
+
+        task = Task.objects.get(name='Imported one')
+        self.assertEqual(task.author, self.user)
+        self.assertEqual(task.executor, self.executor)
+        self.assertEqual(list(task.labels.all()), [self.label])
+        self.assertEqual(Task.objects.get(name='Imported two').description,
+                         'Second, with comma')
+        self.assertEqual(TaskListRow.objects.get(task=task).label_names,
+                         'Test label')
+        self.status.refresh_from_db()
+        self.label.refresh_from_db()
+        self.executor.refresh_from_db()
+        self.assertEqual(self.status.task_count, 3)
+        self.assertEqual(self.label.task_count, 1)
+        self.assertEqual(self.executor.assigned_count, 1)
+
+        response = self.client.get(reverse('tasks_index'), {'search': 'comma'})
+        self.assertEqual([row.name for row in response.context['tasks']],
+                         ['Imported two'])
+
+    def test_import_jsonl_batches(self):
+        """
+        Проверка импорта JSON Lines: число запросов на пакет не зависит от
+        числа записей в нем.
+        """
+        def run(names, batch_size):
+            lines = self.records(*names)
+            with CaptureQueriesContext(connection) as queries:
+                result = TaskImporter(self.user, batch_size).run(lines, 'jsonl')
+            self.assertEqual(result.errors, [])
+            return len(queries)
+
+        small = run(['A1', 'A2'], 10)
+        large = run([f'B{i}' for i in range(20)], 100)
+        self.assertEqual(small, large)
+        self.assertGreater(run([f'C{i}' for i in range(4)], 2), large)
+        self.assertEqual(Task.objects.count(), 27)
+        self.assertEqual(TaskListRow.objects.count(), 27)
+
+    def test_import_invalid_json(self):
+        """
+        Проверка пропуска строк с некорректным JSON и загрузки с выбором формата.
+        """
+        content = ''.join(self.records('Valid')) + '{broken\n\n[1, 2]\n'
+        response = self.upload(content, name='tasks.txt', format='jsonl')
+        result = response.context['result']
+        self.assertEqual(result.created, 1)
+        self.assertEqual([line for line, message in result.errors], [2, 4])
+
+    def test_import_ignores_author_column(self):
+        """
+        Проверка, что при загрузке файла автор задач - текущий пользователь,
+        а колонка author не используется.
+        """
+        content = ('name,description,status,author\n'
+                   'Foreign,Text,Test status,executor\n'
+                   'Unknown author,Text,Test status,nobody\n')
+        response = self.upload(content)
+        self.assertEqual(response.context['result'].errors, [])
+        self.assertEqual(set(Task.objects.filter(author=self.user)
+                             .values_list('name', flat=True)),
+                         {'Existing', 'Foreign', 'Unknown author'})
+        self.executor.refresh_from_db()
+        self.assertEqual(self.executor.authored_count, 0)
+
+    def test_import_invalid_values(self):
+        """
+        Проверка записи с метками неверного типа и файла не в UTF-8.
+
+        Ошибочная запись пропускается, файл в другой кодировке отклоняется
+        формой без импорта.
+        """
+        record = json.dumps({'name': 'Bad labels', 'description': 'Text',
+                             'status': 'Test status', 'labels': 5}) + '\n'
+        response = self.upload(record + ''.join(self.records('Valid')),
+                               name='tasks.jsonl')
+        result = response.context['result']
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.errors, [
+            (1, 'Поле "labels" должно быть списком названий или строкой через '
+                'запятую')])
+
+        upload = SimpleUploadedFile('tasks.csv', 'name,description\nЗадача,Текст\n'
+                                    .encode('cp1251'))
+        response = self.client.post(reverse('tasks_import'), {'file': upload})
+        self.assertFormError(response.context['form'], 'file',
+                             'Файл должен быть в кодировке UTF-8')
+        self.assertFalse(Task.objects.filter(name='Задача').exists())
+
+    def test_import_concurrent_duplicate(self):
+        """
+        Проверка задачи, созданной параллельно после проверки пакета.
+
+        Пакет вставляется по одной задаче, конфликтующая строка попадает в
+        ошибки, остальные задачи пакета создаются.
+        """
+        init = Batch.__init__
+
+        def concurrent_init(batch, *args, **kwargs):
+            init(batch, *args, **kwargs)
+            Task.objects.create(name='Concurrent', description='Text',
+                                status=self.status, author=self.author)
+
+        lines = self.records('First', 'Concurrent', 'Second')
+        with patch.object(Batch, '__init__', concurrent_init):
+            result = TaskImporter(self.user).run(lines, 'jsonl')
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.errors,
+                         [(2, 'Задача "Concurrent" уже существует')])
+        self.assertEqual(TaskListRow.objects.filter(
+            name__in=['First', 'Second']).count(), 2)
+        self.label.refresh_from_db()
+        self.assertEqual(self.label.task_count, 2)
+
+    def test_import_page(self):
+        """
+        Проверка страницы импорта и доступа без авторизации.
+        """
+        response = self.client.get(reverse('tasks_import'))
+        self.assertContains(response, 'Импорт задач')
+        self.client.logout()
+        response = self.client.get(reverse('tasks_import'))
+        self.assertRedirects(response, reverse('login'))
+
+
+class TaskBulkActionTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_status = Status.objects.create(name='Other status')
+        self.tasks = [Task.objects.create(name=f'Task {i}', description='Text',
+                                          status=self.status, author=self.author)
+                      for i in range(4)]
+        self.tasks[0].labels.add(self.label)
+
+    def bulk(self, action, tasks, **data):
+        data = {f'bulk-{name}': value for name, value in data.items()}
+        return self.client.post(reverse('tasks_bulk'), {
+            'bulk-action': action,
+            'bulk-tasks': [task.pk for task in tasks],
+            'query': 'status=1&',
+            **data,
+        })
+
+    def test_set_status_and_executor(self):
+        """
+        Проверка смены статуса и исполнителя: строки списка задач и счетчики
+        обновляются, число запросов не зависит от числа задач.
+        """
+        reference_cache.clear_all()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.bulk('set_status', self.tasks[:3],
+                                 status=self.other_status.pk)
+        self.assertRedirects(response, reverse('tasks_index') + '?status=1',
+                             fetch_redirect_response=False)
+        names = TaskListRow.objects.order_by('pk').values_list('status_name',
+                                                               flat=True)
+        self.assertEqual(list(names), ['Other status'] * 3 + ['Test status'])
+        self.other_status.refresh_from_db()
+        self.assertEqual(self.other_status.task_count, 3)
+        reference_cache.clear_all()
+        with self.assertNumQueries(len(queries)):
+            self.bulk('set_status', self.tasks, status=self.status.pk)
+        self.status.refresh_from_db()
+        self.assertEqual(self.status.task_count, 4)
+
+        self.bulk('set_executor', self.tasks[1:], executor=self.executor.pk)
+        self.executor.refresh_from_db()
+        self.assertEqual(self.executor.assigned_count, 3)
+        self.bulk('set_executor', self.tasks[1:2], executor='')
+        self.executor.refresh_from_db()
+        self.assertEqual(self.executor.assigned_count, 2)
+        self.assertEqual(Task.objects.filter(executor=self.executor).count(), 2)
+        self.assertEqual(TaskListRow.objects.filter(executor=self.executor).count(), 2)
+
+    def test_labels(self):
+        """
+        Проверка добавления и удаления метки у выбранных задач.
+        """
+        self.bulk('add_label', self.tasks, label=self.label.pk)
+        self.label.refresh_from_db()
+        self.assertEqual(self.label.task_count, 4)
+        self.assertEqual(TaskListRow.objects.filter(label_names='Test label')
+                         .count(), 4)
+        self.bulk('remove_label', self.tasks[:3], label=self.label.pk)
+        self.label.refresh_from_db()
+        self.assertEqual(self.label.task_count, 1)
+        self.assertEqual(list(self.label.task_set.all()), [self.tasks[3]])
+        self.assertEqual(TaskListRow.objects.get(task=self.tasks[0]).label_names,
+                         '')
+
+    def test_invalid_action(self):
+        """
+        Проверка действия без значения и без выбранных задач.
+        """
+        response = self.bulk('add_label', self.tasks)
+        self.assertRedirects(response, reverse('tasks_index') + '?status=1',
+                             fetch_redirect_response=False)
+        self.assertEqual(Task.labels.through.objects.count(), 1)
+        response = self.client.post(reverse('tasks_bulk'),
+                                    {'bulk-action': 'set_status'}, follow=True)
+        self.assertContains(response, 'Обязательное поле')
+
+    def test_unauthorized(self):
+        """
+        Проверка массового действия без авторизации.
+        """
+        self.client.logout()
+        response = self.bulk('set_status', self.tasks, status=self.other_status.pk)
+        self.assertRedirects(response, reverse('login'))
+        self.assertFalse(Task.objects.filter(status=self.other_status).exists())
+
+
+class TasksConditionalGetTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(name='Task', description='Text',
+                                        status=self.status, author=self.author)
+        self.task.labels.add(self.label)
+        self.detail_url = reverse('tasks_detail', kwargs={'pk': self.task.pk})
+
+    def revalidate(self, url, response, **params):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_detail(self):
+        """
+        Проверка ответа 304 для неизмененной задачи одним запросом к данным и
+        нового ответа после изменения задачи или названия метки.
+        """
+        response = self.client.get(self.detail_url)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+        # сессия, пользователь и время изменения задачи
+        with self.assertNumQueries(3):
+            not_modified = self.revalidate(self.detail_url, response)
+        self.assertEqual(not_modified.status_code, 304)
+        response = self.client.get(
+            self.detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+        self.label.name = 'Renamed label'
+        self.label.save()
+        response = self.revalidate(self.detail_url, response)
+        self.assertContains(response, 'Renamed label')
+        self.task.description = 'Changed'
+        self.task.save()
+        self.assertEqual(self.revalidate(self.detail_url, response).status_code,
+                         200)
+
+    def test_index(self):
+        """
+        Проверка ответа 304 для неизмененного списка и сброса ETag при
+        изменении данных, фильтра или наличии сообщений.
+        """
+        url = reverse('tasks_index')
+        response = self.client.get(url, {'status': self.status.pk})
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(self.revalidate(url, response,
+                                         status=self.status.pk).status_code, 304)
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+        other = Status.objects.create(name='Other')
+        Task.objects.create(name='Other task', description='Text', status=other,
+                            author=self.author)
+        self.assertEqual(self.revalidate(url, response,
+                                         status=self.status.pk).status_code, 200)
+
+        response = self.client.get(url)
+        self.client.post(reverse('tasks_delete', kwargs={'pk': self.task.pk}))
+        self.assertContains(self.revalidate(url, response),
+                            'Задача успешно удалена')
+
+
+class TaskRowFragmentTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            task = Task.objects.create(name=f'Task {i}', description='Text',
+                                       status=self.status, author=self.author,
+                                       executor=self.executor)
+            task.labels.add(self.label)
+        self.rows = list(TaskListRow.objects.order_by('pk'))
+
+    def test_rows_cached(self):
+        """
+        Проверка повторного вывода списка без рендеринга строк и перерисовки
+        только измененной задачи.
+        """
+        first = fragments.render_rows(self.rows, select_name='bulk-tasks')
+        self.assertIn('Test status', first[0])
+        with patch('task_manager.tasks.fragments.get_template') as get_template:
+            self.assertEqual(fragments.render_rows(self.rows,
+                                                   select_name='bulk-tasks'),
+                             first)
+        get_template.assert_not_called()
+
+        task = Task.objects.get(name='Task 1')
+        task.name = 'Changed task'
+        task.save()
+        rows = list(TaskListRow.objects.order_by('pk'))
+        with patch('task_manager.tasks.fragments.get_template',
+                   wraps=get_template_original) as get_template:
+            html = fragments.render_rows(rows, select_name='bulk-tasks')
+        get_template.assert_called_once()
+        self.assertIn('Changed task', html[1])
+        self.assertEqual([html[0], html[2]], [first[0], first[2]])
+
+    def test_rows_invalidated_on_rename(self):
+        """
+        Проверка перерисовки строк после переименования статуса, метки и
+        пользователя.
+        """
+        url = reverse('tasks_index')
+        self.client.get(url)
+        self.status.name = 'Renamed status'
+        self.status.save()
+        self.label.name = 'Renamed label'
+        self.label.save()
+        self.executor.first_name = 'Renamed'
+        self.executor.save()
+        response = self.client.get(url)
+        self.assertContains(response, 'Renamed status', count=4)
+        self.assertContains(response, 'Renamed label', count=4)
+        self.assertContains(response, '<td>Renamed </td>', count=3)
+
+    def test_rows_per_language(self):
+        """
+        Проверка отдельных фрагментов для разных языков.
+        """
+        russian = fragments.render_rows(self.rows, select_name='bulk-tasks')
+        with translation.override('en'):
+            english = fragments.render_rows(self.rows, select_name='bulk-tasks')
+        self.assertIn('Изменить', russian[0])
+        self.assertIn('Update', english[0])
+
+
+class TasksQueryCountTest(BaseTestCase):
+    def create_task(self, name):
+        task = Task.objects.create(name=name, description='Test description',
+                                   status=self.status, author=self.author,
+                                   executor=self.executor)
+        task.labels.add(self.label, Label.objects.create(name=f'{name} label'))
+        return task
+
+    def count_queries(self, url):
+        reference_cache.clear_all()
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_tasks_index_query_count(self):
+        """
+        Проверка количества запросов на странице задач.
+
+        Количество запросов не должно зависеть от количества задач на странице.
+        """
+        self.create_task('Task 1')
+        expected = self.count_queries(reverse('tasks_index'))
+        for i in range(2, 6):
+            self.create_task(f'Task {i}')
+        self.assertEqual(self.count_queries(reverse('tasks_index')), expected)
+
+    def test_tasks_detail_query_count(self):
+        """
+        Проверка количества запросов на странице просмотра задачи.
+
+        Количество запросов не должно зависеть от количества меток задачи.
+        """
+        task = self.create_task('Task 1')
+        url = reverse('tasks_detail', kwargs={'pk': task.pk})
+        expected = self.count_queries(url)
+        task.labels.add(*(Label.objects.create(name=f'Label {i}') for i in range(3)))
+        self.assertEqual(self.count_queries(url), expected)
+
+
+class TaskAutocompleteWidgetsTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        Status.objects.create(name='Unused status')
+        Label.objects.create(name='Unused label')
+        self.task = Task.objects.create(name='Test task', description='Test',
+                                        status=self.status, author=self.author,
+                                        executor=self.executor)
+        self.task.labels.add(self.label)
+
+    def test_task_form_renders_selected_options_only(self):
+        """
+        Проверка формы изменения задачи с автодополнением.
+
+        В HTML выводятся только выбранные статус, исполнитель и метки, а также
+        адреса JSON-представлений для подгрузки остальных вариантов.
+        """
+        response = self.client.get(reverse('tasks_update',
+                                           kwargs={'pk': self.task.pk}))
+        for url_name in ('statuses_autocomplete', 'users_autocomplete',
+                         'labels_autocomplete'):
+            self.assertContains(response,
+                                f'data-autocomplete-url="{reverse(url_name)}"')
+        self.assertContains(response, 'Test status')
+        self.assertContains(response, 'Test label')
+        self.assertNotContains(response, 'Unused status')
+        self.assertNotContains(response, 'Unused label')
+        self.assertNotContains(response, 'Test User')
+
+    def test_filter_form_renders_selected_options_only(self):
+        """
+        Проверка формы фильтра задач с автодополнением.
+        """
+        response = self.client.get(reverse('tasks_index'),
+                                   {'labels': self.label.id})
+        self.assertContains(response, f'<option value="{self.label.id}" selected>')
+        self.assertNotContains(response, 'Unused label')
+        self.assertNotContains(response, 'Unused status')
+
+    def test_task_form_validates_submitted_keys(self):
+        """
+        Проверка валидации формы задачи по переданным первичным ключам.
+        """
+        form = TaskForm(data={'name': 'New task', 'description': 'Test',
+                              'status': 0, 'labels': [self.label.id, 0]})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(set(form.errors), {'status', 'labels'})
+        form = TaskForm(data={'name': 'New task', 'description': 'Test',
+                              'status': self.status.id, 'executor': self.executor.id,
+                              'labels': [self.label.id]})
+        self.assertTrue(form.is_valid())
+
+
 class TasksCreateViewTest(BaseTestCase):
     def test_tasks_create_view_get(self):
         """
@@ -358,3 +1246,206 @@ class TaskDetailViewTest(BaseTestCase):
             reverse('tasks_detail', kwargs={'pk': self.task.pk}))
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'tasks/detail.html')
+
+
+def render_view(view_class, request, **kwargs):
+    """
+    Вызов синхронного или асинхронного представления и рендеринг ответа.
+    """
+    view = view_class.as_view()
+    if view_class.view_is_async:
+        view = async_to_sync(view)
+    response = view(request, **kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+class AsyncViewsTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.tasks = [Task.objects.create(name=f'Task {i}', status=self.status,
+                                          author=self.user,
+                                          executor=self.executor)
+                      for i in range(3)]
+        self.tasks[0].labels.add(self.label)
+
+    def request(self, url_name, data=None, user=None, **kwargs):
+        request = self.factory.get(reverse(url_name, kwargs=kwargs), data or {})
+        request.user = user or self.user
+        return request
+
+    def test_same_pages(self):
+        """
+        Проверка, что асинхронные список и страница задачи совпадают с
+        синхронными, в том числе с фильтрами и курсором.
+        """
+        pk = self.tasks[0].pk
+        cases = [
+            (IndexView, AsyncIndexView, 'tasks_index', {}, {}),
+            (IndexView, AsyncIndexView, 'tasks_index',
+             {'labels': self.label.pk, 'status': self.status.pk}, {}),
+            (IndexView, AsyncIndexView, 'tasks_index', {'after': 'broken'}, {}),
+            (TaskDetailView, AsyncTaskDetailView, 'tasks_detail', {}, {'pk': pk}),
+        ]
+        for sync_view, async_view, url_name, data, kwargs in cases:
+            with self.subTest(url_name=url_name, data=data):
+                request = self.request(url_name, data, **kwargs)
+                expected = render_view(sync_view, request, **kwargs)
+                response = render_view(async_view, request, **kwargs)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Task 0')
+                self.assertEqual(without_csrf(response.content),
+                                 without_csrf(expected.content))
+
+    def test_not_modified(self):
+        """
+        Проверка ответа 304 асинхронных списка и страницы задачи.
+        """
+        for view_class, url_name, kwargs in (
+                (AsyncIndexView, 'tasks_index', {}),
+                (AsyncTaskDetailView, 'tasks_detail', {'pk': self.tasks[0].pk})):
+            request = self.request(url_name, **kwargs)
+            request.META['CSRF_COOKIE'] = 'x' * 32
+            etag = render_view(view_class, request, **kwargs)['ETag']
+            request.META['HTTP_IF_NONE_MATCH'] = etag
+            response = render_view(view_class, request, **kwargs)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], etag)
+
+    def test_login_required_and_missing_task(self):
+        """
+        Проверка перенаправления неавторизованного пользователя и ошибки 404
+        для несуществующей задачи.
+        """
+        for view_class, url_name, kwargs in (
+                (AsyncIndexView, 'tasks_index', {}),
+                (AsyncTaskDetailView, 'tasks_detail', {'pk': self.tasks[0].pk})):
+            request = self.request(url_name, user=AnonymousUser(), **kwargs)
+            response = render_view(view_class, request, **kwargs)
+            self.assertRedirects(response, reverse('login'),
+                                 fetch_redirect_response=False)
+        with self.assertRaises(Http404):
+            render_view(AsyncTaskDetailView, self.request('tasks_detail', pk=0),
+                        pk=0)
+
+
+class TaskCountersTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_status = Status.objects.create(name='Other status')
+        self.other_label = Label.objects.create(name='Other label')
+        self.client.post(reverse('tasks_create'), {
+            'name': 'Test task',
+            'description': 'Test description',
+            'status': self.status.id,
+            'executor': self.executor.id,
+            'labels': [self.label.id],
+        })
+        self.task = Task.objects.get()
+
+    def assertCounters(self, status, label, authored, assigned):
+        self.assertEqual(
+            [Status.objects.get(pk=self.status.pk).task_count,
+             Label.objects.get(pk=self.label.pk).task_count,
+             User.objects.get(pk=self.user.pk).authored_count,
+             User.objects.get(pk=self.executor.pk).assigned_count],
+            [status, label, authored, assigned])
+
+    def test_counters_on_create(self):
+        """
+        Проверка счетчиков после создания задачи.
+        """
+        self.assertCounters(1, 1, 1, 1)
+        self.assertEqual(Label.objects.get(pk=self.other_label.pk).task_count, 0)
+
+    def test_counters_on_update(self):
+        """
+        Проверка переноса счетчиков при изменении статуса, исполнителя и меток.
+        """
+        self.client.post(reverse('tasks_update', args=[self.task.pk]), {
+            'name': 'Test task',
+            'description': 'Test description',
+            'status': self.other_status.id,
+            'executor': '',
+            'labels': [self.other_label.id],
+        })
+        self.assertCounters(0, 0, 1, 0)
+        self.assertEqual(Status.objects.get(pk=self.other_status.pk).task_count, 1)
+        self.assertEqual(Label.objects.get(pk=self.other_label.pk).task_count, 1)
+
+    def test_counters_on_delete(self):
+        """
+        Проверка уменьшения счетчиков при удалении задачи.
+        """
+        self.client.post(reverse('tasks_delete', args=[self.task.pk]))
+        self.assertFalse(Task.objects.exists())
+        self.assertCounters(0, 0, 0, 0)
+
+    def test_counters_on_label_changes(self):
+        """
+        Проверка счетчиков меток при изменении связей с обеих сторон.
+
+        Удаление несвязанной метки не должно менять счетчики.
+        """
+        self.task.labels.remove(self.other_label)
+        self.assertCounters(1, 1, 1, 1)
+        self.task.labels.add(self.other_label)
+        self.assertEqual(Label.objects.get(pk=self.other_label.pk).task_count, 1)
+        self.other_label.task_set.clear()
+        self.assertEqual(Label.objects.get(pk=self.other_label.pk).task_count, 0)
+        self.label.task_set.remove(self.task)
+        self.assertCounters(1, 0, 1, 1)
+        self.label.task_set.add(self.task)
+        self.task.labels.clear()
+        self.assertCounters(1, 0, 1, 1)
+
+    def test_counters_rolled_back_with_task(self):
+        """
+        Проверка отката счетчиков вместе с транзакцией, создающей задачу.
+        """
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            Task.objects.create(name='Rolled back', status=self.status,
+                                author=self.user, executor=self.executor)
+            raise RuntimeError
+        self.assertCounters(1, 1, 1, 1)
+
+    def test_status_update_keeps_counter(self):
+        """
+        Проверка, что сохранение статуса не затирает счетчик устаревшим значением.
+        """
+        self.status.name = 'Renamed status'
+        self.status.save()
+        self.assertCounters(1, 1, 1, 1)
+
+    def test_index_pages_show_counters(self):
+        """
+        Проверка счетчиков задач на страницах списков статусов и меток после
+        создания задачи.
+        """
+        pages = (('statuses_index', self.status.name),
+                 ('labels_index', self.label.name))
+        for url_name, name in pages:
+            self.client.get(reverse(url_name))
+        Task.objects.create(name='Second task', description='Text',
+                            status=self.status, author=self.user
+                            ).labels.add(self.label)
+        for url_name, name in pages:
+            with self.subTest(url_name=url_name):
+                content = self.client.get(reverse(url_name)).content.decode()
+                self.assertRegex(content, rf'<td>{name}</td>\s*<td>2</td>')
+
+    def test_stale_instances_keep_counters(self):
+        """
+        Проверка счетчиков при сохранении двух экземпляров одной задачи,
+        загруженных до изменения.
+        """
+        first, second = Task.objects.get(), Task.objects.get()
+        first.status = self.other_status
+        first.save()
+        second.status = self.other_status
+        second.executor = None
+        second.save()
+        self.assertCounters(0, 1, 1, 0)
+        self.assertEqual(Status.objects.get(pk=self.other_status.pk).task_count, 1)
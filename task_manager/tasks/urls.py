@@ -1,11 +1,19 @@
+from django.conf import settings
 from django.urls import path
 
 from task_manager.tasks import views
 
+IndexView = views.AsyncIndexView if settings.ASYNC_VIEWS else views.IndexView
+TaskDetailView = (views.AsyncTaskDetailView if settings.ASYNC_VIEWS
+                  else views.TaskDetailView)
+
 urlpatterns = [
-    path('', views.IndexView.as_view(), name='tasks_index'),
+    path('', IndexView.as_view(), name='tasks_index'),
+    path('export/', views.TaskExportView.as_view(), name='tasks_export'),
+    path('bulk/', views.TaskBulkActionView.as_view(), name='tasks_bulk'),
+    path('import/', views.TaskImportView.as_view(), name='tasks_import'),
     path('create/', views.TaskCreateView.as_view(), name='tasks_create'),
     path('<int:pk>/update/', views.TaskUpdateView.as_view(), name='tasks_update'),
     path('<int:pk>/delete/', views.TaskDeleteView.as_view(), name='tasks_delete'),
-    path('<int:pk>/', views.TaskDetailView.as_view(), name='tasks_detail'),
+    path('<int:pk>/', TaskDetailView.as_view(), name='tasks_detail'),
 ]
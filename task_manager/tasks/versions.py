@@ -0,0 +1,56 @@
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+VERSION_KEY = 'tasks:version'
+
+
+def get_version():
+    """
+    Текущая версия данных списка задач.
+
+    Версия входит в ключи кешей, построенных по задачам, и меняется при любой
+    записи в задачи, поэтому устаревшие записи кеша просто перестают читаться.
+    Названия статусов и меток выводятся вместе с задачами, поэтому их
+    изменение тоже меняет версию.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def bump(**kwargs):
+    """
+    Смена версии сразу и после фиксации транзакции.
+
+    Повторная смена не дает закешировать под новой версией данные, прочитанные
+    другим процессом до фиксации.
+    """
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+    transaction.on_commit(lambda: cache.set(VERSION_KEY, uuid.uuid4().hex, None))
+
+
+def user_changed(sender, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) - {'last_login'}:
+        bump()
+
+
+def connect():
+    from task_manager.labels.models import Label
+    from task_manager.statuses.models import Status
+    from task_manager.tasks.models import Task
+    from task_manager.users.models import User
+
+    post_save.connect(bump, sender=Task, dispatch_uid='tasks_version:save')
+    post_delete.connect(bump, sender=Task, dispatch_uid='tasks_version:delete')
+    m2m_changed.connect(bump, sender=Task.labels.through,
+                        dispatch_uid='tasks_version:labels')
+    post_save.connect(user_changed, sender=User,
+                      dispatch_uid='tasks_version:user')
+    post_save.connect(bump, sender=Status, dispatch_uid='tasks_version:status')
+    post_save.connect(bump, sender=Label, dispatch_uid='tasks_version:label')
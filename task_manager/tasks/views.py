@@ -1,23 +1,210 @@
+import io
+
+from asgiref.sync import sync_to_async
 from django.contrib import messages
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Max
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from django.views.generic import FormView, View
 from django_filters.views import FilterView
 
-from task_manager.mixins import (CustomIndexView,
+from task_manager.mixins import (AsyncDetailMixin,
+                                 AsyncLoginRequiredMixin,
+                                 CustomLoginRequiredMixin,
+                                 ConditionalGetMixin,
+                                 KeysetPaginationMixin,
+                                 CustomIndexView,
                                  CustomCreateView,
                                  CustomUpdateView,
                                  CustomDetailView,
                                  CustomDeleteView)
-from task_manager.tasks.forms import TaskForm, TaskFilterForm
-from task_manager.tasks.models import Task
+from task_manager.tasks import (bulk, export, facets, fragments, importer,
+                                versions)
+from task_manager.tasks.forms import (TaskForm, TaskBulkActionForm,
+                                      TaskFilterForm, TaskImportForm)
+from task_manager.tasks.models import Task, TaskListRow
+from task_manager.tasks.search import RANK
+
 
+class IndexView(ConditionalGetMixin, KeysetPaginationMixin, FilterView,
+                CustomIndexView):
+    """
+    Список задач.
 
-class IndexView(FilterView, CustomIndexView):
+    Читается из денормализованной таблицы TaskListRow без соединений.
+    """
     template_name = 'tasks/index.html'
-    model = Task
+    model = TaskListRow
     filterset_class = TaskFilterForm
     context_object_name = 'tasks'
+    paginate_by = 50
+    keyset_ordering = ('created_at', 'task_id')
+
+    def get_keyset_ordering(self):
+        """
+        При поиске задачи упорядочиваются по релевантности.
+        """
+        if RANK in self.object_list.query.annotations:
+            return (f'-{RANK}',) + self.keyset_ordering
+        return self.keyset_ordering
+
+    def get_conditional_state(self):
+        """
+        Отпечаток списка - версия данных задач (от нее зависят фасеты), время
+        последнего изменения и количество отфильтрованных строк одним
+        агрегатным запросом.
+
+        Last-Modified не выдается: удаление задачи не меняет время изменения
+        оставшихся строк.
+        """
+        filterset = self.get_filterset(self.get_filterset_class())
+        if filterset.is_bound and not filterset.is_valid():
+            return None
+        state = filterset.qs.aggregate(last=Max('updated_at'), count=Count('pk'))
+        return (versions.get_version(), state['last'], state['count']), None
+
+    def get_context_data(self, **kwargs):
+        """
+        Добавление фасетов - количества задач по вариантам фильтров, формы
+        массовых действий и строк таблицы из кеша фрагментов.
+        """
+        context = super().get_context_data(**kwargs)
+        context['bulk_form'] = TaskBulkActionForm()
+        context['task_rows'] = fragments.render_rows(
+            context['tasks'], select_name=context['bulk_form']['tasks'].html_name)
+        context['facets'] = []
+        if not self.filterset.is_bound or self.filterset.is_valid():
+            context['facets'] = facets.get_facets(self.filterset,
+                                                  self.get_query_without_cursor())
+        return context
+
+
+class AsyncIndexView(AsyncLoginRequiredMixin, IndexView):
+    """
+    Асинхронная версия списка задач.
+
+    Страница строк читается асинхронным ORM; проверка фильтров, фасеты и
+    форма массовых действий используют синхронный код и выполняются в
+    отдельном потоке.
+    """
+
+    def load_filterset(self):
+        filterset = self.get_filterset(self.get_filterset_class())
+        if not filterset.is_bound or filterset.is_valid():
+            return filterset, filterset.qs
+        return filterset, filterset.queryset.none()
+
+    async def get(self, request, *args, **kwargs):
+        return await self.conditional_aget(self.get_list, request, *args,
+                                           **kwargs)
+
+    async def get_list(self, request, *args, **kwargs):
+        self.filterset, self.object_list = await sync_to_async(
+            self.load_filterset)()
+        self.page = await self.apaginate_queryset(self.object_list,
+                                                  self.paginate_by)
+        context = await sync_to_async(self.get_context_data)(
+            filter=self.filterset, object_list=self.object_list)
+        return self.render_to_response(context)
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.page
+
+
+class TaskExportView(CustomLoginRequiredMixin, View):
+    """
+    Потоковая выгрузка задач в CSV или JSON Lines.
+
+    Принимает те же параметры, что и фильтр списка задач, и параметр format
+    (csv или jsonl). Ответ формируется по мере чтения строк из базы данных:
+    под ASGI - асинхронным итератором, иначе - обычным.
+    """
+    chunk_size = export.DEFAULT_CHUNK_SIZE
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in export.FORMATS:
+            return JsonResponse({'format': [f'Unknown format "{export_format}"']},
+                                status=400)
+        filterset = TaskFilterForm(request.GET or None,
+                                   queryset=TaskListRow.objects.all(),
+                                   request=request)
+        if filterset.is_bound and not filterset.is_valid():
+            return JsonResponse(filterset.errors, status=400)
+        if isinstance(request, ASGIRequest):
+            content = export.astream(
+                export.aexport_rows(filterset.qs, self.chunk_size), export_format)
+        else:
+            content = export.stream(
+                export.export_rows(filterset.qs, self.chunk_size), export_format)
+        content_type = export.FORMATS[export_format][-1]
+        response = StreamingHttpResponse(content, content_type=content_type)
+        filename = f'tasks-{timezone.now():%Y%m%d-%H%M%S}.{export_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class TaskImportView(CustomLoginRequiredMixin, FormView):
+    """
+    Импорт задач из загруженного файла CSV или JSON Lines.
+
+    Файл читается построчно, задачи создаются пакетами. Автор всех задач -
+    текущий пользователь, колонка author не используется (она доступна только
+    команде import_tasks). Ошибочные записи пропускаются и выводятся на
+    странице с номерами строк.
+    """
+    template_name = 'tasks/import.html'
+    form_class = TaskImportForm
+    batch_size = importer.DEFAULT_BATCH_SIZE
+
+    def form_valid(self, form):
+        upload = form.cleaned_data['file']
+        file_format = (form.cleaned_data['format']
+                       or importer.detect_format(upload.name))
+        lines = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+        result = importer.TaskImporter(self.request.user, self.batch_size,
+                                       author_column=False).run(lines, file_format)
+        if result.created:
+            messages.success(self.request,
+                             _('Imported tasks: %(count)s') % {'count': result.created})
+        return self.render_to_response(self.get_context_data(form=form,
+                                                             result=result))
+
+
+class TaskBulkActionView(CustomLoginRequiredMixin, FormView):
+    """
+    Массовое изменение выбранных задач.
+
+    Статус и исполнитель меняются одним UPDATE, метки добавляются и удаляются
+    одним запросом к промежуточной таблице. Права те же, что у изменения
+    одной задачи: действие доступно любому авторизованному пользователю.
+    """
+    form_class = TaskBulkActionForm
+    http_method_names = ['post']
+
+    def get_success_url(self):
+        query = self.request.POST.get('query', '').strip('&')
+        url = reverse('tasks_index')
+        return f'{url}?{query}' if query else url
+
+    def form_valid(self, form):
+        action = bulk.ACTIONS[form.cleaned_data['action']]
+        count = action([task.pk for task in form.cleaned_data['tasks']],
+                       form.get_value())
+        messages.success(self.request,
+                         _('Tasks updated: %(count)s') % {'count': count})
+        return redirect(self.get_success_url())
+
+    def form_invalid(self, form):
+        for field, errors in form.errors.items():
+            label = form.fields[field].label if field in form.fields else None
+            for error in errors:
+                messages.error(self.request, f'{label}: {error}' if label else error)
+        return redirect(self.get_success_url())
 
 
 class TaskCreateView(CustomCreateView):
@@ -38,12 +225,35 @@ class TaskCreateView(CustomCreateView):
         return response
 
 
-class TaskDetailView(CustomDetailView):
+class TaskDetailView(ConditionalGetMixin, CustomDetailView):
     template_name = 'tasks/detail.html'
     model = Task
     pk_url_kwarg = 'pk'
     context_object_name = 'task'
     form_class = TaskForm
+    select_related_fields = ('status', 'author', 'executor')
+    prefetch_related_fields = ('labels',)
+
+    def get_conditional_state(self):
+        """
+        Время изменения задачи одним запросом по первичному ключу строки
+        списка задач - оно меняется и при переименовании статуса, меток или
+        пользователей задачи.
+        """
+        updated_at = (TaskListRow.objects.filter(pk=self.kwargs['pk'])
+                      .values_list('updated_at', flat=True).first())
+        return None if updated_at is None else (updated_at, updated_at)
+
+
+class AsyncTaskDetailView(AsyncDetailMixin, AsyncLoginRequiredMixin,
+                          TaskDetailView):
+    """
+    Асинхронная версия страницы задачи: задача со связанными объектами и
+    метками читается через aget().
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.conditional_aget(super().get, request, *args, **kwargs)
 
 
 class TaskUpdateView(CustomUpdateView):
@@ -71,7 +281,7 @@ class TaskDeleteView(CustomDeleteView):
         response = super().dispatch(request, *args, **kwargs)
         if response.status_code != 302:
             task = self.get_object()
-            if task.author != request.user:
+            if task.author_id != request.user.pk:
                 messages.error(request,
                                _('Only the author can delete the task'))
                 return redirect(self.success_url)
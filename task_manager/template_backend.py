@@ -0,0 +1,116 @@
+import logging
+import threading
+from pathlib import Path
+from time import perf_counter
+
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+PREWARM_EXTENSIONS = ('.html', '.txt')
+
+
+class TemplateStats:
+    """
+    Время компиляции и рендеринга шаблонов в текущем процессе.
+
+    Компиляцией считается первая загрузка шаблона; с кешируемым загрузчиком
+    следующие загрузки берут шаблон из памяти и учитываются как попадания.
+    Время рендеринга учитывается для шаблонов, которые рендерятся напрямую
+    (страницы), время вложенных шаблонов входит во время страницы.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.templates = {}
+
+    def get(self, name):
+        return self.templates.setdefault(name, {
+            'compile_ms': None, 'loads': 0, 'renders': 0, 'render_ms': 0.0,
+        })
+
+    def record_load(self, name, seconds):
+        with self.lock:
+            item = self.get(name)
+            item['loads'] += 1
+            if item['compile_ms'] is None:
+                item['compile_ms'] = round(seconds * 1000, 3)
+
+    def record_render(self, name, seconds):
+        with self.lock:
+            item = self.get(name)
+            item['renders'] += 1
+            item['render_ms'] += seconds * 1000
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                name: {**item, 'render_ms': round(item['render_ms'], 3),
+                       'render_avg_ms': round(item['render_ms'] / item['renders'], 3)
+                       if item['renders'] else None}
+                for name, item in sorted(self.templates.items())
+            }
+
+    def clear(self):
+        with self.lock:
+            self.templates.clear()
+
+
+stats = TemplateStats()
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        start = perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.record_render(self.template.origin.template_name,
+                                perf_counter() - start)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    Шаблонизатор Django с замером времени компиляции и рендеринга шаблонов.
+    """
+
+    def get_template(self, template_name):
+        start = perf_counter()
+        template = super().get_template(template_name)
+        stats.record_load(template_name, perf_counter() - start)
+        return TimedTemplate(template.template, self)
+
+    def template_names(self):
+        """
+        Имена всех шаблонов из каталогов DIRS.
+        """
+        for directory in map(Path, self.dirs):
+            for path in sorted(directory.rglob('*')):
+                if path.is_file() and path.suffix in PREWARM_EXTENSIONS:
+                    yield path.relative_to(directory).as_posix()
+
+
+def prewarm():
+    """
+    Компиляция всех шаблонов проекта при запуске процесса.
+
+    С кешируемым загрузчиком первые запросы каждого процесса не тратят время
+    на компиляцию. Шаблоны с ошибками пропускаются с записью в лог.
+    Возвращает количество скомпилированных шаблонов.
+    """
+    start = perf_counter()
+    compiled = 0
+    for engine in engines.all():
+        if not isinstance(engine, TimedDjangoTemplates):
+            continue
+        for name in engine.template_names():
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError:
+                logger.exception('Template %s failed to compile', name)
+            else:
+                compiled += 1
+    logger.info('Compiled %d templates in %.1f ms', compiled,
+                (perf_counter() - start) * 1000)
+    return compiled
@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+
+from django.conf import settings
+from django.test import TestCase
+
+from task_manager import log
+
+
+class LoggingPipelineTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'test.log')
+
+    def tearDown(self):
+        log.configure(settings.LOGGING)
+        self.directory.cleanup()
+
+    def record(self, level=logging.DEBUG, name='test', msg='message', **kwargs):
+        return logging.makeLogRecord({'name': name, 'levelno': level,
+                                      'levelname': logging.getLevelName(level),
+                                      'msg': msg, **kwargs})
+
+    def test_json_formatter(self):
+        """
+        Проверка структурированной записи с дополнительными полями и
+        трассировкой исключения.
+        """
+        try:
+            raise ValueError('broken')
+        except ValueError:
+            record = self.record(logging.ERROR, msg='Failed %s', args=('task',),
+                                 exc_info=sys.exc_info(), task_id=5)
+        entry = json.loads(log.JsonFormatter().format(record))
+        self.assertEqual((entry['level'], entry['message'], entry['task_id']),
+                         ('ERROR', 'Failed task', 5))
+        self.assertIn('ValueError: broken', entry['exception'])
+
+    def test_debug_sampling(self):
+        """
+        Проверка ограничения числа отладочных записей на логгер; записи
+        уровня INFO проходят всегда.
+        """
+        limited = log.DebugSamplingFilter(limit=2, period=60)
+        passed = [limited.filter(self.record(name=name))
+                  for name in ('a', 'a', 'a', 'b')]
+        self.assertEqual(passed, [True, True, False, True])
+        self.assertTrue(limited.filter(self.record(logging.INFO, name='a')))
+        self.assertEqual(limited.dropped, 1)
+        self.assertFalse(log.DebugSamplingFilter(rate=0).filter(self.record()))
+
+    def test_rotation(self):
+        """
+        Проверка ротации файла по размеру и по времени с ограничением
+        количества старых файлов.
+        """
+        handler = log.RotatingFileHandler(self.path, max_bytes=100, backup_count=2)
+        for number in range(10):
+            handler.emit(self.record(msg='x' * 40 + str(number)))
+        handler.rolloverAt = 0
+        handler.emit(self.record(msg='after midnight'))
+        handler.close()
+        rotated = [name for name in os.listdir(self.directory.name)
+                   if name != 'test.log']
+        self.assertEqual(len(rotated), 2)
+        with open(self.path) as file:
+            self.assertEqual(file.read(), 'after midnight\n')
+
+    def test_external_rotation(self):
+        """
+        Проверка файла лога при внешней ротации (LOG_ROTATE=external): после
+        переименования файла (logrotate) запись продолжается в новый файл.
+        """
+        log.configure({
+            'version': 1,
+            'disable_existing_loggers': False,
+            'formatters': settings.LOGGING['formatters'],
+            'handlers': {'file': {**settings.LOG_FILE_HANDLERS['external'],
+                                  'filename': self.path}},
+            'loggers': {'task_manager.test': {'handlers': ['file'],
+                                              'propagate': False}},
+        })
+        logger = logging.getLogger('task_manager.test')
+        logger.warning('Before rotation')
+        os.rename(self.path, f'{self.path}.1')
+        logger.warning('After rotation')
+        logger.handlers[0].close()
+        logger.handlers, logger.propagate = [], True
+        for path, message in ((f'{self.path}.1', 'Before rotation'),
+                              (self.path, 'After rotation')):
+            with open(path) as file:
+                self.assertEqual(json.loads(file.read())['message'], message)
+
+    def test_queue_pipeline(self):
+        """
+        Проверка записи через очередь: логгер содержит только обработчик
+        очереди, файл пишется фоновым потоком.
+        """
+        config = {**settings.LOGGING, 'handlers': {
+            'file': {**settings.LOGGING['handlers']['file'], 'filename': self.path},
+        }, 'queue': {'handlers': ['file'], 'filters': ['sample_debug']}}
+        log.configure(config)
+        root = logging.getLogger()
+        self.assertEqual([type(handler) for handler in root.handlers],
+                         [log.QueueHandler])
+        logging.getLogger('task_manager.test').warning('Queued %d', 1)
+        log.stop_listener()
+        with open(self.path) as file:
+            entry = json.loads(file.read())
+        self.assertEqual((entry['logger'], entry['message']),
+                         ('task_manager.test', 'Queued 1'))
@@ -0,0 +1,128 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from task_manager import reference_cache
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.forms import TaskForm
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+
+class ReferenceCacheTest(TestCase):
+    def setUp(self):
+        self.status = Status.objects.create(name='Status')
+        self.label = Label.objects.create(name='Label')
+        self.user = User.objects.create_user(username='user', password='123')
+
+    def test_hits_and_misses(self):
+        """
+        Проверка счетчиков попаданий и промахов кеша.
+
+        Первое обращение загружает таблицу одним запросом, повторные обращения
+        не выполняют запросов.
+        """
+        before = reference_cache.stats()['statuses.Status']
+        with self.assertNumQueries(1):
+            self.assertEqual(reference_cache.statuses.all(), [self.status])
+        with self.assertNumQueries(0):
+            self.assertEqual(reference_cache.statuses.get(self.status.pk),
+                             self.status)
+            self.assertIsNone(reference_cache.statuses.get('unknown'))
+        after = reference_cache.stats()['statuses.Status']
+        self.assertEqual(after['hits'] - before['hits'], 2)
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['copies']['default']['size'], 1)
+
+    def test_invalidation_by_signals(self):
+        """
+        Проверка сброса кеша при изменении и удалении.
+
+        Изменение счетчиков при записи задач кеш не сбрасывает.
+        """
+        reference_cache.statuses.all()
+        self.status.name = 'Renamed'
+        self.status.save()
+        self.assertEqual(reference_cache.statuses.get(self.status.pk).name,
+                         'Renamed')
+        Status.objects.create(name='Other').delete()
+        self.assertEqual(len(reference_cache.statuses.all()), 1)
+
+        invalidations = (reference_cache.statuses.invalidations,
+                         reference_cache.labels.invalidations)
+        task = Task.objects.create(name='Task', description='Task',
+                                   status=self.status, author=self.user)
+        task.labels.add(self.label)
+        task.delete()
+        self.assertEqual((reference_cache.statuses.invalidations,
+                          reference_cache.labels.invalidations), invalidations)
+
+    def test_bounded_staleness(self):
+        """
+        Проверка видимости записей из других процессов.
+
+        Изменение общей версии в django cache или истечение
+        REFERENCE_CACHE_TTL приводит к перезагрузке таблицы.
+        """
+        reference_cache.statuses.all()
+        Status.objects.filter(pk=self.status.pk).update(name='Changed elsewhere')
+        self.assertEqual(reference_cache.statuses.get(self.status.pk).name,
+                         'Status')
+        cache.set(reference_cache.statuses.version_key, 'other worker')
+        self.assertEqual(reference_cache.statuses.get(self.status.pk).name,
+                         'Changed elsewhere')
+        Status.objects.filter(pk=self.status.pk).update(name='Changed again')
+        with override_settings(REFERENCE_CACHE_TTL=0):
+            self.assertEqual(reference_cache.statuses.get(self.status.pk).name,
+                             'Changed again')
+
+    def test_change_during_load(self):
+        """
+        Проверка изменения таблицы во время загрузки копии.
+
+        Строки, прочитанные до смены версии, выдаются, но не кешируются:
+        следующее обращение загружает таблицу заново.
+        """
+        def change_version(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if 'statuses_status' in sql:
+                cache.set(reference_cache.statuses.version_key, 'other worker')
+            return result
+
+        with connection.execute_wrapper(change_version):
+            self.assertEqual(reference_cache.statuses.all(), [self.status])
+        self.assertNotIn('default', reference_cache.statuses.snapshots)
+        with self.assertNumQueries(1):
+            reference_cache.statuses.all()
+        with self.assertNumQueries(0):
+            reference_cache.statuses.all()
+
+    def test_task_form_uses_cache(self):
+        """
+        Проверка валидации формы задачи по кешу справочников.
+
+        Остаются только запросы проверок модели: существование внешнего ключа
+        и уникальность имени.
+        """
+        reference_cache.statuses.all()
+        reference_cache.labels.all()
+        form = TaskForm(data={'name': 'Task', 'description': 'Task',
+                              'status': self.status.pk, 'labels': [self.label.pk]})
+        with self.assertNumQueries(2):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['status'], self.status)
+        self.assertEqual(form.cleaned_data['labels'], [self.label])
+
+    def test_metrics(self):
+        """
+        Проверка страницы метрик: доступна только персоналу.
+        """
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('metrics'))
+        self.assertIn('labels.Label', response.json()['reference_cache'])
+        self.assertIn('db_pools', response.json())
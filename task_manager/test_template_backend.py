@@ -0,0 +1,65 @@
+import os
+import tempfile
+
+from django.template import engines
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from task_manager import template_backend
+from task_manager.users.models import User
+
+
+PRODUCTION_TEMPLATES = [{
+    'BACKEND': 'task_manager.template_backend.TimedDjangoTemplates',
+    'NAME': 'django',
+    'DIRS': [],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        'loaders': [('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+        ])],
+    },
+}]
+
+
+class TemplateBackendTest(TestCase):
+    def setUp(self):
+        template_backend.stats.clear()
+
+    def test_prewarm(self):
+        """
+        Проверка предварительной компиляции шаблонов с кешируемым загрузчиком.
+
+        Шаблон с ошибкой пропускается, повторная загрузка не компилирует
+        шаблон заново.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, 'pages'))
+            for name, content in (('pages/page.html', 'Hello {{ name }}'),
+                                  ('broken.html', '{% if %}'),
+                                  ('notes.md', '{% if %}')):
+                with open(os.path.join(directory, name), 'w') as template:
+                    template.write(content)
+            settings = [{**PRODUCTION_TEMPLATES[0], 'DIRS': [directory]}]
+            with override_settings(TEMPLATES=settings):
+                with self.assertLogs('task_manager.template_backend', 'ERROR'):
+                    self.assertEqual(template_backend.prewarm(), 1)
+                engine = engines['django']
+                self.assertEqual(engine.get_template('pages/page.html')
+                                 .render({'name': 'World'}), 'Hello World')
+        page = template_backend.stats.as_dict()['pages/page.html']
+        self.assertEqual(page['loads'], 2)
+        self.assertEqual(page['renders'], 1)
+        self.assertIsNotNone(page['compile_ms'])
+        self.assertIsNotNone(page['render_avg_ms'])
+
+    def test_metrics(self):
+        """
+        Проверка времени компиляции и рендеринга страниц в метриках.
+        """
+        user = User.objects.create_user(username='staff', password='123',
+                                        is_staff=True)
+        self.client.force_login(user)
+        self.client.get(reverse('index'))
+        templates = self.client.get(reverse('metrics')).json()['templates']
+        self.assertEqual(templates['index.html']['renders'], 1)
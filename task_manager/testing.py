@@ -0,0 +1,151 @@
+import json
+import re
+from contextlib import contextmanager
+from time import perf_counter
+from unittest.mock import patch
+
+from django.db import connection
+from django.template.backends.django import Template
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+class ViewMetrics:
+    def __init__(self, url_name, status_code, queries, sql_time, render_time,
+                 total_time):
+        self.url_name = url_name
+        self.status_code = status_code
+        self.queries = queries
+        self.sql_time = sql_time
+        self.render_time = render_time
+        self.total_time = total_time
+
+    def as_dict(self):
+        return {
+            'url_name': self.url_name,
+            'status_code': self.status_code,
+            'queries': self.queries,
+            'sql_ms': round(self.sql_time * 1000, 3),
+            'render_ms': round(self.render_time * 1000, 3),
+            'total_ms': round(self.total_time * 1000, 3),
+        }
+
+    def __str__(self):
+        return json.dumps(self.as_dict())
+
+
+class Budget:
+    """
+    Бюджет производительности представления.
+
+    Задает предельное количество SQL-запросов, суммарное время их выполнения и
+    время рендеринга шаблонов. Времена задаются в миллисекундах и умножаются на
+    общий коэффициент factor, чтобы учесть медленные машины CI.
+    """
+
+    def __init__(self, queries, sql_ms=250, render_ms=1000, method='get'):
+        self.queries = queries
+        self.sql_ms = sql_ms
+        self.render_ms = render_ms
+        self.method = method
+
+    def violations(self, metrics, factor=1.0):
+        """
+        Список нарушений бюджета для измеренных метрик.
+        """
+        errors = []
+        if metrics.queries > self.queries:
+            errors.append(f'{metrics.queries} queries > {self.queries}')
+        if metrics.sql_time * 1000 > self.sql_ms * factor:
+            errors.append(f'SQL {metrics.sql_time * 1000:.1f} ms > '
+                          f'{self.sql_ms * factor:.1f} ms')
+        if metrics.render_time * 1000 > self.render_ms * factor:
+            errors.append(f'render {metrics.render_time * 1000:.1f} ms > '
+                          f'{self.render_ms * factor:.1f} ms')
+        return errors
+
+
+@contextmanager
+def render_timer():
+    """
+    Замер времени рендеринга шаблонов.
+
+    Учитывается только внешний рендеринг: вложенные шаблоны (например, виджеты
+    форм) не суммируются повторно.
+    """
+    timings = []
+    depth = [0]
+    original_render = Template.render
+
+    def timed_render(template, *args, **kwargs):
+        depth[0] += 1
+        start = perf_counter()
+        try:
+            return original_render(template, *args, **kwargs)
+        finally:
+            depth[0] -= 1
+            if not depth[0]:
+                timings.append(perf_counter() - start)
+
+    with patch.object(Template, 'render', timed_render):
+        yield timings
+
+
+@contextmanager
+def sql_timer():
+    """
+    Замер количества и суммарного времени SQL-запросов.
+    """
+    timings = []
+
+    def timed_execute(execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            timings.append(perf_counter() - start)
+
+    with connection.execute_wrapper(timed_execute):
+        yield timings
+
+
+def measure_view(client, url_name, url, method='get', data=None):
+    """
+    Выполнение запроса к представлению с замером метрик.
+
+    Возвращает ViewMetrics с количеством SQL-запросов, суммарным временем SQL,
+    временем рендеринга шаблонов и общим временем ответа. Потоковый ответ
+    читается целиком, так как запросы выполняются при его чтении.
+    """
+    with sql_timer() as queries, render_timer() as renders:
+        start = perf_counter()
+        response = getattr(client, method)(url, data or {})
+        if response.streaming:
+            b''.join(response.streaming_content)
+        total_time = perf_counter() - start
+    return ViewMetrics(url_name, response.status_code, len(queries),
+                       sum(queries), sum(renders), total_time)
+
+
+def without_csrf(content):
+    """
+    HTML ответа без значения CSRF-токена, которое меняется от запроса к
+    запросу, для сравнения страниц.
+    """
+    return re.sub(r'name="csrfmiddlewaretoken" value="[^"]*"', '',
+                  content.decode())
+
+
+def named_urls(patterns=None):
+    """
+    Имена всех маршрутов проекта без пространств имен (например, admin).
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    names = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if not pattern.namespace:
+                names.extend(named_urls(pattern.url_patterns))
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.append(pattern.name)
+    return names
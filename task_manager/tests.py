@@ -0,0 +1,163 @@
+import json
+import os
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import translation
+from django.utils.functional import SimpleLazyObject
+
+from task_manager import reference_cache
+from task_manager.context_processors import navbar
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.testing import Budget, measure_view, named_urls
+from task_manager.users.models import User
+
+# Бюджеты производительности для всех именованных маршрутов проекта.
+# Количество запросов - точная верхняя граница, поэтому новый N+1 в шаблоне
+# сразу приводит к падению тестов. Времена умножаются на PERF_BUDGET_FACTOR.
+VIEW_BUDGETS = {
+    'index': Budget(queries=2),
+    'login': Budget(queries=2),
+    'logout': Budget(queries=4, method='post'),
+    'metrics': Budget(queries=2),
+    'users_index': Budget(queries=3),
+    'users_create': Budget(queries=2),
+    'users_update': Budget(queries=3),
+    'users_delete': Budget(queries=3),
+    'users_autocomplete': Budget(queries=3),
+    'statuses_index': Budget(queries=3),
+    'statuses_create': Budget(queries=2),
+    'statuses_update': Budget(queries=3),
+    'statuses_delete': Budget(queries=3),
+    'statuses_autocomplete': Budget(queries=3),
+    'labels_index': Budget(queries=3),
+    'labels_create': Budget(queries=2),
+    'labels_update': Budget(queries=3),
+    'labels_delete': Budget(queries=3),
+    'labels_autocomplete': Budget(queries=3),
+    'tasks_index': Budget(queries=7),
+    'tasks_export': Budget(queries=3),
+    'tasks_import': Budget(queries=2),
+    'tasks_bulk': Budget(queries=2, method='post'),
+    'tasks_create': Budget(queries=2),
+    'tasks_update': Budget(queries=7),
+    'tasks_delete': Budget(queries=4),
+    'tasks_detail': Budget(queries=5),
+    'api_tasks': Budget(queries=5),
+    'api_tasks_detail': Budget(queries=5),
+    'api_statuses': Budget(queries=3),
+    'api_labels': Budget(queries=3),
+    'api_users': Budget(queries=3),
+}
+
+SEED_USERS = 20
+SEED_STATUSES = 10
+SEED_LABELS = 10
+SEED_TASKS = 40
+
+
+class ViewBudgetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Тестовый набор данных для замеров.
+
+        Данных достаточно, чтобы N+1 запросы в шаблонах превысили бюджет.
+        """
+        users = [User.objects.create_user(username=f'user{i}', first_name='Test',
+                                          last_name=f'User {i}', password='123')
+                 for i in range(SEED_USERS)]
+        statuses = [Status.objects.create(name=f'Status {i}')
+                    for i in range(SEED_STATUSES)]
+        labels = [Label.objects.create(name=f'Label {i}')
+                  for i in range(SEED_LABELS)]
+        for i in range(SEED_TASKS):
+            task = Task.objects.create(name=f'Task {i}',
+                                       description='Test description',
+                                       status=statuses[i % SEED_STATUSES],
+                                       author=users[i % SEED_USERS],
+                                       executor=users[(i + 1) % SEED_USERS])
+            task.labels.add(labels[i % SEED_LABELS], labels[(i + 1) % SEED_LABELS])
+        cls.user = users[0]
+        cls.user.is_staff = True
+        cls.user.save()
+        cls.objects = {
+            'users': cls.user,
+            'statuses': Status.objects.create(name='Unused status'),
+            'labels': Label.objects.create(name='Unused label'),
+            'tasks': Task.objects.filter(author=cls.user).last(),
+        }
+
+    def get_url(self, url_name):
+        *_, prefix, action = f'_{url_name}'.split('_')
+        if action in ('update', 'delete', 'detail'):
+            return reverse(url_name, kwargs={'pk': self.objects[prefix].pk})
+        return reverse(url_name)
+
+    def test_every_url_has_budget(self):
+        """
+        Проверка наличия бюджета у каждого именованного маршрута.
+
+        Новый маршрут без объявленного бюджета должен приводить к падению тестов.
+        """
+        self.assertEqual(sorted(named_urls()), sorted(VIEW_BUDGETS))
+
+    def test_view_budgets(self):
+        """
+        Проверка бюджетов производительности представлений.
+
+        Для каждого маршрута замеряются количество запросов, время SQL и время
+        рендеринга шаблонов с загруженным кешем справочников (обычное
+        состояние процесса). При PERF_REPORT результаты пишутся в JSON-файл.
+        """
+        factor = float(os.getenv('PERF_BUDGET_FACTOR', '1'))
+        report = []
+        for url_name, budget in VIEW_BUDGETS.items():
+            with self.subTest(url_name=url_name):
+                self.client.force_login(self.user)
+                reference_cache.statuses.all()
+                reference_cache.labels.all()
+                metrics = measure_view(self.client, url_name,
+                                       self.get_url(url_name), budget.method)
+                report.append(metrics.as_dict())
+                self.assertLess(metrics.status_code, 400, metrics)
+                self.assertEqual(budget.violations(metrics, factor), [],
+                                 metrics)
+        if os.getenv('PERF_REPORT'):
+            with open(os.getenv('PERF_REPORT'), 'w') as report_file:
+                json.dump(report, report_file, indent=2)
+
+
+class NavbarTest(TestCase):
+    def test_items_cached_and_lazy(self):
+        """
+        Проверка ленивых пунктов навигации, общих для всех запросов.
+
+        Пользователь не загружается, пока шаблон не выводит навигацию.
+        """
+        request = RequestFactory().get('/')
+        request.user = SimpleLazyObject(self.fail)
+        self.assertIsInstance(navbar(request)['navbar_items'], SimpleLazyObject)
+
+        request.user = AnonymousUser()
+        items = navbar(request)['navbar_items']
+        self.assertEqual([item.get('url') for item in items],
+                         ['/users/', '/login/', '/users/create/'])
+        self.assertIs(navbar(request)['navbar_items'][0], items[0])
+        with translation.override('en'):
+            self.assertEqual(navbar(request)['navbar_items'][1]['label'], 'Login')
+        self.assertEqual(items[1]['label'], 'Вход')
+
+    def test_navbar_rendered(self):
+        """
+        Проверка навигации авторизованного пользователя с его именем.
+        """
+        user = User.objects.create_user(username='navuser', password='123')
+        self.client.force_login(user)
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, ', navuser</span>')
+        self.assertContains(response, f'href="{reverse("tasks_index")}"')
+        self.assertContains(response, f'action="{reverse("logout")}"')
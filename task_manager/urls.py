@@ -26,8 +26,10 @@ urlpatterns = [
     path('statuses/', include('task_manager.statuses.urls')),
     path('tasks/', include('task_manager.tasks.urls')),
     path('labels/', include('task_manager.labels.urls')),
+    path('api/', include('task_manager.api.urls')),
     path('login/', views.LoginUserView.as_view(), name='login'),
     path('logout/', views.LogoutUserView.as_view(), name='logout'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
 
 handler404 = 'task_manager.views.handler404'
@@ -1,9 +1,21 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
 
+from task_manager.tasks.counters import CounterFieldsMixin
+
+
+class User(CounterFieldsMixin, AbstractUser):
+    authored_count = models.PositiveIntegerField(default=0, editable=False)
+    assigned_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ('authored_count', 'assigned_count')
 
-class User(AbstractUser):
     def __str__(self):
         return self.get_full_name()
 
     def get_full_name(self):
         return f'{self.first_name} {self.last_name}'
+
+    @property
+    def has_tasks(self):
+        return bool(self.authored_count or self.assigned_count)
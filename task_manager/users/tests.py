@@ -1,8 +1,14 @@
-from django.test import Client
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import Client, RequestFactory
 from django.test.testcases import TestCase
 from django.urls import reverse
 
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.testing import without_csrf
 from task_manager.users.models import User
+from task_manager.users.views import AsyncIndexView, IndexView
 
 
 class BaseTestCase(TestCase):
@@ -30,6 +36,26 @@ class UserIndexViewTest(TestCase):
         self.assertTemplateUsed(response, 'users/index.html')
 
 
+class UsersAsyncIndexViewTest(BaseTestCase):
+    def test_async_index(self):
+        """
+        Проверка асинхронного списка пользователей.
+
+        Страница должна совпадать с синхронной, она доступна без авторизации.
+        """
+        request = RequestFactory().get(reverse('users_index'))
+        request.user = self.user
+        expected = IndexView.as_view()(request).render()
+        response = async_to_sync(AsyncIndexView.as_view())(request).render()
+        self.assertContains(response, 'testuser')
+        self.assertEqual(without_csrf(response.content),
+                         without_csrf(expected.content))
+
+        request.user = AnonymousUser()
+        response = async_to_sync(AsyncIndexView.as_view())(request).render()
+        self.assertContains(response, 'testuser')
+
+
 class UserCreateViewTest(TestCase):
     def test_user_create_view_get(self):
         """
@@ -183,6 +209,20 @@ class UserDeleteViewTest(BaseTestCase):
         self.assertEqual(User.objects.count(), 0)
         self.assertQuerySetEqual(User.objects.filter(pk=self.user.pk), [])
 
+    def test_user_delete_view_post_with_tasks(self):
+        """
+        Проверка POST-запроса на удаление пользователя, связанного с задачей.
+
+        Пользователь не удаляется, страница перенаправляется на список
+        пользователей. Связь определяется по счетчикам задач пользователя.
+        """
+        status = Status.objects.create(name='Test status')
+        Task.objects.create(name='Test task', status=status, author=self.user)
+        self.assertTrue(User.objects.get(pk=self.user.pk).has_tasks)
+        response = self.client.post(reverse('users_delete', args=[self.user.pk]))
+        self.assertRedirects(response, reverse('users_index'))
+        self.assertEqual(User.objects.count(), 1)
+
 
 class ChangeOtherUserProfileTest(TestCase):
     def setUp(self):
@@ -301,3 +341,20 @@ class UserLogoutTest(BaseTestCase):
         response = self.client.post(reverse('logout'))
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse('index'))
+
+
+class UserAutocompleteViewTest(BaseTestCase):
+    def test_autocomplete_search(self):
+        """
+        Проверка поиска пользователей по началу имени, фамилии или логина.
+
+        В ответе выводится полное имя пользователя.
+        """
+        User.objects.create_user(username='ivan', first_name='Ivan',
+                                 last_name='Petrov', password='123')
+        User.objects.create_user(username='petya', first_name='Pyotr',
+                                 last_name='Ivanov', password='123')
+        response = self.client.get(reverse('users_autocomplete'), {'term': 'iva'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['text'] for item in response.json()['results']],
+                         ['Ivan Petrov', 'Pyotr Ivanov'])
@@ -1,10 +1,15 @@
+from django.conf import settings
 from django.urls import path
 
 from task_manager.users import views
 
+IndexView = views.AsyncIndexView if settings.ASYNC_VIEWS else views.IndexView
+
 urlpatterns = [
-    path('', views.IndexView.as_view(), name='users_index'),
+    path('', IndexView.as_view(), name='users_index'),
     path('create/', views.UserCreateView.as_view(), name='users_create'),
     path('<int:pk>/update/', views.UserUpdateView.as_view(), name='users_update'),
     path('<int:pk>/delete/', views.UserDeleteView.as_view(), name='users_delete'),
+    path('autocomplete/', views.UserAutocompleteView.as_view(),
+         name='users_autocomplete'),
 ]
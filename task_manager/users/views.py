@@ -6,7 +6,10 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 
-from task_manager.mixins import AuthAndProfileOwnershipMixin
+from task_manager.mixins import (AsyncListMixin,
+                                 AuthAndProfileOwnershipMixin,
+                                 CustomAutocompleteView,
+                                 WriteTransactionMixin)
 from task_manager.users.forms import UserForm
 from task_manager.users.models import User
 
@@ -17,7 +20,13 @@ class IndexView(ListView):
     context_object_name = 'users'
 
 
-class UserCreateView(SuccessMessageMixin, CreateView):
+class AsyncIndexView(AsyncListMixin, IndexView):
+    """
+    Асинхронная версия списка пользователей (доступен без авторизации).
+    """
+
+
+class UserCreateView(WriteTransactionMixin, SuccessMessageMixin, CreateView):
     template_name = 'users/create.html'
     model = User
     form_class = UserForm
@@ -26,6 +35,7 @@ class UserCreateView(SuccessMessageMixin, CreateView):
 
 
 class UserUpdateView(AuthAndProfileOwnershipMixin,
+                     WriteTransactionMixin,
                      SuccessMessageMixin,
                      UpdateView):
     template_name = 'users/update.html'
@@ -36,6 +46,7 @@ class UserUpdateView(AuthAndProfileOwnershipMixin,
 
 
 class UserDeleteView(AuthAndProfileOwnershipMixin,
+                     WriteTransactionMixin,
                      SuccessMessageMixin,
                      DeleteView):
     template_name = 'users/delete.html'
@@ -49,11 +60,22 @@ class UserDeleteView(AuthAndProfileOwnershipMixin,
 
         Если пользователь связан с задачей, его невозможно удалить.
         В этом случае пользователь перенаправляется на страницу со списком
-        пользователей с сообщением об ошибке.
+        пользователей с сообщением об ошибке. Связь проверяется по счетчикам
+        задач, ProtectedError остается на случай их расхождения с данными.
         """
+        if self.object.has_tasks:
+            return self.protected_error()
         try:
             return super().form_valid(form)
         except ProtectedError:
-            messages.error(self.request,
-                           _('Cannot delete user because it is in use'))
-            return redirect(self.success_url)
+            return self.protected_error()
+
+    def protected_error(self):
+        messages.error(self.request, _('Cannot delete user because it is in use'))
+        return redirect(self.success_url)
+
+
+class UserAutocompleteView(CustomAutocompleteView):
+    model = User
+    search_fields = ('username', 'first_name', 'last_name')
+    ordering = ('first_name', 'last_name', 'id')
@@ -2,9 +2,14 @@ from django.contrib import messages
 from django.contrib.auth import logout
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib.messages.views import SuccessMessageMixin
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
 from django.utils.translation import gettext_lazy as _
 
+from task_manager import reference_cache, template_backend
+from task_manager.db import pool
+
 
 def index(request):
     return render(request, 'index.html')
@@ -29,6 +34,19 @@ class LogoutUserView(LogoutView):
         return redirect('index')
 
 
+def metrics(request):
+    """
+    Внутренние метрики процесса в формате JSON (только для персонала).
+    """
+    if not request.user.is_staff:
+        raise PermissionDenied
+    return JsonResponse({
+        'reference_cache': reference_cache.stats(),
+        'templates': template_backend.stats.as_dict(),
+        'db_pools': pool.stats(),
+    })
+
+
 def handler404(request, exception):
     return render(request, 'errors/404.html', status=404)
 
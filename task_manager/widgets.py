@@ -0,0 +1,71 @@
+from django import forms
+from django.urls import reverse
+
+from task_manager import reference_cache
+
+
+class AutocompleteMixin:
+    """
+    Выпадающий список с подгрузкой вариантов через JSON-представление.
+
+    В HTML выводятся только выбранные варианты, остальные запрашиваются по мере
+    ввода, поэтому размер страницы не зависит от размера справочника.
+    """
+    url_name = None
+
+    def __init__(self, url_name, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    class Media:
+        css = {
+            'all': ('admin/css/vendor/select2/select2.min.css',),
+        }
+        js = (
+            'admin/js/vendor/jquery/jquery.min.js',
+            'admin/js/vendor/select2/select2.full.min.js',
+            'task_manager/js/autocomplete.js',
+        )
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse(self.url_name)
+        return attrs
+
+    def get_selected_choices(self, value):
+        """
+        Варианты только для выбранных значений.
+
+        Объекты берутся из кеша справочника, а для некешируемых моделей -
+        одним запросом по первичным ключам.
+        """
+        selected = [item for item in value if item not in (None, '')]
+        if not selected:
+            return []
+        cached = reference_cache.for_model(self.choices.queryset.model)
+        objects = cached.get_many(selected) if cached else []
+        if len(objects) != len(selected):
+            objects = self.choices.queryset.filter(pk__in=selected)
+        return [self.choices.choice(obj) for obj in objects]
+
+    def optgroups(self, name, value, attrs=None):
+        choices = []
+        empty_label = getattr(self.choices.field, 'empty_label', None)
+        if not self.allow_multiple_selected and empty_label is not None:
+            choices.append(('', empty_label))
+        choices.extend(self.get_selected_choices(value))
+        selected = {str(item) for item in value}
+        return [
+            (None, [self.create_option(name, option_value, label,
+                                       str(option_value) in selected, index,
+                                       attrs=attrs)], index)
+            for index, (option_value, label) in enumerate(choices)
+        ]
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass